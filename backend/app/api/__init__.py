@@ -1,4 +1,9 @@
 # API routes
 from app.api.auth import router as auth_router
 from app.api.goals import router as goals_router
-from app.api.checkins import router as checkins_router
\ No newline at end of file
+from app.api.checkins import router as checkins_router
+from app.api.sync import router as sync_router
+from app.api.export import router as export_router
+from app.api.dashboard import router as dashboard_router
+from app.api.reminders import router as reminders_router
+from app.api.metrics import router as metrics_router
\ No newline at end of file
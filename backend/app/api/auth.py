@@ -1,20 +1,41 @@
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
 
 from app.api.deps import authenticate_user
 from app.core.errors import BadRequestError
-from app.core.security import create_access_token, get_password_hash
+from app.core.ratelimit import TokenBucketLimiter, load_backend
+from app.core.security import create_access_token, get_password_hash_async
 from app.database import get_session
 from app.models.user import User, UserCreate, UserRead, Token
 from app.config import settings
 
 router = APIRouter()
 
+# Login throttling, keyed by email and by client IP
+login_rate_limit_backend = load_backend(settings.LOGIN_RATE_LIMIT_BACKEND)
+login_email_limiter = TokenBucketLimiter(
+    login_rate_limit_backend,
+    name="login-email",
+    capacity=settings.LOGIN_RATE_LIMIT_EMAIL_BURST,
+    per_minute=settings.LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE,
+)
+login_ip_limiter = TokenBucketLimiter(
+    login_rate_limit_backend,
+    name="login-ip",
+    capacity=settings.LOGIN_RATE_LIMIT_IP_BURST,
+    per_minute=settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+)
+
+# These routes are async and use the sync session through the threadpool,
+# whatever DATABASE_ASYNC says. bcrypt runs on the password hashing pool and
+# is awaited, so a queued login holds no request thread.
+
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_in: UserCreate,
     session: Session = Depends(get_session),
 ) -> User:
@@ -32,9 +53,9 @@ def register(
         BadRequestError: If user with this email already exists
     """
     # Check if user with this email already exists
-    existing_user = session.exec(
-        select(User).where(User.email == user_in.email)
-    ).first()
+    existing_user = await run_in_threadpool(
+        lambda: session.exec(select(User).where(User.email == user_in.email)).first()
+    )
     
     if existing_user:
         raise BadRequestError(detail="Email already registered")
@@ -42,20 +63,24 @@ def register(
     # Create new user
     user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash_async(user_in.password),
         created_at=datetime.utcnow(),
     )
     
     # Add user to database
-    session.add(user)
-    session.commit()
-    session.refresh(user)
+    def save_user():
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+    
+    await run_in_threadpool(save_user)
     
     return user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: Session = Depends(get_session),
 ) -> dict:
@@ -63,6 +88,7 @@ def login(
     OAuth2 compatible token login, get an access token for future requests
     
     Args:
+        request: Request, used for the client address
         form_data: OAuth2 form data
         session: Database session
         
@@ -70,10 +96,16 @@ def login(
         Access token
         
     Raises:
+        TooManyRequestsError: If the email or client IP is over its rate limit
         HTTPException: If authentication fails
     """
+    # Throttle before any password hashing happens
+    if settings.LOGIN_RATE_LIMIT_ENABLED:
+        login_ip_limiter.check(request.client.host if request.client else "unknown")
+        login_email_limiter.check(form_data.username.strip().lower())
+    
     # Authenticate user
-    user = authenticate_user(form_data.username, form_data.password, session)
+    user = await authenticate_user(form_data.username, form_data.password, session)
     
     if not user:
         raise HTTPException(
@@ -1,35 +1,74 @@
-from datetime import date, datetime
-from fastapi import APIRouter, Depends, status
+import io
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, File, Query, Request, Response, UploadFile, status
 from sqlmodel import Session, select
-from typing import List
-from uuid import UUID
+from typing import List, Optional
+from uuid import UUID, uuid4
 
-from app.api.deps import get_current_user
+from app.api.deps import db_endpoint, get_current_user
+from app.api.etag import etag_matches, not_modified, user_data_etag
+from app.config import settings
 from app.core.errors import NotFoundError, AuthorizationError, BadRequestError
+from app.core.responses import fast_json_response, rows_to_dicts
 from app.database import get_session
-from app.models.checkin import CheckIn, CheckInCreate, CheckInRead
-from app.models.goal import Goal
+from app.models.checkin import (
+    CheckIn, CheckInCreate, CheckInRead,
+    CheckInBatchCreate, CheckInBatchItem, CheckInBatchRead, CheckInImportRead,
+)
+from app.models.goal import Goal, GoalType
+from app.models.heatmap import GoalHeatmap, HeatmapRead
+from app.models.rollup import RollupPeriod, RollupRead
+from app.models.stats import GoalStats, GoalStatsRead
 from app.models.user import User
+from app.services.checkin_import import import_checkins_csv
+from app.services.checkins import insert_checkins
+from app.services.downsample import lttb_indices
+from app.services.heatmap import HeatmapGrid, apply_heatmap_checkins, build_goal_heatmap
+from app.services.reminders import record_checkin_day
+from app.services.rollups import (
+    apply_rollup_checkins, choose_period, period_end, read_goal_rollups,
+)
+from app.services.stats import (
+    apply_checkin, apply_checkin_batch, build_stats_read, rebuild_goal_stats,
+)
+from app.services.sync import next_change_seq
 
 router = APIRouter()
 
+# Columns of CheckInRead, in its field order, for serializing from row tuples
+_CHECKIN_READ_COLUMNS = (
+    CheckIn.status,
+    CheckIn.note,
+    CheckIn.id,
+    CheckIn.goal_id,
+    CheckIn.checkin_date.label("date"),
+)
+
 
 @router.post("", response_model=CheckInRead, status_code=status.HTTP_201_CREATED)
+@db_endpoint
 def create_checkin(
     checkin_in: CheckInCreate,
+    response: Response,
+    upsert: bool = Query(False),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> CheckIn:
+) -> CheckInRead:
     """
     Create a new check-in
     
+    With `upsert`, an existing check-in for the same date is overwritten
+    instead of rejected and the response status is 200.
+    
     Args:
         checkin_in: Check-in creation data
+        response: Response, used to report an overwrite
+        upsert: Overwrite an existing check-in for the same date
         session: Database session
         current_user: Current authenticated user
         
     Returns:
-        Created check-in
+        Created or overwritten check-in
         
     Raises:
         NotFoundError: If goal not found
@@ -38,7 +77,7 @@ def create_checkin(
     """
     # Get goal from database
     goal = session.exec(
-        select(Goal).where(Goal.id == checkin_in.goal_id)
+        select(Goal).where((Goal.id == checkin_in.goal_id) & Goal.deleted_at.is_(None))
     ).first()
     
     # Check if goal exists
@@ -49,48 +88,258 @@ def create_checkin(
     if goal.user_id != current_user.id:
         raise AuthorizationError(detail="Not authorized to access this goal")
     
-    # Check if check-in for this date already exists
-    existing_checkin = session.exec(
-        select(CheckIn).where(
-            (CheckIn.goal_id == checkin_in.goal_id) & 
-            (CheckIn.checkin_date == checkin_in.date)  # TODO: Review checkin_in.date logic
-        )
-    ).first()
+    # Create new check-in, letting the unique constraint catch duplicates
+    now = datetime.utcnow()
+    checkin_id = uuid4()
+    checkins = insert_checkins(
+        session,
+        [{
+            **checkin_in.model_dump(exclude={"date"}),
+            "id": checkin_id,
+            "checkin_date": checkin_in.date or date.today(),
+            "status": float(checkin_in.status),
+            "created_at": now,
+            "updated_at": now,
+            "change_seq": next_change_seq(session, current_user.id),
+        }],
+        overwrite=upsert,
+    )
     
-    if existing_checkin:
+    if not checkins:
         raise BadRequestError(detail="Check-in for this date already exists")
     
-    # Create new check-in
-    checkin_data = checkin_in.dict()
+    # Update goal aggregates and heatmap in the same transaction
+    checkin = checkins[0]
+    if checkin.id == checkin_id:
+        apply_checkin(session, checkin)
+    else:
+        rebuild_goal_stats(session, checkin.goal_id)
+        response.status_code = status.HTTP_200_OK
+    apply_heatmap_checkins(session, checkins)
+    if goal.type == GoalType.QUANTITATIVE:
+        apply_rollup_checkins(session, checkins, overwritten=checkin.id != checkin_id)
+    record_checkin_day(session, current_user.id, checkin.checkin_date)
+    
+    checkin_read = CheckInRead.model_validate(checkin)
+    session.commit()
+    
+    return checkin_read
+
+
+@router.post("/batch", response_model=CheckInBatchRead)
+@db_endpoint
+def create_checkin_batch(
+    batch_in: CheckInBatchCreate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> CheckInBatchRead:
+    """
+    Create many check-ins at once, e.g. when flushing offline check-ins
+    
+    Goals are looked up with one query and duplicates are found with one
+    query, then all new check-ins are inserted with one statement.
+    Every item gets its own result, so one bad item doesn't reject the batch.
     
-    # Ensure date is set
-    if not checkin_data.get('date'):
-        checkin_data['date'] = date.today()
+    Args:
+        batch_in: Batch of check-in creation data
+        session: Database session
+        current_user: Current authenticated user
         
-    checkin = CheckIn(
-        **checkin_data,
-        created_at=datetime.utcnow()
-    )
+    Returns:
+        Per-item results
+        
+    Raises:
+        BadRequestError: If the batch exceeds the maximum size
+    """
+    if len(batch_in.checkins) > settings.CHECKIN_BATCH_MAX_SIZE:
+        raise BadRequestError(
+            detail=f"Batch cannot contain more than {settings.CHECKIN_BATCH_MAX_SIZE} check-ins"
+        )
+    
+    # Ensure dates are set
+    today = date.today()
+    items = [(checkin_in, checkin_in.date or today) for checkin_in in batch_in.checkins]
+    
+    # Get all referenced goals from database
+    goal_ids = {checkin_in.goal_id for checkin_in, _ in items}
+    goals = {
+        goal.id: goal
+        for goal in session.exec(
+            select(Goal).where(Goal.id.in_(goal_ids) & Goal.deleted_at.is_(None))
+        ).all()
+    }
+    owned_goal_ids = [
+        goal_id for goal_id, goal in goals.items() if goal.user_id == current_user.id
+    ]
+    
+    # Get check-ins that already exist on the requested dates
+    existing = set()
+    if owned_goal_ids:
+        checkin_dates = {checkin_date for _, checkin_date in items}
+        existing = {
+            (goal_id, checkin_date)
+            for goal_id, checkin_date in session.exec(
+                select(CheckIn.goal_id, CheckIn.checkin_date).where(
+                    CheckIn.goal_id.in_(owned_goal_ids) &
+                    CheckIn.checkin_date.in_(checkin_dates)
+                )
+            ).all()
+        }
+    
+    # Create new check-ins
+    now = datetime.utcnow()
+    change_seq = None
+    rows = []
+    results = {}
+    for index, (checkin_in, checkin_date) in enumerate(items):
+        goal = goals.get(checkin_in.goal_id)
+        
+        if not goal:
+            results[index] = CheckInBatchItem(
+                index=index, result="not_found", detail="Goal not found"
+            )
+            continue
+        
+        if goal.user_id != current_user.id:
+            results[index] = CheckInBatchItem(
+                index=index, result="forbidden", detail="Not authorized to access this goal"
+            )
+            continue
+        
+        key = (checkin_in.goal_id, checkin_date)
+        if key in existing:
+            results[index] = CheckInBatchItem(
+                index=index, result="duplicate", detail="Check-in for this date already exists"
+            )
+            continue
+        existing.add(key)
+        
+        if change_seq is None:
+            change_seq = next_change_seq(session, current_user.id)
+        
+        rows.append((index, {
+            **checkin_in.model_dump(exclude={"date"}),
+            "id": uuid4(),
+            "checkin_date": checkin_date,
+            "status": float(checkin_in.status),
+            "created_at": now,
+            "updated_at": now,
+            "change_seq": change_seq,
+        }))
+    
+    # Insert in one statement; rows raced in by concurrent requests are skipped
+    checkins = insert_checkins(session, [row for _, row in rows])
+    created = {checkin.id: checkin for checkin in checkins}
+    for index, row in rows:
+        checkin = created.get(row["id"])
+        if checkin:
+            results[index] = CheckInBatchItem(
+                index=index, result="created", checkin=CheckInRead.model_validate(checkin)
+            )
+        else:
+            results[index] = CheckInBatchItem(
+                index=index, result="duplicate", detail="Check-in for this date already exists"
+            )
     
-    # Add check-in to database
-    session.add(checkin)
+    # Update goal aggregates and heatmaps in the same transaction
+    apply_checkin_batch(session, checkins)
+    apply_heatmap_checkins(session, checkins)
+    quantitative = [
+        checkin for checkin in checkins
+        if goals[checkin.goal_id].type == GoalType.QUANTITATIVE
+    ]
+    apply_rollup_checkins(session, quantitative)
+    if checkins:
+        record_checkin_day(
+            session, current_user.id, max(checkin.checkin_date for checkin in checkins)
+        )
     session.commit()
-    session.refresh(checkin)
     
-    return checkin
+    return CheckInBatchRead(
+        created=len(checkins),
+        results=[results[index] for index in range(len(items))],
+    )
+
+
+@router.post("/import", response_model=CheckInImportRead)
+@db_endpoint
+def import_checkins(
+    file: UploadFile = File(...),
+    merge: bool = Query(False),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> CheckInImportRead:
+    """
+    Import historical check-ins from a CSV file, e.g. from another habit tracker
+    
+    Rows are mapped to the current user's goals by `goal_id` or
+    `goal_title`, and `status` is validated against each goal's type. The
+    upload is read incrementally and inserted IMPORT_CHUNK_SIZE rows per
+    transaction; chunks imported before a failure stay imported.
+    
+    Args:
+        file: UTF-8 CSV with date, status, goal_id or goal_title, and
+            optionally note columns
+        merge: Overwrite existing check-ins on the same day instead of
+            skipping them
+        session: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Row counts and the first rejected rows
+        
+    Raises:
+        BadRequestError: If required columns are missing
+    """
+    # Undecodable bytes fail their rows' validation instead of the whole file
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        return import_checkins_csv(
+            session,
+            current_user.id,
+            lines,
+            overwrite=merge,
+            chunk_size=settings.IMPORT_CHUNK_SIZE,
+            max_errors=settings.IMPORT_MAX_ERRORS,
+        )
+    finally:
+        # Leave closing the upload to FastAPI
+        lines.detach()
 
 
 @router.get("/{goal_id}", response_model=List[CheckInRead])
+@db_endpoint
 def get_checkins(
     goal_id: UUID,
+    request: Request,
+    response: Response,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    before: Optional[date] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=settings.CHECKIN_PAGE_MAX_SIZE),
+    max_points: Optional[int] = Query(None, ge=3, le=settings.CHECKIN_PAGE_MAX_SIZE),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> List[CheckIn]:
     """
-    Get all check-ins for a specific goal
+    Get check-ins for a specific goal, newest first
+    
+    Supports an inclusive `from`/`to` date range and keyset pagination: when
+    `limit` is given and more check-ins remain, the `X-Next-Cursor` header
+    holds the value to pass as `before` to fetch the next page. For charts,
+    `max_points` instead reduces the range to at most that many check-ins
+    with Largest-Triangle-Three-Buckets, keeping the shape of the series.
+    Responds 304 if If-None-Match holds the current ETag.
     
     Args:
         goal_id: Goal ID
+        request: Request, used for If-None-Match
+        response: Response, used to set the ETag and pagination headers
+        from_date: Earliest check-in date to include
+        to_date: Latest check-in date to include
+        before: Only include check-ins dated before this cursor
+        limit: Maximum number of check-ins to return
+        max_points: Maximum number of check-ins to plot the range with
         session: Database session
         current_user: Current authenticated user
         
@@ -100,10 +349,21 @@ def get_checkins(
     Raises:
         NotFoundError: If goal not found
         AuthorizationError: If goal doesn't belong to current user
+        BadRequestError: If both limit and max_points are given
     """
+    if limit is not None and max_points is not None:
+        raise BadRequestError(detail="Use either limit or max_points")
+    
+    # The ETag embeds the caller's own change sequence, so a match only
+    # proves the caller already holds this response
+    etag = user_data_etag(session, current_user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
     # Get goal from database
     goal = session.exec(
-        select(Goal).where(Goal.id == goal_id)
+        select(Goal).where((Goal.id == goal_id) & Goal.deleted_at.is_(None))
     ).first()
     
     # Check if goal exists
@@ -114,11 +374,205 @@ def get_checkins(
     if goal.user_id != current_user.id:
         raise AuthorizationError(detail="Not authorized to access this goal")
     
-    # Get check-ins from database
-    checkins = session.exec(
-        select(CheckIn)
-        .where(CheckIn.goal_id == goal_id)
-        .order_by(CheckIn.checkin_date.desc())
-    ).all()
+    # On the fast path, select plain columns instead of ORM objects
+    columns = _CHECKIN_READ_COLUMNS if settings.FAST_JSON_ENABLED else (CheckIn,)
+    
+    # Get check-ins from database, walking the (goal_id, checkin_date) index
+    query = select(*columns).where(CheckIn.goal_id == goal_id)
+    if from_date:
+        query = query.where(CheckIn.checkin_date >= from_date)
+    if to_date:
+        query = query.where(CheckIn.checkin_date <= to_date)
+    if before:
+        query = query.where(CheckIn.checkin_date < before)
+    query = query.order_by(CheckIn.checkin_date.desc())
+    
+    if limit is not None:
+        # Fetch one extra row to know whether another page exists
+        query = query.limit(limit + 1)
+    
+    checkins = session.exec(query).all()
+    if limit is not None and len(checkins) > limit:
+        checkins = checkins[:limit]
+        response.headers["X-Next-Cursor"] = checkins[-1].date.isoformat()
+    
+    if max_points is not None and len(checkins) > max_points:
+        # Downsample oldest first, then restore the newest first order
+        oldest_first = checkins[::-1]
+        keep = lttb_indices(
+            [checkin.date.toordinal() for checkin in oldest_first],
+            [checkin.status for checkin in oldest_first],
+            max_points,
+        )
+        checkins = [oldest_first[index] for index in reversed(keep)]
+    
+    if settings.FAST_JSON_ENABLED:
+        keys = [column.key for column in _CHECKIN_READ_COLUMNS]
+        return fast_json_response(rows_to_dicts(checkins, keys), response)
+    
+    return checkins
+
+
+@router.get("/{goal_id}/stats", response_model=GoalStatsRead)
+@db_endpoint
+def get_checkin_stats(
+    goal_id: UUID,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> GoalStatsRead:
+    """
+    Get check-in statistics for a specific goal
+    
+    Served from the goal's aggregate row, so the cost does not depend on
+    the length of the check-in history.
+    
+    Args:
+        goal_id: Goal ID
+        session: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Goal statistics
+        
+    Raises:
+        NotFoundError: If goal not found
+        AuthorizationError: If goal doesn't belong to current user
+    """
+    # Get goal from database
+    goal = session.exec(
+        select(Goal).where((Goal.id == goal_id) & Goal.deleted_at.is_(None))
+    ).first()
+    
+    # Check if goal exists
+    if not goal:
+        raise NotFoundError(detail="Goal not found")
+    
+    # Check if goal belongs to current user
+    if goal.user_id != current_user.id:
+        raise AuthorizationError(detail="Not authorized to access this goal")
+    
+    # Get aggregates from database
+    stats = session.get(GoalStats, goal_id)
+    
+    return build_stats_read(goal_id, stats)
+
+
+@router.get("/{goal_id}/heatmap", response_model=HeatmapRead)
+@db_endpoint
+def get_checkin_heatmap(
+    goal_id: UUID,
+    year: Optional[int] = Query(None, ge=1, le=9999),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> HeatmapRead:
+    """
+    Get a calendar heatmap of a goal for a year or a month
+    
+    Binary goals get a base64 bitset with one bit per day, quantitative
+    goals one value per day. Served from the goal's heatmap row, which is
+    built on first read and kept current by check-in writes, so the cost
+    does not depend on the length of the check-in history.
+    
+    Args:
+        goal_id: Goal ID
+        year: Year, defaults to the current year
+        month: Month of the year; the whole year if omitted
+        session: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Goal heatmap
+        
+    Raises:
+        NotFoundError: If goal not found
+        AuthorizationError: If goal doesn't belong to current user
+    """
+    # Get goal from database
+    goal = session.exec(
+        select(Goal).where((Goal.id == goal_id) & Goal.deleted_at.is_(None))
+    ).first()
+    
+    # Check if goal exists
+    if not goal:
+        raise NotFoundError(detail="Goal not found")
+    
+    # Check if goal belongs to current user
+    if goal.user_id != current_user.id:
+        raise AuthorizationError(detail="Not authorized to access this goal")
+    
+    # Get heatmap from database, building it on first read
+    heatmap = session.get(GoalHeatmap, goal_id)
+    if heatmap is None:
+        heatmap = build_goal_heatmap(session, goal)
+        session.commit()
+    
+    year = year or date.today().year
+    if month:
+        start_date = date(year, month, 1)
+        end_date = period_end(start_date, RollupPeriod.MONTH)
+    else:
+        start_date, end_date = date(year, 1, 1), date(year, 12, 31)
+    
+    return HeatmapGrid.from_row(heatmap).read(goal_id, start_date, end_date)
+
+
+
+@router.get("/{goal_id}/rollups", response_model=RollupRead)
+@db_endpoint
+def get_checkin_rollups(
+    goal_id: UUID,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    period: Optional[RollupPeriod] = Query(None),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> RollupRead:
+    """
+    Get weekly or monthly sums, averages, minimums and maximums of a
+    quantitative goal's check-in values
+    
+    Served from rollup rows kept current by check-in writes, one row per
+    period, so multi-year ranges read a few dozen rows. Without `period`,
+    weeks are used if the range spans at most ROLLUP_MAX_POINTS of them,
+    months otherwise.
+    
+    Args:
+        goal_id: Goal ID
+        from_date: First day of the range, defaults to a year before `to`
+        to_date: Last day of the range, defaults to today
+        period: Period of the series
+        session: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Rollups of the periods overlapping the range
+        
+    Raises:
+        NotFoundError: If goal not found
+        AuthorizationError: If goal doesn't belong to current user
+        BadRequestError: If the goal is binary or the range is empty
+    """
+    # Get goal from database
+    goal = session.exec(
+        select(Goal).where((Goal.id == goal_id) & Goal.deleted_at.is_(None))
+    ).first()
+    
+    # Check if goal exists
+    if not goal:
+        raise NotFoundError(detail="Goal not found")
+    
+    # Check if goal belongs to current user
+    if goal.user_id != current_user.id:
+        raise AuthorizationError(detail="Not authorized to access this goal")
+    
+    if goal.type != GoalType.QUANTITATIVE:
+        raise BadRequestError(detail="Rollups are only kept for quantitative goals")
+    
+    to_date = to_date or date.today()
+    from_date = from_date or to_date - timedelta(days=365)
+    if from_date > to_date:
+        raise BadRequestError(detail="from must not be after to")
     
-    return checkins
\ No newline at end of file
+    period = period or choose_period(from_date, to_date, settings.ROLLUP_MAX_POINTS)
+    return read_goal_rollups(session, goal_id, from_date, to_date, period)
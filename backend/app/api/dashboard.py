@@ -0,0 +1,116 @@
+from collections import defaultdict
+from datetime import date
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
+
+from app.api.deps import db_endpoint, get_current_user
+from app.api.etag import etag_matches, not_modified, user_data_etag
+from app.config import settings
+from app.database import get_session
+from app.models.checkin import CheckIn, CheckInRead
+from app.models.dashboard import DashboardGoal, DashboardRead
+from app.models.goal import Goal
+from app.models.stats import GoalStats
+from app.models.user import User
+from app.services.stats import build_stats_read
+
+router = APIRouter()
+
+
+@router.get("", response_model=DashboardRead)
+@db_endpoint
+def get_dashboard(
+    request: Request,
+    response: Response,
+    recent: int = Query(7, ge=1),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> DashboardRead:
+    """
+    Get everything the home screen shows in one response
+    
+    Returns all goals of the current user with today's check-in, their
+    latest check-ins and their statistics. Three queries serve it, however
+    many goals there are: the ETag version lookup, goals joined with their
+    aggregates, and the latest check-ins of all goals. Responds 304 if
+    If-None-Match holds the current ETag.
+    
+    Args:
+        request: Request, used for If-None-Match
+        response: Response, used to set the ETag
+        recent: Number of latest check-ins per goal, at most
+            DASHBOARD_RECENT_MAX
+        session: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Goals with today's check-in, latest check-ins and statistics
+    """
+    today = date.today()
+    recent = min(recent, settings.DASHBOARD_RECENT_MAX)
+    
+    # Streaks lapse at midnight, so the dashboard also depends on the date
+    etag = user_data_etag(session, current_user, today, recent)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
+    rows = session.exec(
+        select(Goal, GoalStats)
+        .outerjoin(GoalStats, GoalStats.goal_id == Goal.id)
+        .where((Goal.user_id == current_user.id) & Goal.deleted_at.is_(None))
+        .order_by(Goal.created_at, Goal.id)
+    ).all()
+    
+    # Date of each goal's `recent`-th latest check-in, found by an index
+    # seek per goal rather than ranking whole histories
+    latest = aliased(CheckIn)
+    oldest_recent_date = (
+        select(latest.checkin_date)
+        .where((latest.goal_id == Goal.id) & (latest.checkin_date <= today))
+        .order_by(latest.checkin_date.desc())
+        .limit(1)
+        .offset(recent - 1)
+        .scalar_subquery()
+    )
+    recent_rows = session.exec(
+        select(
+            CheckIn.status,
+            CheckIn.note,
+            CheckIn.id,
+            CheckIn.goal_id,
+            CheckIn.checkin_date,
+        )
+        .select_from(Goal)
+        .join(
+            CheckIn,
+            (CheckIn.goal_id == Goal.id)
+            & (CheckIn.checkin_date <= today)
+            & (CheckIn.checkin_date >= func.coalesce(oldest_recent_date, date.min)),
+        )
+        .where((Goal.user_id == current_user.id) & Goal.deleted_at.is_(None))
+        .order_by(CheckIn.goal_id, CheckIn.checkin_date.desc())
+    ).all()
+    
+    recent_by_goal = defaultdict(list)
+    for status, note, checkin_id, goal_id, checkin_date in recent_rows:
+        recent_by_goal[goal_id].append(CheckInRead(
+            status=status, note=note, id=checkin_id, goal_id=goal_id, date=checkin_date,
+        ))
+    
+    goals = []
+    for goal, goal_stats in rows:
+        recent_checkins = recent_by_goal.get(goal.id, [])
+        today_checkin = None
+        if recent_checkins and recent_checkins[0].date == today:
+            today_checkin = recent_checkins[0]
+        goals.append(DashboardGoal(
+            **goal.model_dump(),
+            today=today_checkin,
+            recent_checkins=recent_checkins,
+            stats=build_stats_read(goal.id, goal_stats, today),
+        ))
+    
+    return DashboardRead(date=today, goals=goals)
@@ -1,20 +1,85 @@
+import functools
+import inspect
+
 from fastapi import Depends, Security
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy import event
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session, select
-from typing import Generator, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Callable, Generator, Optional
+from uuid import UUID
 
+from app.core.cache import TTLCache
 from app.core.errors import AuthenticationError
-from app.core.security import verify_password
-from app.database import get_session
+from app.core.security import verify_and_update_password_async
+from app.database import get_async_session, get_session
 from app.models.user import User, TokenPayload
 from app.config import settings
 
+
+def to_async_session_endpoint(func: Callable) -> Callable:
+    """
+    Turn a sync endpoint or dependency taking a `session` into an async one
+    
+    The wrapper depends on an AsyncSession and runs the original function
+    through AsyncSession.run_sync, so its ORM code does its database I/O on
+    the event loop instead of blocking a threadpool worker.
+    
+    Args:
+        func: Endpoint or dependency with a `session: Session` parameter
+        
+    Returns:
+        Async endpoint or dependency with the same other parameters
+    """
+    signature = inspect.signature(func)
+    parameters = [
+        parameter.replace(annotation=AsyncSession, default=Depends(get_async_session))
+        if parameter.name == "session" else parameter
+        for parameter in signature.parameters.values()
+    ]
+    
+    @functools.wraps(func)
+    async def wrapper(*args, session: AsyncSession, **kwargs):
+        return await session.run_sync(
+            lambda sync_session: func(*args, session=sync_session, **kwargs)
+        )
+    
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
+
+
+def db_endpoint(func: Callable) -> Callable:
+    """Serve an endpoint or dependency through the async engine if DATABASE_ASYNC is set"""
+    if settings.DATABASE_ASYNC:
+        return to_async_session_endpoint(func)
+    return func
+
+
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Verified users by ID, so authenticated requests skip the user lookup.
+# change_seq is left out on purpose: it changes on every write and is loaded
+# on access instead.
+PRINCIPAL_CACHE_FIELDS = ("id", "email", "hashed_password", "created_at")
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_cached_principal(mapper, connection, target: User) -> None:
+    """Drop a user from the principal cache when its row changes"""
+    principal_cache.invalidate(target.id)
+
 
+@db_endpoint
 def get_current_user(
     session: Session = Depends(get_session),
     token: str = Depends(oauth2_scheme),
@@ -40,21 +105,35 @@ def get_current_user(
             algorithms=[settings.ALGORITHM]
         )
         token_data = TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
+        user_id = UUID(token_data.sub)
+    except (jwt.JWTError, ValidationError, TypeError, ValueError):
         raise AuthenticationError()
     
+    # Get user from the principal cache
+    if settings.AUTH_CACHE_ENABLED:
+        snapshot = principal_cache.get(user_id)
+        if snapshot is not None:
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            return session.merge(user, load=False)
+    
     # Get user from database
     user = session.exec(
-        select(User).where(User.id == token_data.sub)
+        select(User).where(User.id == user_id)
     ).first()
     
     if not user:
         raise AuthenticationError()
     
+    if settings.AUTH_CACHE_ENABLED:
+        principal_cache.set(
+            user_id, {name: getattr(user, name) for name in PRINCIPAL_CACHE_FIELDS}
+        )
+    
     return user
 
 
-def authenticate_user(
+async def authenticate_user(
     email: str, 
     password: str, 
     session: Session
@@ -62,6 +141,9 @@ def authenticate_user(
     """
     Authenticate a user with email and password
     
+    Database work runs on the threadpool and bcrypt on the password hashing
+    pool; no thread is held while waiting for either.
+    
     Args:
         email: User email
         password: User password
@@ -71,12 +153,27 @@ def authenticate_user(
         User if authentication succeeds, None otherwise
     """
     # Get user from database
-    user = session.exec(
-        select(User).where(User.email == email)
-    ).first()
+    user = await run_in_threadpool(
+        lambda: session.exec(select(User).where(User.email == email)).first()
+    )
     
-    # Check if user exists and password is correct
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
         return None
     
+    # Check if password is correct
+    is_valid, new_hash = await verify_and_update_password_async(
+        password, user.hashed_password
+    )
+    if not is_valid:
+        return None
+    
+    # Upgrade hashes made under an older cost policy
+    if new_hash:
+        def save_new_hash():
+            user.hashed_password = new_hash
+            session.add(user)
+            session.commit()
+        
+        await run_in_threadpool(save_new_hash)
+    
     return user
\ No newline at end of file
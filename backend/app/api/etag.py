@@ -0,0 +1,53 @@
+from typing import Any
+
+from fastapi import Request, Response, status
+from sqlmodel import Session, select
+
+from app.models.user import User
+
+
+def user_data_etag(session: Session, user: User, *parts: Any) -> str:
+    """
+    Build a strong ETag for a read of the user's goal and check-in data
+
+    Derived from the user's change sequence, which every goal or check-in
+    write bumps, so it costs one indexed lookup instead of loading or
+    hashing the response rows.
+
+    Args:
+        session: Database session
+        user: Current authenticated user
+        *parts: Extra inputs the response depends on, e.g. today's date
+
+    Returns:
+        Quoted ETag
+    """
+    change_seq = session.exec(
+        select(User.change_seq).where(User.id == user.id)
+    ).one()
+    return '"' + "-".join([user.id.hex, str(change_seq), *map(str, parts)]) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag
+
+    Args:
+        request: Request
+        etag: Quoted ETag of the current representation
+
+    Returns:
+        True if the client's copy is current
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 Not Modified response for an ETag"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,48 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from app.api.deps import db_endpoint, get_current_user
+from app.config import settings
+from app.database import get_session
+from app.models.user import User
+from app.services.export import (
+    EXPORT_MEDIA_TYPES, ExportFormat, stream_export, stream_export_async,
+)
+
+router = APIRouter()
+
+
+@router.get("", response_class=StreamingResponse)
+@db_endpoint
+def export_data(
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Export all goals and check-ins of the current user
+    
+    The export is streamed while it is read, so memory use stays the same
+    whatever the size of the history. NDJSON has a `goal` line followed by
+    a `checkin` line per check-in of that goal; CSV has one row per
+    check-in, with its goal's columns repeated.
+    
+    Args:
+        format: ndjson or csv
+        session: Database session, whose engine the export reads through
+        current_user: Current authenticated user
+        
+    Returns:
+        Streaming export
+    """
+    bind = session.get_bind()
+    stream = stream_export_async if bind.dialect.is_async else stream_export
+    filename = f"track-my-goals-{date.today()}.{format.value}"
+    
+    return StreamingResponse(
+        stream(bind, current_user.id, format, settings.EXPORT_CHUNK_SIZE),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
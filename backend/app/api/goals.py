@@ -1,41 +1,115 @@
-from datetime import datetime
-from fastapi import APIRouter, Depends, status
+from datetime import date, datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, Response, status
 from sqlmodel import Session, select
 from typing import List
 from uuid import UUID
 
-from app.api.deps import get_current_user
+from app.api.deps import db_endpoint, get_current_user
+from app.api.etag import etag_matches, not_modified, user_data_etag
+from app.config import settings
 from app.core.errors import NotFoundError, AuthorizationError
+from app.core.responses import fast_json_response
 from app.database import get_session
-from app.models.goal import Goal, GoalCreate, GoalRead, GoalUpdate
+from app.models.goal import Goal, GoalCreate, GoalRead, GoalReadWithStats, GoalUpdate
+from app.models.stats import GoalStats
 from app.models.user import User
+from app.services.goals import delete_goal_rows, purge_goal_in_background
+from app.services.stats import build_stats_read, current_streak
+from app.services.sync import add_tombstone, next_change_seq
 
 router = APIRouter()
 
+# Columns of GoalRead, in its field order, for serializing from row tuples
+_GOAL_READ_COLUMNS = (
+    Goal.title,
+    Goal.description,
+    Goal.target_date,
+    Goal.type,
+    Goal.id,
+    Goal.user_id,
+)
 
-@router.get("", response_model=List[GoalRead])
+
+@router.get("", response_model=List[GoalReadWithStats])
+@db_endpoint
 def get_goals(
+    request: Request,
+    response: Response,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
-) -> List[Goal]:
+) -> List[GoalReadWithStats]:
     """
-    Get all goals for the current user
+    Get all goals for the current user, with their check-in statistics
+    
+    Goals and their aggregate rows are loaded in a single query, so the
+    cost does not grow with one extra query per goal. Responds 304 if
+    If-None-Match holds the current ETag.
     
     Args:
+        request: Request, used for If-None-Match
+        response: Response, used to set the ETag
         session: Database session
         current_user: Current authenticated user
         
     Returns:
         List of goals
     """
-    goals = session.exec(
-        select(Goal).where(Goal.user_id == current_user.id)
+    # Streaks lapse at midnight, so the listing also depends on the date
+    etag = user_data_etag(session, current_user, date.today())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
+    if settings.FAST_JSON_ENABLED:
+        return _fast_goals_response(session, current_user, response)
+    
+    rows = session.exec(
+        select(Goal, GoalStats)
+        .outerjoin(GoalStats, GoalStats.goal_id == Goal.id)
+        .where((Goal.user_id == current_user.id) & Goal.deleted_at.is_(None))
     ).all()
     
+    goals = []
+    for goal, goal_stats in rows:
+        stats = build_stats_read(goal.id, goal_stats)
+        goals.append(GoalReadWithStats(
+            **goal.model_dump(),
+            completion_rate=stats.completion_rate,
+            current_streak=stats.current_streak,
+        ))
+    
     return goals
 
 
+def _fast_goals_response(session: Session, user: User, response: Response) -> Response:
+    """Serialize the goal listing straight from row tuples"""
+    rows = session.exec(
+        select(
+            *_GOAL_READ_COLUMNS,
+            GoalStats.total_checkins,
+            GoalStats.completed_checkins,
+            GoalStats.current_run,
+            GoalStats.run_end_date,
+        )
+        .outerjoin(GoalStats, GoalStats.goal_id == Goal.id)
+        .where((Goal.user_id == user.id) & Goal.deleted_at.is_(None))
+    ).all()
+    
+    keys = [column.key for column in _GOAL_READ_COLUMNS]
+    today = date.today()
+    goals = []
+    for row in rows:
+        goal = dict(zip(keys, row))
+        total, completed, current_run, run_end_date = row[len(keys):]
+        goal["completion_rate"] = completed / total * 100 if total else 0.0
+        goal["current_streak"] = current_streak(run_end_date, current_run or 0, today)
+        goals.append(goal)
+    
+    return fast_json_response(goals, response)
+
+
 @router.post("", response_model=GoalRead, status_code=status.HTTP_201_CREATED)
+@db_endpoint
 def create_goal(
     goal_in: GoalCreate,
     session: Session = Depends(get_session),
@@ -54,10 +128,13 @@ def create_goal(
     """
     # Create new goal
     goal_data = goal_in.dict()
+    now = datetime.utcnow()
     goal = Goal(
         **goal_data,
         user_id=current_user.id,
-        created_at=datetime.utcnow()
+        created_at=now,
+        updated_at=now,
+        change_seq=next_change_seq(session, current_user.id),
     )
     
     # Add goal to database
@@ -69,16 +146,23 @@ def create_goal(
 
 
 @router.get("/{goal_id}", response_model=GoalRead)
+@db_endpoint
 def get_goal(
     goal_id: UUID,
+    request: Request,
+    response: Response,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> Goal:
     """
     Get a specific goal by ID
     
+    Responds 304 if If-None-Match holds the current ETag.
+    
     Args:
         goal_id: Goal ID
+        request: Request, used for If-None-Match
+        response: Response, used to set the ETag
         session: Database session
         current_user: Current authenticated user
         
@@ -89,9 +173,16 @@ def get_goal(
         NotFoundError: If goal not found
         AuthorizationError: If goal doesn't belong to current user
     """
+    # The ETag embeds the caller's own change sequence, so a match only
+    # proves the caller already holds this response
+    etag = user_data_etag(session, current_user)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    
     # Get goal from database
     goal = session.exec(
-        select(Goal).where(Goal.id == goal_id)
+        select(Goal).where((Goal.id == goal_id) & Goal.deleted_at.is_(None))
     ).first()
     
     # Check if goal exists
@@ -106,16 +197,25 @@ def get_goal(
 
 
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
+@db_endpoint
 def delete_goal(
     goal_id: UUID,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_user),
 ) -> None:
     """
-    Delete a goal
+    Delete a goal with its check-ins
+    
+    Check-ins are removed with set-based deletes, never loaded, in the same
+    transaction as the goal. Goals with more than
+    GOAL_SOFT_DELETE_MIN_CHECKINS check-ins are instead hidden at once and
+    purged in chunks by a background task, so a long history neither holds
+    the write lock nor delays the response.
     
     Args:
         goal_id: Goal ID
+        background_tasks: Background tasks, used to purge large goals
         session: Database session
         current_user: Current authenticated user
         
@@ -123,19 +223,39 @@ def delete_goal(
         NotFoundError: If goal not found
         AuthorizationError: If goal doesn't belong to current user
     """
-    # Get goal from database
-    goal = session.exec(
-        select(Goal).where(Goal.id == goal_id)
+    # Get goal and its check-in count from database
+    row = session.exec(
+        select(Goal, GoalStats.total_checkins)
+        .outerjoin(GoalStats, GoalStats.goal_id == Goal.id)
+        .where((Goal.id == goal_id) & Goal.deleted_at.is_(None))
     ).first()
     
     # Check if goal exists
-    if not goal:
+    if not row:
         raise NotFoundError(detail="Goal not found")
+    goal, total_checkins = row
     
     # Check if goal belongs to current user
     if goal.user_id != current_user.id:
         raise AuthorizationError(detail="Not authorized to delete this goal")
     
-    # Delete goal
-    session.delete(goal)
-    session.commit()
\ No newline at end of file
+    threshold = settings.GOAL_SOFT_DELETE_MIN_CHECKINS
+    soft_delete = threshold is not None and (total_checkins or 0) > threshold
+    if soft_delete:
+        goal.deleted_at = datetime.utcnow()
+        session.add(goal)
+    else:
+        delete_goal_rows(session, goal_id)
+    
+    # Leave a tombstone for delta sync either way
+    add_tombstone(
+        session, current_user.id, "goal", goal_id,
+        next_change_seq(session, current_user.id),
+    )
+    session.commit()
+    
+    if soft_delete:
+        background_tasks.add_task(
+            purge_goal_in_background,
+            session.get_bind(), goal_id, settings.GOAL_PURGE_CHUNK_SIZE,
+        )
@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app import database
+from app.api.deps import principal_cache
+from app.core.engine import get_pool_status
+from app.core.metrics import render_pool_status, request_metrics
+
+router = APIRouter()
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics() -> PlainTextResponse:
+    """
+    Get request, database and connection pool metrics in Prometheus text format
+
+    Returns:
+        Prometheus text exposition
+    """
+    # Collect pool status of every configured engine
+    pool_statuses = {"sync": get_pool_status(database.engine)}
+    if database.async_engine is not None:
+        pool_statuses["async"] = get_pool_status(database.async_engine.sync_engine)
+
+    lines = request_metrics.render()
+    lines.extend(render_pool_status(pool_statuses))
+
+    # Authenticated principal cache effectiveness
+    lines.append("# TYPE auth_cache_events_total counter")
+    cache_stats = principal_cache.stats()
+    for event in ("hits", "misses", "evictions"):
+        lines.append(f'auth_cache_events_total{{event="{event}"}} {cache_stats[event]}')
+
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
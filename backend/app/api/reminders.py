@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, status
+from sqlmodel import Session, delete
+
+from app.api.deps import db_endpoint, get_current_user
+from app.core.errors import NotFoundError
+from app.database import get_session
+from app.models.reminder import Reminder, ReminderRead, ReminderUpdate
+from app.models.user import User
+from app.services.reminders import save_reminder
+
+router = APIRouter()
+
+
+@router.get("", response_model=ReminderRead)
+@db_endpoint
+def get_reminder(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> Reminder:
+    """
+    Get the current user's daily check-in reminder
+
+    Args:
+        session: Database session
+        current_user: Current authenticated user
+
+    Returns:
+        Reminder settings and next occurrence
+
+    Raises:
+        NotFoundError: If no reminder is set
+    """
+    reminder = session.get(Reminder, current_user.id)
+    if not reminder:
+        raise NotFoundError(detail="Reminder not set")
+    return reminder
+
+
+@router.put("", response_model=ReminderRead)
+@db_endpoint
+def update_reminder(
+    reminder_in: ReminderUpdate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> ReminderRead:
+    """
+    Set the current user's daily check-in reminder
+
+    The reminder is sent every day at `local_time` in `timezone` (an IANA
+    name such as Europe/Paris), unless the user already checked in on
+    that day.
+
+    Args:
+        reminder_in: Reminder settings
+        session: Database session
+        current_user: Current authenticated user
+
+    Returns:
+        Reminder settings and next occurrence
+
+    Raises:
+        BadRequestError: If the time zone doesn't exist
+    """
+    reminder = save_reminder(session, current_user.id, reminder_in)
+    reminder_read = ReminderRead.model_validate(reminder)
+    session.commit()
+
+    return reminder_read
+
+
+@router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+@db_endpoint
+def delete_reminder(
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    """
+    Turn off the current user's daily check-in reminder
+
+    Args:
+        session: Database session
+        current_user: Current authenticated user
+    """
+    session.exec(delete(Reminder).where(Reminder.user_id == current_user.id))
+    session.commit()
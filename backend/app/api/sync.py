@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session, select
+
+from app.api.deps import db_endpoint, get_current_user
+from app.database import get_session
+from app.models.checkin import CheckIn
+from app.models.goal import Goal
+from app.models.sync import SyncRead, Tombstone
+from app.models.user import User
+
+router = APIRouter()
+
+
+@router.get("", response_model=SyncRead)
+@db_endpoint
+def get_changes(
+    since: int = Query(0, ge=0),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_user),
+) -> SyncRead:
+    """
+    Get the current user's goals, check-ins and deletions changed since a cursor
+    
+    Pass the `cursor` of the previous response as `since`; 0 returns
+    everything. Deleting a goal also removes its check-ins, so only the
+    goal's tombstone is reported; goals still being purged are left out.
+    
+    Args:
+        since: Cursor returned by the previous sync
+        session: Database session
+        current_user: Current authenticated user
+        
+    Returns:
+        Changed rows, tombstones and the new cursor
+    """
+    # Read the cursor before the rows, so nothing committed in between is skipped
+    cursor = session.exec(
+        select(User.change_seq).where(User.id == current_user.id)
+    ).one()
+    
+    goals = session.exec(
+        select(Goal)
+        .where(
+            (Goal.user_id == current_user.id)
+            & (Goal.change_seq > since)
+            & Goal.deleted_at.is_(None)
+        )
+        .order_by(Goal.change_seq)
+    ).all()
+    
+    checkins = session.exec(
+        select(CheckIn)
+        .join(Goal, CheckIn.goal_id == Goal.id)
+        .where(
+            (Goal.user_id == current_user.id)
+            & (CheckIn.change_seq > since)
+            & Goal.deleted_at.is_(None)
+        )
+        .order_by(CheckIn.change_seq)
+    ).all()
+    
+    deleted = session.exec(
+        select(Tombstone)
+        .where((Tombstone.user_id == current_user.id) & (Tombstone.change_seq > since))
+        .order_by(Tombstone.change_seq)
+    ).all()
+    
+    return SyncRead(
+        cursor=cursor,
+        goals=goals,
+        checkins=checkins,
+        deleted=deleted,
+    )
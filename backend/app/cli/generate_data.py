@@ -0,0 +1,281 @@
+"""
+Generate synthetic users, goals and check-in histories and bulk load them
+
+Rows are streamed into the database with executemany Core inserts in large
+batches, one transaction per batch. All users share one password hash,
+computed once, and goal aggregates are folded while histories are
+generated, so nothing goes through the API or the ORM unit of work.
+
+Usage:
+    python -m app.cli.generate_data --users 10000 --goals 5-20 --days 730
+        [--database-url sqlite:///./capacity.db] [--skip-probability 0.1]
+        [--streak-mean 7] [--gap-mean 2] [--values 0-10] [--seed 42]
+
+Users are named user{n}@example.com, starting at --first-user, so runs
+with distinct ranges can add to an existing database.
+"""
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+
+from app.config import settings
+from app.core.engine import create_db_engine
+from app.core.security import get_password_hash
+from app.models.checkin import CheckIn
+from app.models.goal import Goal, GoalType
+from app.models.stats import GoalStats
+from app.models.user import User
+from app.services.stats import StatsAccumulator, fold_checkin
+
+
+class DataGenConfig(BaseModel):
+    """Volumes and distributions of the generated data"""
+    users: int = 100
+    first_user: int = 0
+    goals_min: int = 5  # Goals per user, uniformly distributed
+    goals_max: int = 20
+    days: int = 365  # Longest history; each goal's length is uniform in [days/2, days]
+    binary_ratio: float = 0.5  # Share of binary goals, the rest are quantitative
+    streak_mean: float = 7.0  # Mean length of runs of completed days (geometric)
+    gap_mean: float = 2.0  # Mean length of runs of missed days (geometric)
+    skip_probability: float = 0.1  # Days without any check-in, e.g. app not opened
+    value_min: float = 0.0  # Range of quantitative values on completed days
+    value_max: float = 10.0
+    end_date: date = Field(default_factory=date.today)
+    password: str = "password123"
+    seed: int = 42
+    batch_size: int = 50000  # Check-in rows per insert and transaction
+
+
+def _geometric(rng: random.Random, mean: float) -> int:
+    """Draw a run length of at least 1 with the given mean"""
+    if mean <= 1:
+        return 1
+    length = 1
+    continue_probability = 1 - 1 / mean
+    while rng.random() < continue_probability:
+        length += 1
+    return length
+
+
+class DataGenerator:
+    """Deterministic generator of user, goal, aggregate and check-in rows"""
+
+    def __init__(self, config: DataGenConfig, hashed_password: str):
+        self.config = config
+        self.hashed_password = hashed_password
+        self.rng = random.Random(config.seed)
+        self.now = datetime.utcnow()
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def user(self, number: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Generate one user with their goals, aggregates and check-ins
+
+        Args:
+            number: User number, used in the email address
+
+        Returns:
+            User row, goal rows, goal aggregate rows and check-in rows
+        """
+        config = self.config
+        user_id = self._uuid()
+        user = {
+            "id": user_id,
+            "email": f"user{number}@example.com",
+            "hashed_password": self.hashed_password,
+            "created_at": self.now,
+            "change_seq": 1,
+        }
+
+        goals, stats_rows, checkins = [], [], []
+        for goal_number in range(self.rng.randint(config.goals_min, config.goals_max)):
+            goal_id = self._uuid()
+            is_binary = self.rng.random() < config.binary_ratio
+            goals.append({
+                "id": goal_id,
+                "user_id": user_id,
+                "title": f"Goal {goal_number}",
+                "description": None,
+                "target_date": config.end_date + timedelta(days=self.rng.randint(30, 365)),
+                "type": GoalType.BINARY if is_binary else GoalType.QUANTITATIVE,
+                "created_at": self.now,
+                "updated_at": self.now,
+                "change_seq": 1,
+            })
+            stats = StatsAccumulator(goal_id)
+            checkins.extend(self._history(goal_id, is_binary, stats))
+            stats_rows.append(stats.row())
+
+        return user, goals, stats_rows, checkins
+
+    def _history(self, goal_id: uuid.UUID, is_binary: bool, stats: StatsAccumulator) -> List[Dict[str, Any]]:
+        """Generate a goal's check-ins oldest first, folding them into its aggregate"""
+        config = self.config
+        # Local names keep the per-row loop tight
+        rng = self.rng
+        random_bits = rng.getrandbits
+        now = self.now
+        one_day = timedelta(days=1)
+
+        length = rng.randint(max(1, config.days // 2), max(1, config.days))
+        day = config.end_date - timedelta(days=length - 1)
+
+        rows = []
+        completed = rng.random() < 0.5
+        remaining = 0
+        for _ in range(length):
+            # Alternate runs of completed and missed days
+            if remaining == 0:
+                completed = not completed
+                remaining = _geometric(rng, config.streak_mean if completed else config.gap_mean)
+            remaining -= 1
+
+            if rng.random() >= config.skip_probability:
+                if not completed:
+                    status = 0.0
+                elif is_binary:
+                    status = 1.0
+                else:
+                    status = round(rng.uniform(config.value_min, config.value_max), 1)
+                rows.append({
+                    "id": uuid.UUID(int=random_bits(128), version=4),
+                    "goal_id": goal_id,
+                    "checkin_date": day,
+                    "created_at": now,
+                    "updated_at": now,
+                    "change_seq": 1,
+                    "status": status,
+                    "note": None,
+                })
+                fold_checkin(stats, day, status)
+            day += one_day
+
+        return rows
+
+
+def generate_data(
+    engine: Engine,
+    config: DataGenConfig,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
+) -> Dict[str, int]:
+    """
+    Generate data and stream it into a database
+
+    Users, goals and aggregates are inserted before the check-ins that
+    reference them, in the same transaction, so foreign keys hold at
+    every commit.
+
+    Args:
+        engine: Target database engine; tables are created if missing
+        config: Volumes and distributions
+        progress: Called with the running row counts after every batch
+
+    Returns:
+        Number of rows inserted per table
+    """
+    SQLModel.metadata.create_all(engine)
+    generator = DataGenerator(config, get_password_hash(config.password))
+    counts = {"users": 0, "goals": 0, "checkins": 0}
+
+    users, goals, stats_rows, checkins = [], [], [], []
+
+    def flush(connection) -> None:
+        for model, rows in ((User, users), (Goal, goals), (GoalStats, stats_rows)):
+            if rows:
+                connection.execute(insert(model), rows)
+        for start in range(0, len(checkins), config.batch_size):
+            connection.execute(insert(CheckIn), checkins[start:start + config.batch_size])
+        connection.commit()
+
+        counts["users"] += len(users)
+        counts["goals"] += len(goals)
+        counts["checkins"] += len(checkins)
+        for rows in (users, goals, stats_rows, checkins):
+            rows.clear()
+        if progress:
+            progress(counts)
+
+    with engine.connect() as connection:
+        for number in range(config.first_user, config.first_user + config.users):
+            user, user_goals, user_stats, user_checkins = generator.user(number)
+            users.append(user)
+            goals.extend(user_goals)
+            stats_rows.extend(user_stats)
+            checkins.extend(user_checkins)
+            if len(checkins) >= config.batch_size:
+                flush(connection)
+        flush(connection)
+
+    return counts
+
+
+def _parse_range(value: str) -> Tuple[float, float]:
+    """Parse "min-max" or a single number into a range"""
+    low, _, high = value.partition("-")
+    return float(low), float(high or low)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--first-user", type=int, default=0)
+    parser.add_argument("--goals", default="5-20", help="Goals per user, e.g. 5-20")
+    parser.add_argument("--days", type=int, default=365, help="Longest history per goal")
+    parser.add_argument("--binary-ratio", type=float, default=0.5)
+    parser.add_argument("--streak-mean", type=float, default=7.0)
+    parser.add_argument("--gap-mean", type=float, default=2.0)
+    parser.add_argument("--skip-probability", type=float, default=0.1)
+    parser.add_argument("--values", default="0-10", help="Quantitative value range")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    goals_min, goals_max = _parse_range(args.goals)
+    value_min, value_max = _parse_range(args.values)
+    config = DataGenConfig(
+        users=args.users,
+        first_user=args.first_user,
+        goals_min=int(goals_min),
+        goals_max=int(goals_max),
+        days=args.days,
+        binary_ratio=args.binary_ratio,
+        streak_mean=args.streak_mean,
+        gap_mean=args.gap_mean,
+        skip_probability=args.skip_probability,
+        value_min=value_min,
+        value_max=value_max,
+        password=args.password,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+
+    start = time.perf_counter()
+
+    def report(counts: Dict[str, int]) -> None:
+        elapsed = time.perf_counter() - start
+        rows = sum(counts.values())
+        print(
+            f"{counts['users']} users, {counts['goals']} goals, {counts['checkins']} check-ins"
+            f" ({rows / elapsed * 60:,.0f} rows/min)",
+            file=sys.stderr,
+        )
+
+    generate_data(create_db_engine(args.database_url, settings), config, progress=report)
+
+
+if __name__ == "__main__":
+    main()
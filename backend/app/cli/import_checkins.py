@@ -0,0 +1,65 @@
+"""
+Import a user's historical check-ins from a CSV file
+
+Same format and behaviour as POST /api/v1/checkins/import, for files too
+large to upload or for support staff migrating an account, with progress
+printed after every chunk.
+
+Usage:
+    python -m app.cli.import_checkins --email user@example.com --file history.csv
+        [--merge] [--chunk-size 5000] [--database-url sqlite:///./track_my_goals.db]
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional
+
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.core.engine import create_db_engine
+from app.models.checkin import CheckInImportRead
+from app.models.user import User
+from app.services.checkin_import import import_checkins_csv
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--email", required=True, help="Email of the account to import into")
+    parser.add_argument("--file", required=True, help="UTF-8 CSV file")
+    parser.add_argument("--merge", action="store_true", help="Overwrite existing check-ins")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def report(result: CheckInImportRead) -> None:
+        elapsed = time.perf_counter() - start
+        print(
+            f"{result.rows} rows: {result.imported} imported, {result.duplicates} duplicates,"
+            f" {result.failed} failed ({result.rows / elapsed:,.0f} rows/s)",
+            file=sys.stderr,
+        )
+
+    with Session(create_db_engine(args.database_url, settings)) as session:
+        user_id = session.exec(select(User.id).where(User.email == args.email)).first()
+        if user_id is None:
+            parser.error(f"No user with email {args.email}")
+        with open(args.file, encoding="utf-8-sig", errors="replace", newline="") as lines:
+            result = import_checkins_csv(
+                session,
+                user_id,
+                lines,
+                overwrite=args.merge,
+                chunk_size=args.chunk_size,
+                max_errors=settings.IMPORT_MAX_ERRORS,
+                progress=report,
+            )
+
+    for error in result.errors:
+        print(f"line {error.line}: {error.detail}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Purge soft-deleted goals whose background purge did not finish
+
+Large goals are hidden on delete and purged by a background task; a
+restart can interrupt it, leaving the goal's rows behind. Running this
+command finishes those purges.
+
+Usage:
+    python -m app.cli.purge_deleted_goals [--database-url sqlite:///./track_my_goals.db]
+        [--chunk-size 2000]
+"""
+import argparse
+import sys
+from typing import List, Optional
+
+from sqlmodel import Session
+
+from app.config import settings
+from app.core.engine import create_db_engine
+from app.services.goals import purge_deleted_goals
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=settings.GOAL_PURGE_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    with Session(create_db_engine(args.database_url, settings)) as session:
+        goal_ids = purge_deleted_goals(session, args.chunk_size)
+    print(f"Purged {len(goal_ids)} deleted goals", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
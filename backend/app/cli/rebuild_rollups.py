@@ -0,0 +1,60 @@
+"""
+Rebuild the weekly and monthly rollups of quantitative goals
+
+Check-in writes keep rollups current; run this after loading check-ins
+around the API (e.g. app.cli.generate_data) or to backfill goals created
+before rollups existed. Goals are rebuilt in chunks, one transaction each.
+
+Usage:
+    python -m app.cli.rebuild_rollups [--database-url sqlite:///./track_my_goals.db]
+        [--goal-id ID ...] [--chunk-size 200]
+"""
+import argparse
+import sys
+from typing import List, Optional
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.core.engine import create_db_engine
+from app.models.goal import Goal, GoalType
+from app.services.rollups import rebuild_goal_rollups
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument(
+        "--goal-id", type=UUID, action="append", help="Only rebuild these goals (repeatable)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=200, help="Goals per transaction")
+    args = parser.parse_args(argv)
+
+    goals = rollups = 0
+    with Session(create_db_engine(args.database_url, settings)) as session:
+        # Walk quantitative goals by ID, so memory use doesn't grow with their number
+        last_id = None
+        while True:
+            query = select(Goal.id).where(
+                (Goal.type == GoalType.QUANTITATIVE) & Goal.deleted_at.is_(None)
+            )
+            if args.goal_id:
+                query = query.where(Goal.id.in_(args.goal_id))
+            if last_id is not None:
+                query = query.where(Goal.id > last_id)
+            goal_ids = session.exec(query.order_by(Goal.id).limit(args.chunk_size)).all()
+            if not goal_ids:
+                break
+
+            rollups += rebuild_goal_rollups(session, list(goal_ids))
+            session.commit()
+            goals += len(goal_ids)
+            last_id = goal_ids[-1]
+            print(f"{goals} goals, {rollups} rollups", file=sys.stderr)
+
+    print(f"Rebuilt {rollups} rollups of {goals} goals", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Run the daily check-in reminder scheduler
+
+Every tick sends the reminders that came due to users who haven't checked
+in on that day, through the notification sink named by REMINDER_SINK. Run
+one process, or several against PostgreSQL, next to the API.
+
+Usage:
+    python -m app.cli.send_reminders [--database-url sqlite:///./track_my_goals.db]
+        [--sink log] [--interval 30] [--batch-size 1000] [--once]
+"""
+import argparse
+import sys
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+from sqlmodel import Session
+
+from app.config import settings
+from app.core.engine import create_db_engine
+from app.core.notifications import NOTIFICATION_SINKS, create_notification_sink
+from app.services.reminders import send_due_reminders
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--sink", default=settings.REMINDER_SINK, choices=sorted(NOTIFICATION_SINKS))
+    parser.add_argument("--interval", type=float, default=settings.REMINDER_TICK_SECONDS)
+    parser.add_argument("--batch-size", type=int, default=settings.REMINDER_BATCH_SIZE)
+    parser.add_argument("--once", action="store_true", help="Run one tick and exit")
+    args = parser.parse_args(argv)
+
+    sink = create_notification_sink(args.sink)
+    max_lateness = timedelta(minutes=settings.REMINDER_MAX_LATENESS_MINUTES)
+    engine = create_db_engine(args.database_url, settings)
+
+    while True:
+        start = time.monotonic()
+        with Session(engine) as session:
+            run = send_due_reminders(
+                session, sink, batch_size=args.batch_size, max_lateness=max_lateness
+            )
+        if run.sent or run.checked_in or run.late:
+            print(
+                f"{run.sent} sent, {run.checked_in} already checked in, {run.late} late",
+                file=sys.stderr,
+            )
+        if args.once:
+            break
+        time.sleep(max(0.0, args.interval - (time.monotonic() - start)))
+
+
+if __name__ == "__main__":
+    main()
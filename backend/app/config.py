@@ -15,8 +15,81 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30 * 24 * 60  # 30 days
     
+    # Password hashing settings
+    BCRYPT_ROUNDS: int = 12  # Hashes with another cost are rehashed on login
+    PASSWORD_HASH_WORKERS: int = 2  # Threads dedicated to bcrypt
+    PASSWORD_HASH_QUEUE_SIZE: int = 16  # Hashing requests allowed to wait for a thread
+    PASSWORD_HASH_RETRY_AFTER: int = 1  # Seconds, sent with 503 when the queue is full
+    
+    # Login rate limiting settings (token buckets, checked before bcrypt runs)
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_LIMIT_BACKEND: str = "app.core.ratelimit.MemoryRateLimitBackend"
+    LOGIN_RATE_LIMIT_EMAIL_BURST: int = 5
+    LOGIN_RATE_LIMIT_EMAIL_PER_MINUTE: float = 5
+    LOGIN_RATE_LIMIT_IP_BURST: int = 20
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = 30
+    
+    # Authenticated principal cache settings
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    
     # Database settings
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./track_my_goals.db")
+    # Serve routers through an async engine (aiosqlite/asyncpg) instead of the threadpool
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL if unset
+    
+    # Database engine settings
+    DB_ECHO: bool = False  # Log every SQL statement
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = False  # Costs a round trip per checkout; enable for flaky networks
+    DB_QUERY_CACHE_SIZE: int = 500  # Compiled SQL statements cached by SQLAlchemy
+    DB_STATEMENT_CACHE_SIZE: int = 256  # Prepared statements cached per connection
+    
+    # SQLite PRAGMAs applied to every connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # Negative values are KiB
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    
+    # Check-in settings
+    CHECKIN_BATCH_MAX_SIZE: int = 1000
+    CHECKIN_PAGE_MAX_SIZE: int = 1000
+    IMPORT_CHUNK_SIZE: int = 5000  # Check-ins inserted per transaction by CSV imports
+    IMPORT_MAX_ERRORS: int = 100  # Rejected rows listed in an import result
+    DASHBOARD_RECENT_MAX: int = 31  # Latest check-ins per goal on the dashboard
+    EXPORT_CHUNK_SIZE: int = 1000  # Rows fetched and written at a time by account exports
+    ROLLUP_MAX_POINTS: int = 60  # Weekly rollups are served up to this many weeks, monthly beyond
+    
+    # Goal deletion settings
+    # Goals with more check-ins are hidden at once and purged in the background;
+    # None always deletes in the request
+    GOAL_SOFT_DELETE_MIN_CHECKINS: Optional[int] = 5000
+    GOAL_PURGE_CHUNK_SIZE: int = 2000  # Check-ins deleted per purge transaction
+    
+    # Reminder settings
+    REMINDER_SINK: str = "log"  # Name of the notification sink in NOTIFICATION_SINKS
+    REMINDER_BATCH_SIZE: int = 1000  # Due reminders read and updated per transaction
+    REMINDER_TICK_SECONDS: int = 30  # Scheduler interval
+    REMINDER_MAX_LATENESS_MINUTES: int = 60  # Reminders overdue by longer are skipped
+    
+    # Response settings
+    FAST_JSON_ENABLED: bool = False  # Serialize large lists straight from row tuples
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller responses are sent uncompressed
+    
+    # Metrics settings
+    METRICS_ENABLED: bool = True  # Record per-route metrics and serve them on /metrics
+    
+    # Query debugging settings
+    QUERY_DEBUG: bool = False  # Log N+1 patterns and over-budget requests, add X-Query-Count
+    QUERY_DEBUG_MAX_QUERIES: int = 20  # SQL statements per request
+    QUERY_DEBUG_REPEAT_THRESHOLD: int = 3  # Runs of one statement shape flagged as N+1
     
     # CORS settings
     BACKEND_CORS_ORIGINS: list[str] = [
@@ -0,0 +1,165 @@
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+class _GzipCompressor:
+    """Incremental gzip compressor"""
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    """Incremental brotli compressor"""
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Get the content codings a client accepts, ignoring those with q=0"""
+    accepted = set()
+    for token in accept_encoding.lower().split(","):
+        coding, _, params = token.partition(";")
+        name, _, value = params.strip().partition("=")
+        try:
+            if name == "q" and float(value) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    Compress responses above a size threshold with brotli or gzip
+
+    Brotli is preferred when the client accepts it and the optional
+    `brotli` package is installed. Streaming responses are compressed
+    chunk by chunk and flushed after each chunk, so clients receive rows
+    as they are produced.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """
+        Pick the content coding for a request
+
+        Args:
+            accept_encoding: Accept-Encoding request header
+
+        Returns:
+            "br", "gzip", or None to leave the response uncompressed
+        """
+        accepted = _accepted_encodings(accept_encoding)
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+            if encoding is not None:
+                responder = _CompressionResponder(self, encoding, send)
+                await self.app(scope, receive, responder.send)
+                return
+        await self.app(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Compresses the messages of one response"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start_message: Optional[Message] = None
+        self.compressor = None
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self.compressor.compress(body)
+        return data + (self.compressor.flush() if more_body else self.compressor.finish())
+
+    async def send(self, message: Message) -> None:
+        # Hold back the start message until the first body chunk shows its size
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is None:
+            if self.compressor is not None:
+                message = {**message, "body": self._compress(body, more_body)}
+            await self._send(message)
+            return
+
+        start, self.start_message = self.start_message, None
+        headers = MutableHeaders(raw=start["headers"])
+        if "content-encoding" not in headers and (
+            more_body or len(body) >= self.middleware.minimum_size
+        ):
+            if self.encoding == "br":
+                self.compressor = _BrotliCompressor(self.middleware.brotli_quality)
+            else:
+                self.compressor = _GzipCompressor(self.middleware.gzip_level)
+            message = {**message, "body": self._compress(body, more_body)}
+
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            # The compressed bytes differ from the uncompressed ones a strong
+            # ETag promises; etag_matches ignores the W/ prefix
+            etag = headers.get("etag")
+            if etag is not None and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(message["body"]))
+
+        await self._send(start)
+        await self._send(message)
@@ -0,0 +1,196 @@
+import time
+from threading import Lock
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import Settings
+
+
+class PoolMetrics:
+    """Connection pool checkout counters and wait times"""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float) -> None:
+        """Record how long a checkout waited for a connection"""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up waiting for a connection"""
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get the current counters"""
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Times every connection checkout into the pool's PoolMetrics"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.observe_wait(time.perf_counter() - start)
+        return connection
+
+
+def _instrumented_pool_class(base: type) -> type:
+    """Create a pool class recording into its own PoolMetrics"""
+    return type(
+        f"Instrumented{base.__name__}",
+        (_InstrumentedPoolMixin, base),
+        {"metrics": PoolMetrics()},
+    )
+
+
+def engine_options(database_url: str, settings: Settings, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build create_engine() keyword arguments from the settings
+
+    Args:
+        database_url: Database URL
+        settings: Application settings
+        is_async: Whether the options are for an async engine
+
+    Returns:
+        Engine keyword arguments
+    """
+    url = make_url(database_url)
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    }
+    connect_args: Dict[str, Any] = {}
+
+    if url.get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False
+        if not is_async:
+            connect_args["cached_statements"] = settings.DB_STATEMENT_CACHE_SIZE
+        # In-memory databases live in a single connection, so keep the default pool
+        if url.database in (None, "", ":memory:"):
+            options["connect_args"] = connect_args
+            return options
+    elif url.get_driver_name() == "asyncpg":
+        connect_args["prepared_statement_cache_size"] = settings.DB_STATEMENT_CACHE_SIZE
+
+    options.update(
+        connect_args=connect_args,
+        poolclass=_instrumented_pool_class(AsyncAdaptedQueuePool if is_async else QueuePool),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def sqlite_pragmas(settings: Settings) -> Dict[str, Any]:
+    """Get the PRAGMAs applied to every new SQLite connection"""
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        # SQLite only enforces foreign keys, and ON DELETE CASCADE, when asked to
+        "foreign_keys": "ON",
+    }
+
+
+def _install_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """Apply PRAGMAs whenever the engine opens a new SQLite connection"""
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_db_engine(database_url: str, settings: Settings) -> Engine:
+    """
+    Create the database engine configured from the settings
+
+    Args:
+        database_url: Database URL
+        settings: Application settings
+
+    Returns:
+        Engine
+    """
+    engine = create_engine(database_url, **engine_options(database_url, settings))
+    if engine.dialect.name == "sqlite":
+        _install_sqlite_pragmas(engine, sqlite_pragmas(settings))
+    return engine
+
+
+def create_async_db_engine(database_url: str, settings: Settings) -> AsyncEngine:
+    """
+    Create the async database engine configured from the settings
+
+    Args:
+        database_url: Async database URL
+        settings: Application settings
+
+    Returns:
+        Async engine
+    """
+    engine = create_async_engine(
+        database_url, **engine_options(database_url, settings, is_async=True)
+    )
+    if engine.dialect.name == "sqlite":
+        _install_sqlite_pragmas(engine.sync_engine, sqlite_pragmas(settings))
+    return engine
+
+
+def get_pool_status(engine: Engine) -> Dict[str, float]:
+    """
+    Get connection pool occupancy, saturation and checkout wait metrics
+
+    Args:
+        engine: Engine, or the sync_engine of an async engine
+
+    Returns:
+        Pool status; empty if the pool is not instrumented
+    """
+    pool = engine.pool
+    if not isinstance(pool, _InstrumentedPoolMixin):
+        return {}
+
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "capacity": capacity,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "saturation": checked_out / capacity if capacity else 0.0,
+        **pool.metrics.snapshot(),
+    }
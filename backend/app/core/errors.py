@@ -74,4 +74,36 @@ class ConflictError(HTTPException):
             status_code=status.HTTP_409_CONFLICT,
             detail=detail,
             headers=headers,
+        )
+
+
+class TooManyRequestsError(HTTPException):
+    """Rate limit exceeded error"""
+    
+    def __init__(
+        self, 
+        detail: str = "Too many requests, please retry later", 
+        retry_after: int = 1,
+        headers: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after), **(headers or {})},
+        )
+
+
+class ServiceUnavailableError(HTTPException):
+    """Service unavailable error, e.g. when a bounded work queue is full"""
+    
+    def __init__(
+        self, 
+        detail: str = "Service temporarily unavailable", 
+        retry_after: int = 1,
+        headers: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after), **(headers or {})},
         )
\ No newline at end of file
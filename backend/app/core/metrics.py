@@ -0,0 +1,253 @@
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Upper bounds of the latency and per-request query count histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Route label of requests that matched no route, bounding label cardinality
+UNMATCHED_ROUTE = "unmatched"
+
+
+class QueryStats:
+    """Number and total duration of the SQL statements run for one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+
+
+# Query stats of the request being served; copied into threadpool workers
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Get the query stats of the request being served, if any"""
+    return _query_stats.get()
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self) -> List[Tuple[str, int]]:
+        """Get (le, cumulative count) pairs, ending with +Inf"""
+        samples = []
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            samples.append(("+Inf" if bound == float("inf") else _format_value(bound), total))
+        return samples
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, dropping the fraction of whole numbers"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Format Prometheus labels, escaping their values"""
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class RequestMetrics:
+    """
+    Per-route request counters and latency, query count and DB time histograms
+
+    Routes are labelled by their path template (e.g. /api/v1/goals/{goal_id}),
+    never by the raw path, so the number of series stays bounded.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.in_flight = 0
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.queries: Dict[Tuple[str, str], Histogram] = {}
+        self.db_seconds: Dict[Tuple[str, str], float] = {}
+
+    def start_request(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def finish_request(
+        self,
+        method: str,
+        route: str,
+        status_code: int,
+        seconds: float,
+        query_stats: QueryStats,
+    ) -> None:
+        """Record a completed request"""
+        key = (method, route)
+        with self._lock:
+            self.in_flight -= 1
+            request_key = (method, route, status_code)
+            self.requests[request_key] = self.requests.get(request_key, 0) + 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.queries[key] = Histogram(QUERY_COUNT_BUCKETS)
+                self.db_seconds[key] = 0.0
+            self.latency[key].observe(seconds)
+            self.queries[key].observe(query_stats.count)
+            self.db_seconds[key] += query_stats.seconds
+
+    def clear(self) -> None:
+        """Reset all series"""
+        with self._lock:
+            self.requests.clear()
+            self.latency.clear()
+            self.queries.clear()
+            self.db_seconds.clear()
+
+    def render(self) -> List[str]:
+        """Render the metrics as Prometheus text exposition lines"""
+        with self._lock:
+            lines = [
+                "# HELP http_requests_in_flight Requests currently being served",
+                "# TYPE http_requests_in_flight gauge",
+                f"http_requests_in_flight {self.in_flight}",
+                "# HELP http_requests_total Completed requests",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status_code), count in sorted(self.requests.items()):
+                labels = _format_labels({"method": method, "route": route, "status": status_code})
+                lines.append(f"http_requests_total{labels} {count}")
+
+            for name, help_text, histograms in (
+                ("http_request_duration_seconds", "Request latency", self.latency),
+                ("http_request_db_queries", "SQL statements run per request", self.queries),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), histogram in sorted(histograms.items()):
+                    labels = {"method": method, "route": route}
+                    for le, count in histogram.samples():
+                        lines.append(f"{name}_bucket{_format_labels({**labels, 'le': le})} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+            lines.append("# HELP http_request_db_seconds_total Time spent in SQL statements")
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for (method, route), seconds in sorted(self.db_seconds.items()):
+                labels = _format_labels({"method": method, "route": route})
+                lines.append(f"http_request_db_seconds_total{labels} {_format_value(seconds)}")
+            return lines
+
+
+# Global request metrics, rendered by the /metrics endpoint
+request_metrics = RequestMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _query_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    start_times = conn.info.get("query_start_time")
+    if stats is not None and start_times:
+        stats.record(time.perf_counter() - start_times.pop())
+
+
+def install_query_hooks() -> None:
+    """
+    Count and time the SQL statements of every engine, per request
+
+    Listens on the Engine class, so test and async engines are covered too.
+    Statements run outside a request are not recorded.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def render_pool_status(statuses: Dict[str, Dict[str, float]]) -> List[str]:
+    """
+    Render connection pool statuses as Prometheus gauges
+
+    Args:
+        statuses: get_pool_status() result per engine name
+
+    Returns:
+        Prometheus text exposition lines
+    """
+    lines = []
+    names = sorted({name for status in statuses.values() for name in status})
+    for name in names:
+        metric = f"db_pool_{name}"
+        lines.append(f"# TYPE {metric} gauge")
+        for engine_name, status in sorted(statuses.items()):
+            if name in status:
+                labels = _format_labels({"engine": engine_name})
+                lines.append(f"{metric}{labels} {_format_value(status[name])}")
+    return lines
+
+
+class MetricsMiddleware:
+    """
+    Record latency, status code and SQL statements of every HTTP request
+
+    Costs a few counter updates under a lock per request and per statement,
+    so it can stay enabled in production.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        query_stats = QueryStats()
+        token = _query_stats.set(query_stats)
+        self.metrics.start_request()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _query_stats.reset(token)
+            route = scope.get("route")
+            self.metrics.finish_request(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - start,
+                query_stats,
+            )
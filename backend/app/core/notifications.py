@@ -0,0 +1,82 @@
+import logging
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Dict, List, Sequence, Type
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+class Notification:
+    """A check-in reminder to deliver to a user"""
+
+    __slots__ = ("user_id", "local_date", "due_at")
+
+    def __init__(self, user_id: UUID, local_date: date, due_at: datetime):
+        self.user_id = user_id
+        self.local_date = local_date  # The user's day the reminder is for
+        self.due_at = due_at  # In UTC
+
+
+class NotificationSink(ABC):
+    """
+    Delivers check-in reminders
+
+    Subclass it to deliver through a push service and register the class
+    in NOTIFICATION_SINKS; REMINDER_SINK selects a sink by name. Each call
+    gets one batch of the scheduler, so sinks can use batch APIs.
+    """
+
+    @abstractmethod
+    def send(self, notifications: Sequence[Notification]) -> None:
+        """
+        Deliver a batch of reminders
+
+        Args:
+            notifications: Reminders to deliver
+        """
+
+
+class LogNotificationSink(NotificationSink):
+    """Logs reminders instead of delivering them, for development"""
+
+    def send(self, notifications: Sequence[Notification]) -> None:
+        for notification in notifications:
+            logger.info(
+                "Check-in reminder for user %s (%s)",
+                notification.user_id, notification.local_date,
+            )
+
+
+class StubNotificationSink(NotificationSink):
+    """Keeps reminders in memory, for tests"""
+
+    def __init__(self):
+        self.sent: List[Notification] = []
+
+    def send(self, notifications: Sequence[Notification]) -> None:
+        self.sent.extend(notifications)
+
+
+NOTIFICATION_SINKS: Dict[str, Type[NotificationSink]] = {
+    "log": LogNotificationSink,
+    "stub": StubNotificationSink,
+}
+
+
+def create_notification_sink(name: str) -> NotificationSink:
+    """
+    Create a registered notification sink
+
+    Args:
+        name: Name of the sink in NOTIFICATION_SINKS
+
+    Returns:
+        Notification sink
+
+    Raises:
+        ValueError: If no sink is registered under the name
+    """
+    if name not in NOTIFICATION_SINKS:
+        raise ValueError(f"Unknown notification sink {name!r}")
+    return NOTIFICATION_SINKS[name]()
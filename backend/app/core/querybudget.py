@@ -0,0 +1,166 @@
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# Statements of the request being inspected; copied into threadpool workers
+_statements: ContextVar[Optional[List[str]]] = ContextVar("statements", default=None)
+
+# Callbacks receiving a QueryReport for every inspected request
+_observers: List[Callable[["QueryReport"], None]] = []
+
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|:\w+|\$\d+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a SQL statement so statements differing only in values match
+
+    Literals become `?` and placeholder lists (expanded IN clauses,
+    multi-row VALUES) collapse to `(?)`.
+
+    Args:
+        statement: SQL statement as sent to the driver
+
+    Returns:
+        Statement shape
+    """
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryReport:
+    """SQL statements run while serving one request"""
+
+    def __init__(self, method: str, path: str, route: str, statements: List[str]):
+        self.method = method
+        self.path = path
+        self.route = route
+        self.statements = statements
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated_shapes(self, threshold: int) -> Dict[str, int]:
+        """
+        Get statement shapes run at least `threshold` times, the N+1 signature
+
+        Args:
+            threshold: Minimum number of runs to report
+
+        Returns:
+            Run count per repeated shape
+        """
+        counts = Counter(statement_shape(statement) for statement in self.statements)
+        return {shape: count for shape, count in counts.items() if count >= threshold}
+
+    def violations(self, max_queries: Optional[int], repeat_threshold: int) -> List[str]:
+        """
+        Describe how the request broke its query budget
+
+        Args:
+            max_queries: Maximum number of statements, None for no limit
+            repeat_threshold: Runs of one statement shape that count as N+1
+
+        Returns:
+            Violation messages, empty if the request is within budget
+        """
+        violations = []
+        if max_queries is not None and self.count > max_queries:
+            violations.append(
+                f"{self.method} {self.path} ran {self.count} SQL statements, "
+                f"budget is {max_queries}"
+            )
+        for shape, count in self.repeated_shapes(repeat_threshold).items():
+            violations.append(
+                f"{self.method} {self.path} ran the same statement {count} times "
+                f"(possible N+1): {shape}"
+            )
+        return violations
+
+
+def add_query_observer(observer: Callable[[QueryReport], None]) -> None:
+    """Start inspecting requests, passing each one's QueryReport to an observer"""
+    _observers.append(observer)
+
+
+def remove_query_observer(observer: Callable[[QueryReport], None]) -> None:
+    """Stop passing QueryReports to an observer"""
+    _observers.remove(observer)
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is not None:
+        statements.append(statement)
+
+
+def install_statement_hook() -> None:
+    """Record the SQL statements of every engine while a request is inspected"""
+    if not event.contains(Engine, "before_cursor_execute", _record_statement):
+        event.listen(Engine, "before_cursor_execute", _record_statement)
+
+
+class QueryBudgetMiddleware:
+    """
+    Check the SQL statements of each request against a budget and for N+1
+
+    Inert unless `debug` is set or an observer is registered (as the test
+    suite's `query_budget` fixture does), so it costs one check per request
+    when off. In debug mode, violations are logged as warnings and every
+    response carries an X-Query-Count header.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        debug: bool = False,
+        max_queries: Optional[int] = None,
+        repeat_threshold: int = 3,
+    ):
+        self.app = app
+        self.debug = debug
+        self.max_queries = max_queries
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not (self.debug or _observers):
+            await self.app(scope, receive, send)
+            return
+
+        statements: List[str] = []
+
+        async def send_with_count(message: Message) -> None:
+            if self.debug and message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                headers["X-Query-Count"] = str(len(statements))
+            await send(message)
+
+        token = _statements.set(statements)
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _statements.reset(token)
+
+        route = getattr(scope.get("route"), "path", scope["path"])
+        report = QueryReport(scope["method"], scope["path"], route, statements)
+        if self.debug:
+            for violation in report.violations(self.max_queries, self.repeat_threshold):
+                logger.warning(violation)
+        for observer in list(_observers):
+            observer(report)
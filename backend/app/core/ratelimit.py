@@ -0,0 +1,118 @@
+import importlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Tuple
+
+from app.core.errors import TooManyRequestsError
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets
+
+    Implementations must make `take` atomic per key; a Redis-backed one
+    would run it as a single Lua script.
+    """
+
+    @abstractmethod
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """
+        Take one token from a bucket, creating it full if missing
+
+        Args:
+            key: Bucket key
+            capacity: Maximum number of tokens (burst size)
+            refill_per_second: Tokens added per second
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop all buckets"""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    In-process token buckets
+
+    Bounded to `max_keys` buckets, dropping the least recently used, so
+    stuffing traffic with random emails can't grow memory without bound.
+    """
+
+    def __init__(self, max_keys: int = 100_000, timer: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self._timer = timer
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        now = self._timer()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / refill_per_second
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class TokenBucketLimiter:
+    """Token bucket rate limiter over a pluggable storage backend"""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        name: str,
+        capacity: float,
+        per_minute: float,
+    ):
+        self.backend = backend
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = per_minute / 60
+        self.rejected = 0
+
+    def check(self, key: str) -> None:
+        """
+        Take a token for a key
+
+        Args:
+            key: Rate-limited identity, e.g. an email or IP address
+
+        Raises:
+            TooManyRequestsError: If the key's bucket is empty
+        """
+        wait = self.backend.take(f"{self.name}:{key}", self.capacity, self.refill_per_second)
+        if wait > 0:
+            self.rejected += 1
+            raise TooManyRequestsError(retry_after=max(1, int(wait + 0.999)))
+
+
+def load_backend(path: str) -> RateLimitBackend:
+    """
+    Instantiate a rate limit backend from its dotted class path
+
+    Args:
+        path: Dotted path, e.g. "app.core.ratelimit.MemoryRateLimitBackend"
+
+    Returns:
+        Backend instance
+    """
+    module_name, _, class_name = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), class_name)()
@@ -0,0 +1,87 @@
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the column types the stdlib encoder doesn't know"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as compact JSON
+
+    Uses orjson if installed, which encodes UUIDs, dates and enums
+    natively, and falls back to the stdlib encoder otherwise.
+
+    Args:
+        content: JSON-compatible content, may contain UUIDs, dates and enums
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with `dumps`, skipping response model validation"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_to_dicts(rows: Sequence[Any], keys: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Turn result row tuples into dicts without building ORM objects
+
+    Args:
+        rows: Result rows
+        keys: Output key for each column of the rows
+
+    Returns:
+        One dict per row
+    """
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def fast_json_response(content: Any, response: Response) -> FastJSONResponse:
+    """
+    Build a FastJSONResponse carrying the headers set on an endpoint's Response
+
+    FastAPI ignores the injected Response once an endpoint returns its own,
+    so headers like ETag are copied over.
+
+    Args:
+        content: Response content
+        response: Response injected into the endpoint
+
+    Returns:
+        JSON response
+    """
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name != "content-length"
+    }
+    return FastJSONResponse(content, status_code=response.status_code or 200, headers=headers)
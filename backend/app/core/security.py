@@ -1,14 +1,92 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union
+from threading import BoundedSemaphore
+from typing import Any, Callable, Optional, Tuple, TypeVar, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 from pydantic import ValidationError
 
 from app.config import settings
+from app.core.errors import ServiceUnavailableError
+
+T = TypeVar("T")
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+class PasswordHasher:
+    """
+    Runs password hashing on a dedicated, size-limited thread pool
+    
+    At most `workers + queue_size` hashing jobs are admitted at a time;
+    beyond that callers get a 503 with Retry-After right away, so login
+    bursts can't take over the workers serving other requests.
+    """
+    
+    def __init__(self, workers: int, queue_size: int, retry_after: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._slots = BoundedSemaphore(workers + queue_size)
+        self.retry_after = retry_after
+        self.rejected = 0
+    
+    def submit(self, func: Callable[..., T], *args: Any) -> "Future[T]":
+        """
+        Queue a hashing function on the pool
+        
+        Args:
+            func: Hashing function
+            *args: Function arguments
+            
+        Returns:
+            Future of the function result
+            
+        Raises:
+            ServiceUnavailableError: If the pool and its queue are full
+        """
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise ServiceUnavailableError(
+                detail="Too many authentication requests, please retry",
+                retry_after=self.retry_after,
+            )
+        
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+    
+    def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a hashing function on the pool, blocking until it's done"""
+        return self.submit(func, *args).result()
+    
+    async def run_async(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Run a hashing function on the pool without blocking the event loop
+        
+        The caller holds no thread while waiting, so queued logins don't
+        take request threads away from other routes.
+        """
+        return await asyncio.wrap_future(self.submit(func, *args))
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER,
+)
 
 # JWT token functions
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -42,7 +120,25 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches hash
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.run(pwd_context.verify, plain_password, hashed_password)
+
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password against a hash, rehashing it if the cost policy changed
+    
+    Args:
+        plain_password: Plain-text password
+        hashed_password: Hashed password
+        
+    Returns:
+        Whether the password matches, and a replacement hash if the stored
+        one should be updated
+    """
+    return password_hasher.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 def get_password_hash(password: str) -> str:
     """
@@ -54,4 +150,16 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return password_hasher.run(pwd_context.hash, password)
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Async variant of verify_and_update_password for async endpoints"""
+    return await password_hasher.run_async(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """Async variant of get_password_hash for async endpoints"""
+    return await password_hasher.run_async(pwd_context.hash, password)
\ No newline at end of file
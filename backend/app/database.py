@@ -1,28 +1,53 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.ext.declarative import declarative_base
-from typing import Generator
-import os
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.main import default_registry
+from typing import AsyncGenerator, Generator
+
+from app.config import settings
+from app.core.engine import create_async_db_engine, create_db_engine
 
 # Use SQLite for development
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./track_my_goals.db")
+DATABASE_URL = settings.DATABASE_URL
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-    echo=True  # Set to False in production
-)
+# Create SQLAlchemy engine, configured from settings
+engine = create_db_engine(DATABASE_URL, settings)
 
 # Create a SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=Session, autocommit=False, autoflush=False, bind=engine)
+
+# Async drivers used when DATABASE_ASYNC is enabled
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Map a database URL to the same database through its async driver"""
+    scheme, _, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
 
-# Create a Base class for declarative models
-Base = declarative_base()
+
+# Create async SQLAlchemy engine and AsyncSessionLocal class, if enabled
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(DATABASE_URL)
+    async_engine = create_async_db_engine(ASYNC_DATABASE_URL, settings)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False,
+    )
+
+# Create a Base class for declarative models. It shares SQLModel's registry
+# and metadata so plain SQLAlchemy models (User) and SQLModel tables (Goal,
+# CheckIn) can reference each other.
+Base = default_registry.generate_base()
 
 def create_db_and_tables():
     """Create database tables from SQLAlchemy models"""
-    Base.metadata.create_all(bind=engine)
+    SQLModel.metadata.create_all(bind=engine)
 
 def get_session() -> Generator[Session, None, None]:
     """Dependency for getting a database session"""
@@ -30,4 +55,9 @@ def get_session() -> Generator[Session, None, None]:
     try:
         yield session
     finally:
-        session.close()
\ No newline at end of file
+        session.close()
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as session:
+        yield session
\ No newline at end of file
@@ -4,7 +4,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.auth import router as auth_router
 from app.api.goals import router as goals_router
 from app.api.checkins import router as checkins_router
+from app.api.sync import router as sync_router
+from app.api.export import router as export_router
+from app.api.dashboard import router as dashboard_router
+from app.api.reminders import router as reminders_router
+from app.api.metrics import router as metrics_router
 from app.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.metrics import MetricsMiddleware, install_query_hooks
+from app.core.querybudget import QueryBudgetMiddleware, install_statement_hook
 from app.database import create_db_and_tables
 
 # Create FastAPI app
@@ -20,8 +28,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+# Compress large responses (gzip, or brotli if installed)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Check SQL statements per request against a budget and for N+1 patterns;
+# inert unless QUERY_DEBUG is set or the test suite registers an observer
+install_statement_hook()
+app.add_middleware(
+    QueryBudgetMiddleware,
+    debug=settings.QUERY_DEBUG,
+    max_queries=settings.QUERY_DEBUG_MAX_QUERIES,
+    repeat_threshold=settings.QUERY_DEBUG_REPEAT_THRESHOLD,
+)
+
+# Record per-route latency, status codes and SQL statements
+if settings.METRICS_ENABLED:
+    install_query_hooks()
+    app.add_middleware(MetricsMiddleware)
+
 # Create API router
 api_router = APIRouter()
 
@@ -29,10 +57,18 @@ api_router = APIRouter()
 api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 api_router.include_router(goals_router, prefix="/goals", tags=["goals"])
 api_router.include_router(checkins_router, prefix="/checkins", tags=["checkins"])
+api_router.include_router(sync_router, prefix="/sync", tags=["sync"])
+api_router.include_router(export_router, prefix="/export", tags=["export"])
+api_router.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(reminders_router, prefix="/reminders", tags=["reminders"])
 
 # Include API router in app
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+# Expose metrics in Prometheus text format
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
+
 
 @app.on_event("startup")
 def on_startup():
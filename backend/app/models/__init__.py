@@ -1,11 +1,29 @@
 # SQLModel data models
 from app.models.user import User, UserCreate, UserRead, UserLogin, Token, TokenPayload
-from app.models.goal import Goal, GoalCreate, GoalRead, GoalUpdate, GoalType
-from app.models.checkin import CheckIn, CheckInCreate, CheckInRead, CheckInUpdate
+from app.models.goal import Goal, GoalCreate, GoalRead, GoalReadWithStats, GoalUpdate, GoalType
+from app.models.checkin import (
+    CheckIn, CheckInCreate, CheckInRead, CheckInUpdate,
+    CheckInBatchCreate, CheckInBatchItem, CheckInBatchRead,
+    CheckInImportError, CheckInImportRead,
+)
+from app.models.stats import GoalStats, GoalStatsRead
+from app.models.heatmap import GoalHeatmap, HeatmapRead
+from app.models.rollup import GoalRollup, RollupPeriod, RollupPoint, RollupRead
+from app.models.reminder import Reminder, ReminderRead, ReminderRun, ReminderUpdate
+from app.models.sync import Tombstone, TombstoneRead, SyncRead
+from app.models.dashboard import DashboardGoal, DashboardRead
 
 # Import these models to ensure SQLModel creates the tables
 __all__ = [
     "User", "UserCreate", "UserRead", "UserLogin", "Token", "TokenPayload",
-    "Goal", "GoalCreate", "GoalRead", "GoalUpdate", "GoalType",
+    "Goal", "GoalCreate", "GoalRead", "GoalReadWithStats", "GoalUpdate", "GoalType",
     "CheckIn", "CheckInCreate", "CheckInRead", "CheckInUpdate",
+    "CheckInBatchCreate", "CheckInBatchItem", "CheckInBatchRead",
+    "CheckInImportError", "CheckInImportRead",
+    "GoalStats", "GoalStatsRead",
+    "GoalHeatmap", "HeatmapRead",
+    "GoalRollup", "RollupPeriod", "RollupPoint", "RollupRead",
+    "Reminder", "ReminderRead", "ReminderRun", "ReminderUpdate",
+    "Tombstone", "TombstoneRead", "SyncRead",
+    "DashboardGoal", "DashboardRead",
 ]
\ No newline at end of file
@@ -1,6 +1,8 @@
+import datetime as dt
 from datetime import date, datetime
-from typing import Optional, Union
+from typing import List, Optional, Union
 from uuid import UUID, uuid4
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, SQLModel, Relationship
 from pydantic import validator
 
@@ -20,28 +22,75 @@ class CheckInBase(SQLModel):
 
 class CheckIn(CheckInBase, table=True):
     """CheckIn database model"""
+    __table_args__ = (
+        UniqueConstraint("goal_id", "checkin_date", name="uq_checkin_goal_id_checkin_date"),
+        Index("ix_checkin_goal_id_change_seq", "goal_id", "change_seq"),
+    )
+    
     id: UUID = Field(default_factory=uuid4, primary_key=True)
-    goal_id: UUID = Field(foreign_key="goal.id")
+    goal_id: UUID = Field(foreign_key="goal.id", ondelete="CASCADE")
     checkin_date: date = Field(default=None)
     created_at: datetime = Field(default=None)
+    updated_at: Optional[datetime] = Field(default=None)
+    change_seq: int = Field(default=0)  # User change sequence of the last write
     status: float  # Override base class Union for DB compatibility
 
     # Relationships
     goal: "Goal" = Relationship(back_populates="checkins")
 
+    @property
+    def date(self) -> date:
+        """Check-in date as exposed by the API schemas"""
+        return self.checkin_date
+
 
 class CheckInCreate(CheckInBase):
     """CheckIn creation schema"""
     goal_id: UUID
+    date: Optional[dt.date] = None  # Defaults to today in the API layer
 
 
 class CheckInRead(CheckInBase):
     """CheckIn read schema"""
     id: UUID
     goal_id: UUID
+    date: dt.date
 
 
 class CheckInUpdate(SQLModel):
     """CheckIn update schema"""
     status: Optional[Union[bool, float]] = None
-    note: Optional[str] = None
\ No newline at end of file
+    note: Optional[str] = None
+
+
+class CheckInBatchCreate(SQLModel):
+    """Batch check-in creation schema, used to flush offline check-ins"""
+    checkins: List[CheckInCreate]
+
+
+class CheckInBatchItem(SQLModel):
+    """Outcome of a single check-in in a batch"""
+    index: int
+    result: str  # created, duplicate, not_found or forbidden
+    checkin: Optional[CheckInRead] = None
+    detail: Optional[str] = None
+
+
+class CheckInBatchRead(SQLModel):
+    """Batch check-in creation result schema"""
+    created: int
+    results: List[CheckInBatchItem]
+
+class CheckInImportError(SQLModel):
+    """Row of an imported CSV file that was rejected"""
+    line: int
+    detail: str
+
+
+class CheckInImportRead(SQLModel):
+    """CSV check-in import result schema"""
+    rows: int  # Check-in rows read, excluding rows without a date
+    imported: int  # Created, or overwritten when merging
+    duplicates: int  # Skipped because the goal already has a check-in that day
+    failed: int
+    errors: List[CheckInImportError]  # The first IMPORT_MAX_ERRORS failures
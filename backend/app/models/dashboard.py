@@ -0,0 +1,20 @@
+import datetime as dt
+from typing import List, Optional
+from sqlmodel import SQLModel
+
+from app.models.checkin import CheckInRead
+from app.models.goal import GoalRead
+from app.models.stats import GoalStatsRead
+
+
+class DashboardGoal(GoalRead):
+    """Goal with everything the home screen shows about it"""
+    today: Optional[CheckInRead] = None  # Today's check-in, None if not checked in yet
+    recent_checkins: List[CheckInRead]  # Latest first, up to today
+    stats: GoalStatsRead
+
+
+class DashboardRead(SQLModel):
+    """Home screen response schema"""
+    date: dt.date  # Server date that `today` and streaks refer to
+    goals: List[DashboardGoal]
@@ -2,6 +2,7 @@ from datetime import date, datetime
 from enum import Enum
 from typing import Optional, List
 from uuid import UUID, uuid4
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 
 
@@ -21,13 +22,23 @@ class GoalBase(SQLModel):
 
 class Goal(GoalBase, table=True):
     """Goal database model"""
+    __table_args__ = (
+        Index("ix_goal_user_id_change_seq", "user_id", "change_seq"),
+    )
+    
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(foreign_key="user.id")
     created_at: datetime = Field(default=None)
+    updated_at: Optional[datetime] = Field(default=None)
+    change_seq: int = Field(default=0)  # User change sequence of the last write
+    deleted_at: Optional[datetime] = Field(default=None)  # Set while a deleted goal is purged
     
     # Relationships
     user: "User" = Relationship(back_populates="goals")
-    checkins: List["CheckIn"] = Relationship(back_populates="goal")
+    # Check-ins are removed by set-based deletes and ON DELETE CASCADE, never loaded
+    checkins: List["CheckIn"] = Relationship(
+        back_populates="goal", sa_relationship_kwargs={"passive_deletes": True}
+    )
 
 
 class GoalCreate(GoalBase):
@@ -41,6 +52,12 @@ class GoalRead(GoalBase):
     user_id: UUID
 
 
+class GoalReadWithStats(GoalRead):
+    """Goal read schema with check-in statistics, used for goal listings"""
+    completion_rate: float = 0.0
+    current_streak: int = 0
+
+
 class GoalUpdate(SQLModel):
     """Goal update schema"""
     title: Optional[str] = None
@@ -0,0 +1,35 @@
+import datetime as dt
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import Column, LargeBinary
+from sqlmodel import Field, SQLModel
+
+from app.models.goal import GoalType
+
+
+class GoalHeatmap(SQLModel, table=True):
+    """
+    Per-goal calendar of check-ins, kept current on every check-in write
+
+    Binary goals store a bitset, bit i (least significant bit first) set if
+    day start_date + i was completed. Quantitative goals store one float64
+    per day, NaN for days without a check-in.
+    """
+    goal_id: UUID = Field(foreign_key="goal.id", primary_key=True, ondelete="CASCADE")
+    type: GoalType  # Type the data is encoded for
+    start_date: dt.date
+    days: int = Field(default=0)  # Days covered by data
+    data: bytes = Field(default=b"", sa_column=Column(LargeBinary, nullable=False))
+
+
+class HeatmapRead(SQLModel):
+    """Calendar heatmap schema"""
+    goal_id: UUID
+    type: GoalType
+    start_date: dt.date
+    end_date: dt.date
+    # Binary goals: base64 bitset, bit i (least significant bit first) set if
+    # day start_date + i was completed
+    bits: Optional[str] = None
+    # Quantitative goals: value per day, null for days without a check-in
+    values: Optional[List[Optional[float]]] = None
@@ -0,0 +1,41 @@
+import datetime as dt
+from typing import Optional
+from uuid import UUID
+from sqlmodel import Field, SQLModel
+
+
+class Reminder(SQLModel, table=True):
+    """
+    A user's daily check-in reminder
+
+    The index on next_due_at is the scheduler's due queue: a tick reads
+    only the reminders due by then, earliest first.
+    """
+    user_id: UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    local_time: dt.time  # Time of day to remind at, in the user's time zone
+    timezone: str = Field(default="UTC")  # IANA time zone name
+    next_due_at: dt.datetime = Field(index=True)  # Next reminder, in UTC
+    # Latest day the user checked in on, kept by check-in writes, so due
+    # reminders of users who already checked in are skipped without
+    # reading check-ins
+    last_checkin_on: Optional[dt.date] = Field(default=None)
+
+
+class ReminderUpdate(SQLModel):
+    """Reminder settings schema"""
+    local_time: dt.time
+    timezone: str = "UTC"
+
+
+class ReminderRead(SQLModel):
+    """Reminder read schema"""
+    local_time: dt.time
+    timezone: str
+    next_due_at: dt.datetime
+
+
+class ReminderRun(SQLModel):
+    """Result of a scheduler tick"""
+    sent: int = 0
+    checked_in: int = 0  # Skipped, the user already checked in that day
+    late: int = 0  # Skipped, overdue by more than the allowed lateness
@@ -0,0 +1,45 @@
+from datetime import date
+from enum import Enum
+from typing import List
+from uuid import UUID
+from sqlmodel import Field, SQLModel
+
+
+class RollupPeriod(str, Enum):
+    """Period of a check-in rollup"""
+    WEEK = "week"  # Monday to Sunday
+    MONTH = "month"
+
+
+class GoalRollup(SQLModel, table=True):
+    """
+    Weekly and monthly aggregates of a quantitative goal's check-in values,
+    kept current on every check-in write
+    """
+    goal_id: UUID = Field(foreign_key="goal.id", primary_key=True, ondelete="CASCADE")
+    period: RollupPeriod = Field(primary_key=True)
+    period_start: date = Field(primary_key=True)  # Monday of the week, first of the month
+    count: int = Field(default=0)
+    total: float = Field(default=0.0)
+    minimum: float = Field(default=0.0)
+    maximum: float = Field(default=0.0)
+
+
+class RollupPoint(SQLModel):
+    """Check-in values of one week or month"""
+    period_start: date
+    count: int
+    total: float
+    average: float
+    minimum: float
+    maximum: float
+
+
+class RollupRead(SQLModel):
+    """Rollup series schema"""
+    goal_id: UUID
+    period: RollupPeriod
+    start_date: date
+    end_date: date
+    # Periods overlapping the range that have check-ins, oldest first
+    points: List[RollupPoint]
@@ -0,0 +1,30 @@
+from datetime import date
+from typing import Optional
+from uuid import UUID
+from sqlmodel import Field, SQLModel
+
+
+class GoalStats(SQLModel, table=True):
+    """Per-goal check-in aggregates, kept current on every check-in write"""
+    goal_id: UUID = Field(foreign_key="goal.id", primary_key=True, ondelete="CASCADE")
+    total_checkins: int = Field(default=0)
+    completed_checkins: int = Field(default=0)
+    total_value: float = Field(default=0.0)
+    longest_streak: int = Field(default=0)
+    # Length and last day of the most recent run of completed check-ins
+    current_run: int = Field(default=0)
+    run_end_date: Optional[date] = Field(default=None)
+    last_checkin_date: Optional[date] = Field(default=None)
+
+
+class GoalStatsRead(SQLModel):
+    """Goal statistics read schema"""
+    goal_id: UUID
+    total_checkins: int = 0
+    completed_checkins: int = 0
+    completion_rate: float = 0.0
+    current_streak: int = 0
+    longest_streak: int = 0
+    total_value: float = 0.0
+    average_value: float = 0.0
+    last_checkin_date: Optional[date] = None
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import List
+from uuid import UUID, uuid4
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+from app.models.checkin import CheckInRead
+from app.models.goal import GoalRead
+
+
+class Tombstone(SQLModel, table=True):
+    """Deleted row marker, so delta sync can report deletions"""
+    __table_args__ = (
+        Index("ix_tombstone_user_id_change_seq", "user_id", "change_seq"),
+    )
+    
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: UUID = Field(foreign_key="user.id")
+    entity: str  # goal or checkin
+    entity_id: UUID
+    change_seq: int
+    deleted_at: datetime = Field(default=None)
+
+
+class TombstoneRead(SQLModel):
+    """Tombstone read schema"""
+    entity: str
+    entity_id: UUID
+
+
+class SyncRead(SQLModel):
+    """Delta sync response schema"""
+    cursor: int
+    goals: List[GoalRead]
+    checkins: List[CheckInRead]
+    deleted: List[TombstoneRead]
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import Optional, List, Annotated
 from uuid import UUID, uuid4
 from pydantic import BaseModel, Field, EmailStr
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -18,6 +18,8 @@ class User(Base):
     email: Mapped[str] = mapped_column(String, unique=True, index=True)
     hashed_password: Mapped[str] = mapped_column(String)
     created_at: Mapped[datetime] = mapped_column(DateTime)
+    # Last change sequence number handed out for this user's data (delta sync cursor)
+    change_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     # Relationships
     goals: Mapped[List["Goal"]] = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
@@ -0,0 +1,217 @@
+import csv
+import math
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from sqlmodel import Session, select
+
+from app.core.errors import BadRequestError
+from app.models.checkin import CheckIn, CheckInImportError, CheckInImportRead
+from app.models.goal import Goal, GoalType
+from app.services.checkins import insert_checkins
+from app.services.heatmap import apply_heatmap_checkins
+from app.services.reminders import record_checkin_day
+from app.services.rollups import apply_rollup_checkins
+from app.services.stats import apply_checkin_batch
+from app.services.sync import next_change_seq
+
+# Accepted spellings of binary statuses
+_BINARY_STATUSES = {
+    "true": 1.0, "yes": 1.0, "y": 1.0, "1": 1.0, "1.0": 1.0,
+    "false": 0.0, "no": 0.0, "n": 0.0, "0": 0.0, "0.0": 0.0,
+}
+
+
+def parse_status(value: str, goal_type: GoalType) -> float:
+    """
+    Parse a CSV status for a goal of the given type
+
+    Args:
+        value: Status as written in the file
+        goal_type: Type of the check-in's goal
+
+    Returns:
+        Stored status: 1.0 or 0.0 for binary goals, the value otherwise
+
+    Raises:
+        ValueError: If the status doesn't fit the goal type
+    """
+    value = value.strip().lower()
+    if goal_type == GoalType.BINARY:
+        if value not in _BINARY_STATUSES:
+            raise ValueError(f"Status of a binary goal must be true or false, got {value!r}")
+        return _BINARY_STATUSES[value]
+
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"Status of a quantitative goal must be a number, got {value!r}")
+    if not math.isfinite(number):
+        raise ValueError(f"Status of a quantitative goal must be finite, got {value!r}")
+    return number
+
+
+def import_checkins_csv(
+    session: Session,
+    user_id: UUID,
+    lines: Iterable[str],
+    overwrite: bool = False,
+    chunk_size: int = 5000,
+    max_errors: int = 100,
+    progress: Optional[Callable[[CheckInImportRead], None]] = None,
+) -> CheckInImportRead:
+    """
+    Import check-ins of a user's goals from CSV, reading it incrementally
+
+    The file needs `date` and `status` columns, and `goal_id` or
+    `goal_title` to map rows to goals; `note` is optional. This is a
+    superset of the CSV export, whose rows without a date are skipped.
+    Goals are looked up once, then every `chunk_size` valid rows are
+    inserted with one statement, folded into the goal aggregates,
+    heatmaps and rollups and committed, so memory use doesn't depend on
+    the size of the file.
+
+    Args:
+        session: Database session
+        user_id: User ID
+        lines: Lines of the CSV file, e.g. an open text file
+        overwrite: Merge duplicates, overwriting existing check-ins,
+            instead of skipping them
+        chunk_size: Check-ins inserted per transaction
+        max_errors: Rejected rows to list in the result
+        progress: Called with the running result after every chunk
+
+    Returns:
+        Row counts and the first rejected rows
+
+    Raises:
+        BadRequestError: If required columns are missing
+    """
+    reader = csv.reader(lines)
+    header = [column.strip() for column in next(reader, [])]
+    columns = {column: index for index, column in enumerate(header)}
+    if not {"date", "status"} <= columns.keys() or not columns.keys() & {"goal_id", "goal_title"}:
+        raise BadRequestError(
+            detail="CSV needs date and status columns, and goal_id or goal_title"
+        )
+
+    # Get the user's goals once, by ID and by title
+    goals_by_id: Dict[str, Tuple[UUID, GoalType]] = {}
+    goals_by_title: Dict[str, Optional[Tuple[UUID, GoalType]]] = {}
+    quantitative_goal_ids: Set[UUID] = set()
+    for goal_id, title, goal_type in session.exec(
+        select(Goal.id, Goal.title, Goal.type)
+        .where((Goal.user_id == user_id) & Goal.deleted_at.is_(None))
+    ).all():
+        goals_by_id[str(goal_id)] = (goal_id, goal_type)
+        if goal_type == GoalType.QUANTITATIVE:
+            quantitative_goal_ids.add(goal_id)
+        # Titles shared by several goals can't be mapped
+        goals_by_title[title] = None if title in goals_by_title else (goal_id, goal_type)
+
+    # Plain counters; setting attributes of the result model costs a validation
+    counts = {"rows": 0, "imported": 0, "duplicates": 0, "failed": 0}
+    errors: List[CheckInImportError] = []
+    chunk: Dict[Tuple[UUID, date], dict] = {}
+
+    def summary() -> CheckInImportRead:
+        return CheckInImportRead(**counts, errors=errors)
+
+    def fail(line: int, detail: str) -> None:
+        counts["failed"] += 1
+        if len(errors) < max_errors:
+            errors.append(CheckInImportError(line=line, detail=detail))
+
+    def flush() -> None:
+        if not chunk:
+            return
+        now = datetime.utcnow()
+        change_seq = next_change_seq(session, user_id)
+        rows = [
+            {**row, "id": uuid4(), "created_at": now, "updated_at": now, "change_seq": change_seq}
+            for row in chunk.values()
+        ]
+        checkins = insert_checkins(
+            session, rows, overwrite=overwrite,
+            columns=(CheckIn.goal_id, CheckIn.checkin_date, CheckIn.status),
+        )
+        apply_checkin_batch(session, checkins)
+        apply_heatmap_checkins(session, checkins)
+        apply_rollup_checkins(
+            session,
+            [checkin for checkin in checkins if checkin.goal_id in quantitative_goal_ids],
+            overwritten=overwrite,
+        )
+        if checkins:
+            record_checkin_day(session, user_id, max(checkin.checkin_date for checkin in checkins))
+        session.commit()
+
+        counts["imported"] += len(checkins)
+        counts["duplicates"] += len(rows) - len(checkins)
+        chunk.clear()
+        if progress:
+            progress(summary())
+
+    def column(row: List[str], name: str) -> str:
+        index = columns.get(name)
+        return row[index].strip() if index is not None and index < len(row) else ""
+
+    for row in reader:
+        line = reader.line_num
+        date_value = column(row, "date")
+        if not date_value:
+            continue
+        counts["rows"] += 1
+
+        # Map the row to a goal
+        goal_id_value = column(row, "goal_id")
+        if goal_id_value:
+            goal = goals_by_id.get(goal_id_value)
+            if goal is None:
+                # Other spellings of the same UUID, e.g. without dashes
+                try:
+                    goal = goals_by_id.get(str(UUID(goal_id_value)))
+                except ValueError:
+                    fail(line, f"Invalid goal_id {goal_id_value!r}")
+                    continue
+        else:
+            title = column(row, "goal_title")
+            goal = goals_by_title.get(title)
+            if goal is None and title in goals_by_title:
+                fail(line, f"Several goals are titled {title!r}, use goal_id")
+                continue
+        if goal is None:
+            fail(line, "Goal not found")
+            continue
+        goal_id, goal_type = goal
+
+        try:
+            checkin_date = date.fromisoformat(date_value)
+        except ValueError:
+            fail(line, f"Invalid date {date_value!r}, expected YYYY-MM-DD")
+            continue
+        try:
+            status = parse_status(column(row, "status"), goal_type)
+        except ValueError as error:
+            fail(line, str(error))
+            continue
+
+        # Within a file, the first row of a day wins, or the last when merging
+        key = (goal_id, checkin_date)
+        if key in chunk:
+            counts["duplicates"] += 1
+            if not overwrite:
+                continue
+        chunk[key] = {
+            "goal_id": goal_id,
+            "checkin_date": checkin_date,
+            "status": status,
+            "note": column(row, "note") or None,
+        }
+
+        if len(chunk) >= chunk_size:
+            flush()
+
+    flush()
+    return summary()
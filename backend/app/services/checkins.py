@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from app.models.checkin import CheckIn
+
+# Dialect-specific INSERT constructs supporting ON CONFLICT
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def dialect_insert(session: Session) -> Any:
+    """Get the INSERT construct supporting ON CONFLICT of the session's database"""
+    return _INSERTS[session.get_bind().dialect.name]
+
+
+def insert_checkins(
+    session: Session,
+    rows: List[Dict[str, Any]],
+    overwrite: bool = False,
+    columns: Optional[Sequence[Any]] = None,
+) -> List[Any]:
+    """
+    Insert check-ins with a single INSERT ... ON CONFLICT statement
+
+    Duplicates are detected by the unique (goal_id, checkin_date)
+    constraint rather than a prior SELECT, so concurrent or retried
+    requests cannot both insert the same day.
+
+    Args:
+        session: Database session
+        rows: Check-in column values, each including its id
+        overwrite: Replace status and note of existing check-ins instead of
+            skipping them
+        columns: CheckIn columns to return as rows instead of CheckIn
+            instances; the insert then also skips the ORM bulk insert path,
+            which is costly for large imports
+
+    Returns:
+        Inserted or overwritten check-ins, in no particular order; skipped
+        duplicates are missing
+    """
+    if not rows:
+        return []
+
+    insert = dialect_insert(session)
+    statement = insert(CheckIn)
+    conflict_columns = [CheckIn.goal_id, CheckIn.checkin_date]
+
+    if overwrite:
+        statement = statement.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={
+                "status": statement.excluded.status,
+                "note": statement.excluded.note,
+                "updated_at": statement.excluded.updated_at,
+                "change_seq": statement.excluded.change_seq,
+            },
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=conflict_columns)
+
+    # Rows come back in no particular order; callers match them by id.
+    # Asking for parameter order would make SQLAlchemy fall back to one
+    # statement per row, since CheckIn has no server-side sentinel column.
+    if columns:
+        return session.connection().execute(statement.returning(*columns), rows).all()
+    return session.scalars(statement.returning(CheckIn), rows).all()
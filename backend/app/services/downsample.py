@@ -0,0 +1,105 @@
+from typing import List, Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+# Points per bucket from which NumPy beats the pure Python loop; below it,
+# the fixed cost of the array operations of every bucket dominates
+_NUMPY_MIN_BUCKET_SIZE = 20
+
+
+def _bucket_bounds(length: int, max_points: int) -> List[int]:
+    """
+    Split the points between the first and last into max_points - 2 buckets
+
+    Bucket i spans [bounds[i], bounds[i + 1]). Integer arithmetic keeps
+    every point in exactly one bucket, and no bucket is empty as long as
+    there are more points than max_points.
+    """
+    buckets = max_points - 2
+    return [1 + index * (length - 2) // buckets for index in range(buckets + 1)]
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], max_points: int) -> List[int]:
+    """
+    Pick the points of a series to plot with Largest-Triangle-Three-Buckets
+
+    Keeps the first and last points, and from each bucket in between the
+    point forming the largest triangle with the point kept from the
+    previous bucket and the average of the next bucket, which preserves
+    peaks, troughs and trends. Long series use NumPy when installed,
+    computing each bucket's areas as one array operation; the pure Python
+    loop picks the same points and is faster for small buckets.
+
+    Args:
+        x: Point abscissas, ascending, e.g. date ordinals
+        y: Point values
+        max_points: Maximum number of points to keep
+
+    Returns:
+        Ascending indices of the points to keep
+    """
+    length = len(x)
+    if length <= max_points:
+        return list(range(length))
+    if max_points < 3:
+        return [0, length - 1][:max_points]
+
+    bounds = _bucket_bounds(length, max_points)
+    if numpy is not None and length >= _NUMPY_MIN_BUCKET_SIZE * max_points:
+        return _lttb_numpy(x, y, bounds)
+    return _lttb_python(x, y, bounds)
+
+
+def _lttb_numpy(x: Sequence[float], y: Sequence[float], bounds: List[int]) -> List[int]:
+    """LTTB over NumPy arrays"""
+    xs = numpy.asarray(x, dtype=numpy.float64)
+    ys = numpy.asarray(y, dtype=numpy.float64)
+    starts = numpy.asarray(bounds)
+
+    # Average of every bucket at once; the last point follows the last bucket
+    counts = numpy.diff(starts)
+    next_x = numpy.append(numpy.add.reduceat(xs[:-1], starts[:-1]) / counts, xs[-1])[1:]
+    next_y = numpy.append(numpy.add.reduceat(ys[:-1], starts[:-1]) / counts, ys[-1])[1:]
+
+    selected = [0]
+    previous = 0
+    for bucket in range(len(bounds) - 1):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        ax, ay = xs[previous], ys[previous]
+        areas = numpy.abs(
+            (ax - next_x[bucket]) * (ys[start:end] - ay)
+            - (ax - xs[start:end]) * (next_y[bucket] - ay)
+        )
+        previous = start + int(areas.argmax())
+        selected.append(previous)
+
+    selected.append(len(xs) - 1)
+    return selected
+
+
+def _lttb_python(x: Sequence[float], y: Sequence[float], bounds: List[int]) -> List[int]:
+    """LTTB in pure Python"""
+    length = len(x)
+    selected = [0]
+    previous = 0
+    for bucket in range(len(bounds) - 1):
+        start, end = bounds[bucket], bounds[bucket + 1]
+        # The next bucket, or the last point after the last bucket
+        next_start = end
+        next_end = bounds[bucket + 2] if bucket + 2 < len(bounds) else length
+        count = next_end - next_start
+        cx = sum(x[next_start:next_end]) / count
+        cy = sum(y[next_start:next_end]) / count
+
+        ax, ay = x[previous], y[previous]
+        previous = max(
+            range(start, end),
+            key=lambda index: abs((ax - cx) * (y[index] - ay) - (ax - x[index]) * (cy - ay)),
+        )
+        selected.append(previous)
+
+    selected.append(length - 1)
+    return selected
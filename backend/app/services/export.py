@@ -0,0 +1,206 @@
+import csv
+import io
+from enum import Enum
+from typing import Any, AsyncIterator, Iterator, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, and_
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, select
+
+from app.core.responses import dumps
+from app.models.checkin import CheckIn
+from app.models.goal import Goal, GoalType
+
+
+class ExportFormat(str, Enum):
+    """Account export format"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+# Columns of the CSV export, one row per check-in; goals without check-ins
+# get one row with empty check-in columns
+CSV_COLUMNS = (
+    "goal_id",
+    "goal_title",
+    "goal_description",
+    "goal_type",
+    "goal_target_date",
+    "date",
+    "status",
+    "note",
+)
+
+
+def export_statement(user_id: UUID) -> Select:
+    """
+    Build the single query reading a user's goals with their check-ins
+
+    Rows come ordered by goal, then date, so each goal's check-ins are
+    contiguous and the export can be written as the rows stream in.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Select of goal and check-in columns, one row per check-in
+    """
+    return (
+        select(
+            Goal.id,
+            Goal.title,
+            Goal.description,
+            Goal.type,
+            Goal.target_date,
+            CheckIn.checkin_date,
+            CheckIn.status,
+            CheckIn.note,
+        )
+        .outerjoin(CheckIn, CheckIn.goal_id == Goal.id)
+        .where(and_(Goal.user_id == user_id, Goal.deleted_at.is_(None)))
+        .order_by(Goal.id, CheckIn.checkin_date)
+    )
+
+
+def _status(goal_type: GoalType, status: float) -> Any:
+    """Give binary check-ins their API representation"""
+    return bool(status) if goal_type == GoalType.BINARY else status
+
+
+class _NDJSONEncoder:
+    """Writes a goal line, then one line per check-in of the goal"""
+
+    def __init__(self):
+        self.goal_id = None
+
+    def start(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        lines = []
+        for goal_id, title, description, goal_type, target_date, checkin_date, status, note in rows:
+            if goal_id != self.goal_id:
+                self.goal_id = goal_id
+                lines.append(dumps({
+                    "type": "goal",
+                    "id": goal_id,
+                    "title": title,
+                    "description": description,
+                    "goal_type": goal_type,
+                    "target_date": target_date,
+                }))
+            if checkin_date is not None:
+                lines.append(dumps({
+                    "type": "checkin",
+                    "goal_id": goal_id,
+                    "date": checkin_date,
+                    "status": _status(goal_type, status),
+                    "note": note,
+                }))
+        lines.append(b"")
+        return b"\n".join(lines)
+
+
+class _CSVEncoder:
+    """Writes one row per check-in, with its goal's columns repeated"""
+
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def _flush(self) -> bytes:
+        data = self.buffer.getvalue().encode("utf-8")
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def start(self) -> bytes:
+        self.writer.writerow(CSV_COLUMNS)
+        return self._flush()
+
+    def encode(self, rows: Sequence[Any]) -> bytes:
+        writerow = self.writer.writerow
+        for goal_id, title, description, goal_type, target_date, checkin_date, status, note in rows:
+            if checkin_date is not None and goal_type == GoalType.BINARY:
+                status = "true" if status else "false"
+            writerow((
+                goal_id, title, description, goal_type.value, target_date,
+                checkin_date, status, note,
+            ))
+        return self._flush()
+
+
+_ENCODERS = {
+    ExportFormat.NDJSON: _NDJSONEncoder,
+    ExportFormat.CSV: _CSVEncoder,
+}
+
+
+def stream_export(
+    bind: Engine,
+    user_id: UUID,
+    export_format: ExportFormat,
+    chunk_size: int,
+) -> Iterator[bytes]:
+    """
+    Stream a user's goals and check-ins, one encoded chunk per batch of rows
+
+    Rows are read through a server-side cursor (`yield_per`) on a session
+    of its own, since the request's session is closed before a streaming
+    response is sent. Memory use is bounded by `chunk_size`, whatever the
+    size of the history.
+
+    Args:
+        bind: Engine of the request's session
+        user_id: User ID
+        export_format: Output format
+        chunk_size: Rows fetched and encoded at a time
+
+    Yields:
+        Encoded chunks
+    """
+    encoder = _ENCODERS[export_format]()
+    yield encoder.start()
+    with Session(bind) as session:
+        result = session.execute(
+            export_statement(user_id).execution_options(yield_per=chunk_size)
+        )
+        for rows in result.partitions():
+            yield encoder.encode(rows)
+
+
+async def stream_export_async(
+    bind: Engine,
+    user_id: UUID,
+    export_format: ExportFormat,
+    chunk_size: int,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a user's goals and check-ins through the async engine
+
+    Same output as `stream_export`, for requests served with DATABASE_ASYNC.
+
+    Args:
+        bind: sync_engine of the async engine of the request's session
+        user_id: User ID
+        export_format: Output format
+        chunk_size: Rows fetched and encoded at a time
+
+    Yields:
+        Encoded chunks
+    """
+    encoder = _ENCODERS[export_format]()
+    yield encoder.start()
+    async with AsyncEngine(bind).connect() as connection:
+        result = await connection.stream(
+            export_statement(user_id).execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions():
+            yield encoder.encode(rows)
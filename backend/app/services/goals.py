@@ -0,0 +1,103 @@
+from typing import List
+from uuid import UUID
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import Session, delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.checkin import CheckIn
+from app.models.goal import Goal
+from app.models.heatmap import GoalHeatmap
+from app.models.rollup import GoalRollup
+from app.models.stats import GoalStats
+
+
+def delete_goal_rows(session: Session, goal_id: UUID) -> None:
+    """
+    Delete a goal with its check-ins and derived rows, without loading them
+
+    Each table is cleared with one set-based DELETE, in the caller's
+    transaction. The schema's ON DELETE CASCADE covers the same rows where
+    the database enforces it; the explicit deletes keep SQLite connections
+    without foreign key enforcement consistent.
+
+    Args:
+        session: Database session
+        goal_id: Goal ID
+    """
+    session.exec(delete(CheckIn).where(CheckIn.goal_id == goal_id))
+    session.exec(delete(GoalStats).where(GoalStats.goal_id == goal_id))
+    session.exec(delete(GoalHeatmap).where(GoalHeatmap.goal_id == goal_id))
+    session.exec(delete(GoalRollup).where(GoalRollup.goal_id == goal_id))
+    session.exec(delete(Goal).where(Goal.id == goal_id))
+
+
+def purge_goal(session: Session, goal_id: UUID, chunk_size: int) -> int:
+    """
+    Delete a soft-deleted goal's check-ins in chunks, then the goal itself
+
+    Every chunk is its own short transaction, so purging a long history
+    neither holds the write lock nor builds one huge transaction.
+
+    Args:
+        session: Database session
+        goal_id: Goal ID
+        chunk_size: Check-ins deleted per transaction
+
+    Returns:
+        Number of check-ins deleted
+    """
+    deleted = 0
+    while True:
+        chunk = select(CheckIn.id).where(CheckIn.goal_id == goal_id).limit(chunk_size)
+        result = session.exec(delete(CheckIn).where(CheckIn.id.in_(chunk)))
+        session.commit()
+        deleted += result.rowcount
+        if result.rowcount < chunk_size:
+            break
+
+    delete_goal_rows(session, goal_id)
+    session.commit()
+    return deleted
+
+
+def purge_deleted_goals(session: Session, chunk_size: int) -> List[UUID]:
+    """
+    Purge every soft-deleted goal, e.g. ones left over by a restart
+
+    Args:
+        session: Database session
+        chunk_size: Check-ins deleted per transaction
+
+    Returns:
+        IDs of the purged goals
+    """
+    goal_ids = session.exec(select(Goal.id).where(Goal.deleted_at.is_not(None))).all()
+    for goal_id in goal_ids:
+        purge_goal(session, goal_id, chunk_size)
+    return list(goal_ids)
+
+
+async def purge_goal_in_background(bind: Engine, goal_id: UUID, chunk_size: int) -> None:
+    """
+    Purge a soft-deleted goal on its own session, after the response is sent
+
+    Args:
+        bind: Engine of the request's session; the sync_engine of an async
+            engine when serving through DATABASE_ASYNC
+        goal_id: Goal ID
+        chunk_size: Check-ins deleted per transaction
+    """
+    if bind.dialect.is_async:
+        async with AsyncSession(AsyncEngine(bind)) as session:
+            await session.run_sync(purge_goal, goal_id, chunk_size)
+        return
+
+    # Blocking purge, kept off the event loop
+    def purge() -> None:
+        with Session(bind) as session:
+            purge_goal(session, goal_id, chunk_size)
+
+    await run_in_threadpool(purge)
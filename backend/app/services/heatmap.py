@@ -0,0 +1,182 @@
+import base64
+import math
+from array import array
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.models.checkin import CheckIn
+from app.models.goal import Goal, GoalType
+from app.models.heatmap import GoalHeatmap, HeatmapRead
+from app.services.checkins import dialect_insert
+from app.services.stats import is_completed
+from app.services.sync import lock_user_data
+
+
+class HeatmapGrid:
+    """
+    Decoded GoalHeatmap data that days can be set in and ranges read from
+
+    The bitset of binary goals is held as an int, so setting a day, growing
+    the grid to an earlier start or slicing a range are shifts and masks.
+    """
+
+    def __init__(self, goal_type: GoalType, start_date: date, days: int = 0, data: bytes = b""):
+        self.type = goal_type
+        self.start_date = start_date
+        self.days = days
+        if goal_type == GoalType.BINARY:
+            self.bits = int.from_bytes(data, "little")
+        else:
+            self.values = array("d")
+            self.values.frombytes(data)
+
+    @classmethod
+    def from_row(cls, heatmap: GoalHeatmap) -> "HeatmapGrid":
+        return cls(heatmap.type, heatmap.start_date, heatmap.days, heatmap.data)
+
+    def store(self, heatmap: GoalHeatmap) -> None:
+        """Write the grid into a GoalHeatmap row"""
+        heatmap.type = self.type
+        heatmap.start_date = self.start_date
+        heatmap.days = self.days
+        if self.type == GoalType.BINARY:
+            heatmap.data = self.bits.to_bytes((self.days + 7) // 8, "little")
+        else:
+            heatmap.data = self.values.tobytes()
+
+    def set(self, day: date, status: float) -> None:
+        """Record the check-in of a day, growing the grid as needed"""
+        index = (day - self.start_date).days
+        if index < 0:
+            # Back-dated before the first day: move the start back
+            if self.type == GoalType.BINARY:
+                self.bits <<= -index
+            else:
+                self.values = array("d", [math.nan]) * -index + self.values
+            self.start_date = day
+            self.days -= index
+            index = 0
+
+        if self.type == GoalType.BINARY:
+            if is_completed(status):
+                self.bits |= 1 << index
+            else:
+                self.bits &= ~(1 << index)
+        else:
+            if index >= len(self.values):
+                self.values.extend(array("d", [math.nan]) * (index + 1 - len(self.values)))
+            self.values[index] = float(status)
+        self.days = max(self.days, index + 1)
+
+    def read(self, goal_id: UUID, start_date: date, end_date: date) -> HeatmapRead:
+        """
+        Get the heatmap of a date range
+
+        Args:
+            goal_id: Goal ID
+            start_date: First day of the range
+            end_date: Last day of the range
+
+        Returns:
+            Heatmap of the range; days outside the grid are empty
+        """
+        length = (end_date - start_date).days + 1
+        offset = (start_date - self.start_date).days
+        heatmap = HeatmapRead(
+            goal_id=goal_id, type=self.type, start_date=start_date, end_date=end_date,
+        )
+
+        if self.type == GoalType.BINARY:
+            bits = self.bits >> offset if offset >= 0 else self.bits << -offset
+            bits &= (1 << length) - 1
+            heatmap.bits = base64.b64encode(bits.to_bytes((length + 7) // 8, "little")).decode()
+        else:
+            values: List[Optional[float]] = [None] * length
+            for index in range(max(0, -offset), min(length, len(self.values) - offset)):
+                value = self.values[index + offset]
+                values[index] = None if math.isnan(value) else value
+            heatmap.values = values
+        return heatmap
+
+
+def build_goal_heatmap(session: Session, goal: Goal) -> GoalHeatmap:
+    """
+    Build a goal's heatmap row from its check-in history
+
+    Runs once per goal, on the first heatmap read; check-in writes keep the
+    row current afterwards. The user row is locked first, as check-in writes
+    do, so none commits between the history read and the insert unseen. A
+    concurrent first read inserting the row first wins, and its row is
+    returned. The caller commits.
+
+    Args:
+        session: Database session
+        goal: Goal
+
+    Returns:
+        Heatmap row
+    """
+    lock_user_data(session, goal.user_id)
+    rows = session.exec(
+        select(CheckIn.checkin_date, CheckIn.status)
+        .where(CheckIn.goal_id == goal.id)
+        .order_by(CheckIn.checkin_date)
+    ).all()
+
+    start_date = goal.created_at.date() if goal.created_at else date.today()
+    if rows:
+        start_date = min(start_date, rows[0][0])
+    grid = HeatmapGrid(goal.type, start_date)
+    for checkin_date, status in rows:
+        grid.set(checkin_date, status)
+
+    heatmap = GoalHeatmap(goal_id=goal.id, type=goal.type, start_date=start_date)
+    grid.store(heatmap)
+    insert = dialect_insert(session)
+    session.execute(
+        insert(GoalHeatmap)
+        .values(
+            goal_id=heatmap.goal_id,
+            type=heatmap.type,
+            start_date=heatmap.start_date,
+            days=heatmap.days,
+            data=heatmap.data,
+        )
+        .on_conflict_do_nothing(index_elements=[GoalHeatmap.goal_id])
+    )
+    return session.get(GoalHeatmap, goal.id, populate_existing=True)
+
+
+def apply_heatmap_checkins(session: Session, checkins: List[Any]) -> None:
+    """
+    Set the days of written check-ins in their goals' heatmaps
+
+    Created and overwritten check-ins are handled alike, since a day's
+    value is simply replaced. Goals whose heatmap was never read have no
+    row and are skipped; it is built from the history on first read. The
+    caller commits, keeping heatmaps in the same transaction as the
+    check-ins.
+
+    Args:
+        session: Database session
+        checkins: Written check-ins, or rows with their goal_id,
+            checkin_date and status
+    """
+    by_goal: Dict[UUID, List[Any]] = defaultdict(list)
+    for checkin in checkins:
+        by_goal[checkin.goal_id].append(checkin)
+    if not by_goal:
+        return
+
+    for heatmap in session.exec(
+        select(GoalHeatmap).where(GoalHeatmap.goal_id.in_(list(by_goal)))
+    ).all():
+        grid = HeatmapGrid.from_row(heatmap)
+        for checkin in by_goal[heatmap.goal_id]:
+            grid.set(checkin.checkin_date, checkin.status)
+        grid.store(heatmap)
+        session.add(heatmap)
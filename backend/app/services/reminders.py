@@ -0,0 +1,216 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import bindparam
+from sqlmodel import Session, func, or_, select, update
+
+from app.core.errors import BadRequestError
+from app.core.notifications import Notification, NotificationSink
+from app.models.checkin import CheckIn
+from app.models.goal import Goal
+from app.models.reminder import Reminder, ReminderRun, ReminderUpdate
+
+
+def parse_timezone(name: str) -> ZoneInfo:
+    """
+    Get an IANA time zone by name
+
+    Raises:
+        BadRequestError: If the time zone doesn't exist
+    """
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise BadRequestError(detail=f"Unknown time zone {name!r}")
+
+
+def next_due_at(local_time: time, zone: ZoneInfo, after: datetime) -> datetime:
+    """
+    Get the first time after an instant that is local_time in a time zone
+
+    Args:
+        local_time: Time of day in the zone
+        zone: Time zone
+        after: Naive UTC instant
+
+    Returns:
+        Naive UTC instant
+    """
+    after = after.replace(tzinfo=timezone.utc)
+    day = after.astimezone(zone).date()
+    due = datetime.combine(day, local_time, tzinfo=zone).astimezone(timezone.utc)
+    if due <= after:
+        due = datetime.combine(
+            day + timedelta(days=1), local_time, tzinfo=zone
+        ).astimezone(timezone.utc)
+    return due.replace(tzinfo=None)
+
+
+def local_date(moment: datetime, zone: ZoneInfo) -> date:
+    """Get the day in a time zone at a naive UTC instant"""
+    return moment.replace(tzinfo=timezone.utc).astimezone(zone).date()
+
+
+def latest_today() -> date:
+    """Get the latest day that is today somewhere; no time zone is a day ahead of UTC"""
+    return datetime.utcnow().date() + timedelta(days=1)
+
+
+def save_reminder(
+    session: Session,
+    user_id: UUID,
+    reminder_in: ReminderUpdate,
+    now: Optional[datetime] = None,
+) -> Reminder:
+    """
+    Set a user's daily reminder and schedule its next occurrence
+
+    The caller commits.
+
+    Args:
+        session: Database session
+        user_id: User ID
+        reminder_in: Reminder settings
+        now: Naive UTC reference instant, defaults to now
+
+    Returns:
+        Reminder row
+
+    Raises:
+        BadRequestError: If the time zone doesn't exist
+    """
+    zone = parse_timezone(reminder_in.timezone)
+    # The time is read in the reminder's time zone, not any offset it came with
+    local_time = reminder_in.local_time.replace(tzinfo=None)
+    due_at = next_due_at(local_time, zone, now or datetime.utcnow())
+
+    reminder = session.get(Reminder, user_id)
+    if reminder is None:
+        # Read the latest check-in day once; check-in writes keep it afterwards.
+        # Later check-ins aren't anyone's today, as in record_checkin_day
+        last_checkin_on = session.exec(
+            select(func.max(CheckIn.checkin_date))
+            .join(Goal, Goal.id == CheckIn.goal_id)
+            .where((Goal.user_id == user_id) & (CheckIn.checkin_date <= latest_today()))
+        ).one()
+        reminder = Reminder(
+            user_id=user_id,
+            local_time=local_time,
+            next_due_at=due_at,
+            last_checkin_on=last_checkin_on,
+        )
+
+    reminder.local_time = local_time
+    reminder.timezone = reminder_in.timezone
+    reminder.next_due_at = due_at
+    session.add(reminder)
+    return reminder
+
+
+def record_checkin_day(session: Session, user_id: UUID, checkin_date: date) -> None:
+    """
+    Note a check-in day in the user's reminder for the checked-in-today lookup
+
+    One UPDATE by primary key, matching nothing for users without a
+    reminder and for back-dated days. The caller commits.
+
+    Args:
+        session: Database session
+        user_id: User ID
+        checkin_date: Latest date of the written check-ins
+    """
+    # Later check-ins aren't anyone's today
+    if checkin_date > latest_today():
+        return
+    session.exec(
+        update(Reminder)
+        .where(
+            (Reminder.user_id == user_id) &
+            or_(Reminder.last_checkin_on.is_(None), Reminder.last_checkin_on < checkin_date)
+        )
+        .values(last_checkin_on=checkin_date)
+    )
+
+
+_RESCHEDULE = (
+    update(Reminder.__table__)
+    .where(Reminder.__table__.c.user_id == bindparam("key"))
+    .values(next_due_at=bindparam("next_due_at"))
+)
+
+
+def send_due_reminders(
+    session: Session,
+    sink: NotificationSink,
+    now: Optional[datetime] = None,
+    batch_size: int = 1000,
+    max_lateness: timedelta = timedelta(hours=1),
+) -> ReminderRun:
+    """
+    Send the reminders due by now to the users who haven't checked in today
+
+    Walks the next_due_at index in batches, so a tick reads only due
+    reminders and holds one batch in memory, however many users there are.
+    Every due reminder is moved to its next occurrence, whether sent or
+    skipped because the user checked in or the reminder is more than
+    `max_lateness` overdue (e.g. after downtime). A batch is committed
+    before it is handed to the sink: a failed delivery loses reminders
+    rather than repeating them. On PostgreSQL, concurrent schedulers skip
+    each other's batches.
+
+    Args:
+        session: Database session
+        sink: Notification sink to deliver through
+        now: Naive UTC reference instant, defaults to now
+        batch_size: Reminders read and updated per transaction
+        max_lateness: Longest delay after which a reminder is still sent
+
+    Returns:
+        Counts of sent and skipped reminders
+    """
+    now = now or datetime.utcnow()
+    run = {"sent": 0, "checked_in": 0, "late": 0}
+
+    while True:
+        reminders = session.exec(
+            select(
+                Reminder.user_id,
+                Reminder.local_time,
+                Reminder.timezone,
+                Reminder.next_due_at,
+                Reminder.last_checkin_on,
+            )
+            .where(Reminder.next_due_at <= now)
+            .order_by(Reminder.next_due_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not reminders:
+            break
+
+        notifications = []
+        schedule = []
+        for user_id, local_time, zone_name, due_at, last_checkin_on in reminders:
+            zone = ZoneInfo(zone_name)
+            day = local_date(due_at, zone)
+            if last_checkin_on is not None and last_checkin_on >= day:
+                run["checked_in"] += 1
+            elif now - due_at > max_lateness:
+                run["late"] += 1
+            else:
+                notifications.append(Notification(user_id, day, due_at))
+            schedule.append(
+                {"key": user_id, "next_due_at": next_due_at(local_time, zone, now)}
+            )
+
+        # One executemany UPDATE by primary key per batch, through Core to
+        # skip the ORM's per-row bookkeeping
+        session.connection().execute(_RESCHEDULE, schedule)
+        session.commit()
+        if notifications:
+            sink.send(notifications)
+        run["sent"] += len(notifications)
+
+    return ReminderRun(**run)
@@ -0,0 +1,235 @@
+import calendar
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from sqlmodel import Session, delete, select
+
+from app.models.checkin import CheckIn
+from app.models.rollup import GoalRollup, RollupPeriod, RollupPoint, RollupRead
+
+# Rollup row key: goal ID, period and first day of the period
+RollupKey = Tuple[UUID, RollupPeriod, date]
+
+
+def period_start(day: date, period: RollupPeriod) -> date:
+    """Get the first day of the week (Monday) or month containing a day"""
+    if period == RollupPeriod.WEEK:
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def period_end(start: date, period: RollupPeriod) -> date:
+    """Get the last day of the week or month starting on a day"""
+    if period == RollupPeriod.WEEK:
+        # The last week of year 9999 is cut short at the last date there is
+        return start + timedelta(days=min(6, (date.max - start).days))
+    return start.replace(day=calendar.monthrange(start.year, start.month)[1])
+
+
+def _keys(goal_id: UUID, day: date) -> Iterator[RollupKey]:
+    """Get the keys of the rollup rows a check-in counts towards"""
+    for period in RollupPeriod:
+        yield goal_id, period, period_start(day, period)
+
+
+class RollupAccumulator:
+    """Plain stand-in for GoalRollup to fold check-in values into"""
+
+    __slots__ = ("count", "total", "minimum", "maximum")
+
+    def __init__(self, rollup: Optional[GoalRollup] = None):
+        self.count = rollup.count if rollup is not None else 0
+        self.total = rollup.total if rollup is not None else 0.0
+        self.minimum = rollup.minimum if rollup is not None else 0.0
+        self.maximum = rollup.maximum if rollup is not None else 0.0
+
+    def add(self, value: float) -> None:
+        """Fold a check-in value"""
+        value = float(value)
+        if self.count:
+            self.minimum = min(self.minimum, value)
+            self.maximum = max(self.maximum, value)
+        else:
+            self.minimum = self.maximum = value
+        self.count += 1
+        self.total += value
+
+    def copy_to(self, rollup: GoalRollup) -> None:
+        """Write the aggregate into a GoalRollup row"""
+        rollup.count = self.count
+        rollup.total = self.total
+        rollup.minimum = self.minimum
+        rollup.maximum = self.maximum
+
+
+def _store(
+    session: Session,
+    rollups: Dict[RollupKey, GoalRollup],
+    accumulators: Dict[RollupKey, RollupAccumulator],
+) -> None:
+    """Write accumulators into their rollup rows, adding missing rows"""
+    for key, accumulator in accumulators.items():
+        rollup = rollups.get(key)
+        if rollup is None:
+            goal_id, period, start = key
+            rollup = GoalRollup(goal_id=goal_id, period=period, period_start=start)
+        accumulator.copy_to(rollup)
+        session.add(rollup)
+
+
+def apply_rollup_checkins(
+    session: Session,
+    checkins: List[Any],
+    overwritten: bool = False,
+) -> None:
+    """
+    Fold written check-ins of quantitative goals into their rollup rows
+
+    New check-ins are folded into the week and month rows they fall in,
+    loaded with one query. Overwritten values can lower a maximum or raise
+    a minimum, so with `overwritten` the touched periods are recomputed
+    from their check-ins instead, with one more query. The caller commits,
+    keeping rollups in the same transaction as the check-ins.
+
+    Args:
+        session: Database session
+        checkins: Written check-ins of quantitative goals, or rows with
+            their goal_id, checkin_date and status
+        overwritten: Whether any check-in replaced an existing one
+    """
+    touched = {
+        key for checkin in checkins for key in _keys(checkin.goal_id, checkin.checkin_date)
+    }
+    if not touched:
+        return
+
+    goal_ids = list({goal_id for goal_id, _, _ in touched})
+    starts = {start for _, _, start in touched}
+    # The query may match rows of other goals' periods; only touched keys are used
+    rollups = {
+        (rollup.goal_id, rollup.period, rollup.period_start): rollup
+        for rollup in session.exec(
+            select(GoalRollup).where(
+                GoalRollup.goal_id.in_(goal_ids) & GoalRollup.period_start.in_(starts)
+            )
+        ).all()
+    }
+
+    if overwritten:
+        accumulators = {key: RollupAccumulator() for key in touched}
+        last = max(period_end(start, period) for _, period, start in touched)
+        for goal_id, checkin_date, status in session.exec(
+            select(CheckIn.goal_id, CheckIn.checkin_date, CheckIn.status).where(
+                CheckIn.goal_id.in_(goal_ids) &
+                (CheckIn.checkin_date >= min(starts)) &
+                (CheckIn.checkin_date <= last)
+            )
+        ).all():
+            for key in _keys(goal_id, checkin_date):
+                if key in accumulators:
+                    accumulators[key].add(status)
+    else:
+        accumulators = {key: RollupAccumulator(rollups.get(key)) for key in touched}
+        for checkin in checkins:
+            for key in _keys(checkin.goal_id, checkin.checkin_date):
+                accumulators[key].add(checkin.status)
+
+    _store(session, rollups, accumulators)
+
+
+def rebuild_goal_rollups(session: Session, goal_ids: List[UUID]) -> int:
+    """
+    Recompute the rollup rows of goals from their full check-in histories
+
+    Used for backfills and after bulk loads that bypass the write path.
+    Pass quantitative goals in chunks whose histories fit in memory. The
+    caller commits.
+
+    Args:
+        session: Database session
+        goal_ids: IDs of quantitative goals
+
+    Returns:
+        Number of rollup rows written
+    """
+    if not goal_ids:
+        return 0
+
+    session.exec(delete(GoalRollup).where(GoalRollup.goal_id.in_(goal_ids)))
+    accumulators: Dict[RollupKey, RollupAccumulator] = {}
+    for goal_id, checkin_date, status in session.exec(
+        select(CheckIn.goal_id, CheckIn.checkin_date, CheckIn.status)
+        .where(CheckIn.goal_id.in_(goal_ids))
+    ).all():
+        for key in _keys(goal_id, checkin_date):
+            accumulator = accumulators.get(key)
+            if accumulator is None:
+                accumulator = accumulators[key] = RollupAccumulator()
+            accumulator.add(status)
+
+    _store(session, {}, accumulators)
+    return len(accumulators)
+
+
+def choose_period(start_date: date, end_date: date, max_points: int) -> RollupPeriod:
+    """
+    Pick the finest period whose series over a range has at most max_points
+
+    Ranges too long even for months get months.
+    """
+    first_week = period_start(start_date, RollupPeriod.WEEK)
+    weeks = (period_start(end_date, RollupPeriod.WEEK) - first_week).days // 7 + 1
+    return RollupPeriod.WEEK if weeks <= max_points else RollupPeriod.MONTH
+
+
+def read_goal_rollups(
+    session: Session,
+    goal_id: UUID,
+    start_date: date,
+    end_date: date,
+    period: RollupPeriod,
+) -> RollupRead:
+    """
+    Get a goal's rollup series over a date range
+
+    Reads one rollup row per period with check-ins, walking the primary key.
+
+    Args:
+        session: Database session
+        goal_id: Goal ID
+        start_date: First day of the range
+        end_date: Last day of the range
+        period: Period of the series
+
+    Returns:
+        Rollups of the periods overlapping the range, oldest first
+    """
+    rollups = session.exec(
+        select(GoalRollup)
+        .where(
+            (GoalRollup.goal_id == goal_id) &
+            (GoalRollup.period == period) &
+            (GoalRollup.period_start >= period_start(start_date, period)) &
+            (GoalRollup.period_start <= end_date)
+        )
+        .order_by(GoalRollup.period_start)
+    ).all()
+
+    return RollupRead(
+        goal_id=goal_id,
+        period=period,
+        start_date=start_date,
+        end_date=end_date,
+        points=[
+            RollupPoint(
+                period_start=rollup.period_start,
+                count=rollup.count,
+                total=rollup.total,
+                average=rollup.total / rollup.count,
+                minimum=rollup.minimum,
+                maximum=rollup.maximum,
+            )
+            for rollup in rollups
+        ],
+    )
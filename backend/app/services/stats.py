@@ -0,0 +1,319 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Union
+from uuid import UUID
+
+from sqlalchemy.orm.attributes import flag_modified
+from sqlmodel import Session, select
+
+from app.models.checkin import CheckIn
+from app.models.stats import GoalStats, GoalStatsRead
+
+# Columns of GoalStats derived from the check-in history
+_AGGREGATE_COLUMNS = (
+    "total_checkins",
+    "completed_checkins",
+    "total_value",
+    "longest_streak",
+    "current_run",
+    "run_end_date",
+    "last_checkin_date",
+)
+
+
+def is_completed(status: Union[bool, float]) -> bool:
+    """
+    Whether a check-in status counts towards streaks and completion rate
+
+    Binary goals store True/False as 1.0/0.0, quantitative goals store the
+    value itself, so any positive status counts as completed.
+    """
+    return float(status) > 0
+
+
+class StatsAccumulator:
+    """
+    Plain stand-in for GoalStats to fold check-ins into
+
+    Setting attributes of ORM instances goes through pydantic and SQLAlchemy
+    instrumentation, which dominates folding long histories.
+    """
+
+    __slots__ = ("goal_id", *_AGGREGATE_COLUMNS)
+
+    def __init__(self, goal_id: UUID, stats: Optional[GoalStats] = None):
+        self.goal_id = goal_id
+        for column in _AGGREGATE_COLUMNS:
+            value = getattr(stats, column) if stats is not None else None
+            setattr(self, column, GoalStats.model_fields[column].default if value is None else value)
+
+    def row(self) -> Dict[str, object]:
+        """Get the aggregate as GoalStats column values"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def copy_to(self, stats: GoalStats) -> None:
+        """Write the aggregate into a GoalStats row"""
+        for column in _AGGREGATE_COLUMNS:
+            setattr(stats, column, getattr(self, column))
+            # Write every column, even unchanged ones, so all updated rows
+            # flush as one executemany UPDATE instead of one per set of
+            # changed columns
+            flag_modified(stats, column)
+
+
+def fold_checkin(stats: GoalStats, checkin_date: date, status: float) -> None:
+    """
+    Advance an aggregate row by a check-in dated after all others
+
+    Only reads and sets GoalStats attributes, so it can fold into a
+    StatsAccumulator as well.
+    """
+    stats.total_checkins += 1
+    stats.total_value += float(status)
+    stats.last_checkin_date = checkin_date
+
+    if is_completed(status):
+        stats.completed_checkins += 1
+        if stats.run_end_date == checkin_date - timedelta(days=1):
+            stats.current_run += 1
+        else:
+            stats.current_run = 1
+        stats.run_end_date = checkin_date
+        stats.longest_streak = max(stats.longest_streak, stats.current_run)
+    else:
+        stats.current_run = 0
+
+
+def get_or_create_goal_stats(session: Session, goal_id: UUID) -> GoalStats:
+    """
+    Get the aggregate row of a goal, adding an empty one if missing
+
+    Args:
+        session: Database session
+        goal_id: Goal ID
+
+    Returns:
+        Goal aggregate row
+    """
+    stats = session.get(GoalStats, goal_id)
+    if stats is None:
+        stats = GoalStats(goal_id=goal_id)
+        session.add(stats)
+    return stats
+
+
+def apply_checkin(session: Session, checkin: CheckIn) -> GoalStats:
+    """
+    Fold a newly created check-in into its goal's aggregate row
+
+    Check-ins appended after the latest known date are folded in O(1).
+    Back-dated check-ins (e.g. replayed offline) can join or split runs, so
+    the row is rebuilt from the goal's history instead. The caller commits,
+    keeping the aggregate in the same transaction as the check-in.
+
+    Args:
+        session: Database session
+        checkin: Check-in that was just added to the session
+
+    Returns:
+        Updated goal aggregate row
+    """
+    stats = get_or_create_goal_stats(session, checkin.goal_id)
+    return _apply_goal_checkins(session, stats, [checkin])
+
+
+def apply_checkin_batch(session: Session, checkins: List[CheckIn]) -> None:
+    """
+    Fold a batch of newly created check-ins into their goals' aggregate rows
+
+    The aggregate rows of all touched goals are loaded with one query, and
+    goals needing a rebuild share one history query.
+
+    Args:
+        session: Database session
+        checkins: Check-ins that were just added to the session, or rows
+            with their goal_id, checkin_date and status
+    """
+    by_goal: Dict[UUID, List[CheckIn]] = defaultdict(list)
+    for checkin in checkins:
+        by_goal[checkin.goal_id].append(checkin)
+
+    if not by_goal:
+        return
+
+    # Keep references to the loaded rows; the identity map alone is weak
+    stats_by_goal = {
+        stats.goal_id: stats
+        for stats in session.exec(
+            select(GoalStats).where(GoalStats.goal_id.in_(list(by_goal)))
+        ).all()
+    }
+
+    to_rebuild = []
+    for goal_id, goal_checkins in by_goal.items():
+        stats = stats_by_goal.get(goal_id)
+        if stats is None:
+            stats = GoalStats(goal_id=goal_id)
+            session.add(stats)
+        if _is_back_dated(stats, goal_checkins):
+            to_rebuild.append(stats)
+        else:
+            _fold_checkins(session, stats, goal_checkins)
+
+    _rebuild(session, to_rebuild)
+
+
+def _is_back_dated(stats: GoalStats, checkins: List[CheckIn]) -> bool:
+    """Whether any new check-in is dated on or before the latest known one"""
+    return stats.last_checkin_date is not None and any(
+        checkin.checkin_date <= stats.last_checkin_date for checkin in checkins
+    )
+
+
+def _fold_checkins(session: Session, stats: GoalStats, checkins: List[CheckIn]) -> GoalStats:
+    """Fold new check-ins of one goal, all dated after the latest known one"""
+    accumulator = StatsAccumulator(stats.goal_id, stats)
+    for checkin in sorted(checkins, key=lambda checkin: checkin.checkin_date):
+        fold_checkin(accumulator, checkin.checkin_date, checkin.status)
+    accumulator.copy_to(stats)
+    session.add(stats)
+    return stats
+
+
+def _apply_goal_checkins(
+    session: Session,
+    stats: GoalStats,
+    checkins: List[CheckIn],
+) -> GoalStats:
+    """Fold new check-ins of one goal, rebuilding if any is back-dated"""
+    if _is_back_dated(stats, checkins):
+        return rebuild_goal_stats(session, stats.goal_id)
+    return _fold_checkins(session, stats, checkins)
+
+
+def rebuild_goal_stats(session: Session, goal_id: UUID) -> GoalStats:
+    """
+    Recompute a goal's aggregate row from its full check-in history
+
+    Used for back-dated writes, updates and deletes, and for backfills.
+
+    Args:
+        session: Database session
+        goal_id: Goal ID
+
+    Returns:
+        Rebuilt goal aggregate row
+    """
+    stats = get_or_create_goal_stats(session, goal_id)
+    _rebuild(session, [stats])
+    return stats
+
+
+def rebuild_goal_stats_batch(session: Session, goal_ids: List[UUID]) -> List[GoalStats]:
+    """
+    Recompute the aggregate rows of many goals with one history query
+
+    Used after bulk loads that bypass apply_checkin. Pass goals in chunks
+    whose histories fit in memory.
+
+    Args:
+        session: Database session
+        goal_ids: Goal IDs
+
+    Returns:
+        Rebuilt goal aggregate rows
+    """
+    stats_by_goal = {
+        stats.goal_id: stats
+        for stats in session.exec(
+            select(GoalStats).where(GoalStats.goal_id.in_(goal_ids))
+        ).all()
+    }
+    stats_rows = []
+    for goal_id in goal_ids:
+        stats = stats_by_goal.get(goal_id)
+        if stats is None:
+            stats = GoalStats(goal_id=goal_id)
+            session.add(stats)
+        stats_rows.append(stats)
+
+    _rebuild(session, stats_rows)
+    return stats_rows
+
+
+def _rebuild(session: Session, stats_rows: List[GoalStats]) -> None:
+    """Recompute aggregate rows from their goals' histories with one query"""
+    if not stats_rows:
+        return
+
+    by_goal = {stats.goal_id: StatsAccumulator(stats.goal_id) for stats in stats_rows}
+    rows = session.exec(
+        select(CheckIn.goal_id, CheckIn.checkin_date, CheckIn.status)
+        .where(CheckIn.goal_id.in_(list(by_goal)))
+        .order_by(CheckIn.goal_id, CheckIn.checkin_date)
+    ).all()
+
+    for goal_id, checkin_date, status in rows:
+        fold_checkin(by_goal[goal_id], checkin_date, status)
+
+    for stats in stats_rows:
+        by_goal[stats.goal_id].copy_to(stats)
+    session.add_all(stats_rows)
+
+
+def current_streak(
+    run_end_date: Optional[date],
+    current_run: int,
+    today: date,
+) -> int:
+    """
+    Get the length of the latest run if it is still alive
+
+    A run is alive if its last day is today or yesterday; otherwise it has
+    lapsed and counts as zero.
+
+    Args:
+        run_end_date: Date of the last completed check-in of the run
+        current_run: Length of the run
+        today: Reference date
+
+    Returns:
+        Current streak length
+    """
+    if run_end_date is not None and run_end_date >= today - timedelta(days=1):
+        return current_run
+    return 0
+
+
+def build_stats_read(
+    goal_id: UUID,
+    stats: Optional[GoalStats],
+    today: Optional[date] = None,
+) -> GoalStatsRead:
+    """
+    Build the API representation of a goal's aggregate row
+
+    Args:
+        goal_id: Goal ID
+        stats: Goal aggregate row, None if the goal has no check-ins yet
+        today: Reference date, defaults to today
+
+    Returns:
+        Goal statistics
+    """
+    if stats is None or stats.total_checkins == 0:
+        return GoalStatsRead(goal_id=goal_id)
+
+    return GoalStatsRead(
+        goal_id=goal_id,
+        total_checkins=stats.total_checkins,
+        completed_checkins=stats.completed_checkins,
+        completion_rate=stats.completed_checkins / stats.total_checkins * 100,
+        current_streak=current_streak(
+            stats.run_end_date, stats.current_run, today or date.today()
+        ),
+        longest_streak=stats.longest_streak,
+        total_value=stats.total_value,
+        average_value=stats.total_value / stats.total_checkins,
+        last_checkin_date=stats.last_checkin_date,
+    )
@@ -0,0 +1,81 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlmodel import Session
+
+from app.models.sync import Tombstone
+from app.models.user import User
+
+
+def next_change_seq(session: Session, user_id: UUID) -> int:
+    """
+    Allocate the next change sequence number for a user's data
+
+    The counter lives on the user row, so concurrent writes of the same user
+    are serialized by its row lock and a sequence number only becomes
+    visible together with the rows stamped with it. All rows written in one
+    transaction share a sequence number.
+
+    Args:
+        session: Database session
+        user_id: User ID
+
+    Returns:
+        New change sequence number
+    """
+    return session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(change_seq=User.change_seq + 1)
+        .returning(User.change_seq)
+    ).scalar_one()
+
+
+def lock_user_data(session: Session, user_id: UUID) -> None:
+    """
+    Take the user row lock that serializes writes of the user's data
+
+    For derived rows built from a history read outside a write: a write
+    that commits between the read and the insert would be missed. The
+    UPDATE leaves change_seq as it is, so ETags don't change. Held until
+    the caller commits.
+
+    Args:
+        session: Database session
+        user_id: User ID
+    """
+    session.execute(
+        update(User).where(User.id == user_id).values(change_seq=User.change_seq)
+    )
+
+
+def add_tombstone(
+    session: Session,
+    user_id: UUID,
+    entity: str,
+    entity_id: UUID,
+    change_seq: int,
+) -> Tombstone:
+    """
+    Record the deletion of a row for delta sync clients
+
+    Args:
+        session: Database session
+        user_id: Owner of the deleted row
+        entity: Kind of the deleted row (goal or checkin)
+        entity_id: ID of the deleted row
+        change_seq: Change sequence number of the deletion
+
+    Returns:
+        Created tombstone
+    """
+    tombstone = Tombstone(
+        user_id=user_id,
+        entity=entity,
+        entity_id=entity_id,
+        change_seq=change_seq,
+        deleted_at=datetime.utcnow(),
+    )
+    session.add(tombstone)
+    return tombstone
@@ -0,0 +1,291 @@
+"""
+In-process load benchmark of the API against a seeded SQLite database
+
+Seeds a database with users, goals and daily check-in histories through
+app.cli.generate_data, then drives the real FastAPI app through httpx's
+ASGI transport with concurrent simulated mobile sessions:
+
+    login -> list goals -> revalidate goals (ETag) -> fetch check-ins
+          -> create today's check-in -> replay a week of offline check-ins
+
+and prints p50/p95/p99 latency and throughput per route as JSON. Runs are
+reproducible for a given --seed, and can be compared against a stored
+baseline. No external services are needed.
+
+Usage:
+    python -m benchmarks.load [--users 50] [--goals 10] [--days 365]
+        [--sessions 200] [--concurrency 10] [--output run.json]
+        [--baseline baseline.json] [--tolerance 0.2]
+
+The seeded database is reused between runs unless --reseed is given. For
+capacity planning, seed e.g. --users 10000 --goals 20 --days 730.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+import httpx
+from sqlmodel import Session, SQLModel
+
+from app.cli.generate_data import DataGenConfig, generate_data
+from app.config import settings
+from app.core.engine import create_db_engine
+
+PASSWORD = "password123"
+
+# Days at the end of the seeded history left empty for offline replay
+REPLAY_DAYS = 7
+
+
+def seed_database(engine, users: int, goals: int, days: int, seed: int) -> None:
+    """
+    Replace the benchmark database with freshly generated data
+
+    Histories end REPLAY_DAYS + 1 days ago, leaving room for offline replay.
+
+    Args:
+        engine: Engine of the benchmark database
+        users: Number of users
+        goals: Goals per user
+        days: Longest history per goal
+        seed: Random seed
+    """
+    SQLModel.metadata.drop_all(engine)
+    generate_data(engine, DataGenConfig(
+        users=users,
+        goals_min=goals,
+        goals_max=goals,
+        days=days,
+        end_date=date.today() - timedelta(days=REPLAY_DAYS + 1),
+        password=PASSWORD,
+        seed=seed,
+    ))
+
+
+class RouteStats:
+    """Latencies and failures recorded per route"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        route: str,
+        method: str,
+        url: str,
+        expected: tuple = (200, 201),
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request, recording its latency under a route name"""
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[route].append(time.perf_counter() - start)
+        if response.status_code not in expected:
+            self.errors[route] += 1
+        return response
+
+    def report(self, duration: float) -> Dict[str, Dict[str, float]]:
+        """Summarize latency percentiles and throughput per route"""
+        report = {}
+        for route, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            report[route] = {
+                "count": len(latencies),
+                "errors": self.errors[route],
+                "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+                "throughput_rps": round(len(latencies) / duration, 2),
+            }
+        return report
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Get a nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_session(
+    client: httpx.AsyncClient,
+    stats: RouteStats,
+    users: int,
+    rng: random.Random,
+) -> None:
+    """Simulate one mobile app session of a random user"""
+    api = settings.API_V1_STR
+    email = f"user{rng.randrange(users)}@example.com"
+
+    response = await stats.request(
+        client, "POST /auth/login", "POST", f"{api}/auth/login",
+        data={"username": email, "password": PASSWORD},
+    )
+    if response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await stats.request(client, "GET /goals", "GET", f"{api}/goals", headers=headers)
+    goals = response.json()
+    if not goals:
+        return
+
+    # Screen refocus: revalidate the listing with its ETag
+    await stats.request(
+        client, "GET /goals (If-None-Match)", "GET", f"{api}/goals",
+        expected=(304,),
+        headers={**headers, "If-None-Match": response.headers.get("ETag", "")},
+    )
+
+    goal = rng.choice(goals)
+    await stats.request(
+        client, "GET /checkins/{goal_id}", "GET", f"{api}/checkins/{goal['id']}",
+        params={"limit": 100}, headers=headers,
+    )
+
+    await stats.request(
+        client, "POST /checkins", "POST", f"{api}/checkins",
+        params={"upsert": "true"},
+        json={"goal_id": goal["id"], "date": str(date.today()), "status": 1.0},
+        headers=headers,
+    )
+
+    # Offline replay of the last week for two goals
+    replay_goals = rng.sample(goals, min(2, len(goals)))
+    await stats.request(
+        client, "POST /checkins/batch", "POST", f"{api}/checkins/batch",
+        json={"checkins": [
+            {
+                "goal_id": replay_goal["id"],
+                "date": str(date.today() - timedelta(days=day)),
+                "status": 1.0,
+            }
+            for replay_goal in replay_goals
+            for day in range(1, REPLAY_DAYS + 1)
+        ]},
+        headers=headers,
+    )
+
+
+async def run_load(app, sessions: int, concurrency: int, users: int, rng: random.Random) -> Dict[str, Any]:
+    """Run simulated sessions against the app with bounded concurrency"""
+    stats = RouteStats()
+    session_rngs = [random.Random(rng.getrandbits(64)) for _ in range(sessions)]
+    queue: "asyncio.Queue[random.Random]" = asyncio.Queue()
+    for session_rng in session_rngs:
+        queue.put_nowait(session_rng)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+        async def worker():
+            while not queue.empty():
+                await run_session(client, stats, users, queue.get_nowait())
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        duration = time.perf_counter() - start
+
+    return {"duration_seconds": round(duration, 3), "routes": stats.report(duration)}
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """
+    Compare per-route p95 latency and throughput against a baseline run
+
+    Args:
+        result: Current run
+        baseline: Stored run to compare against
+        tolerance: Allowed relative p95 increase before flagging a regression
+
+    Returns:
+        Ratios per route and the list of regressed routes
+    """
+    routes = {}
+    regressions = []
+    for route, current in result["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous or not previous["p95_ms"]:
+            continue
+        p95_ratio = current["p95_ms"] / previous["p95_ms"]
+        routes[route] = {
+            "p95_ratio": round(p95_ratio, 3),
+            "throughput_ratio": round(
+                current["throughput_rps"] / previous["throughput_rps"], 3
+            ) if previous["throughput_rps"] else None,
+        }
+        if p95_ratio > 1 + tolerance:
+            regressions.append(route)
+    return {"tolerance": tolerance, "routes": routes, "regressions": regressions}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default="benchmark.db", help="SQLite database file")
+    parser.add_argument("--reseed", action="store_true", help="Reseed an existing database")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--goals", type=int, default=10, help="Goals per user")
+    parser.add_argument("--days", type=int, default=365, help="Days of history per goal")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report to a file")
+    parser.add_argument("--baseline", help="JSON report of a previous run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    engine = create_db_engine(f"sqlite:///{args.db}", settings)
+    if args.reseed or not os.path.exists(args.db) or os.path.getsize(args.db) == 0:
+        start = time.perf_counter()
+        seed_database(engine, args.users, args.goals, args.days, args.seed)
+        print(f"Seeded {args.db} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    # Import the app only now, so its own engine is never used
+    from app.main import app
+    from app.api.auth import login_rate_limit_backend
+    from app.database import get_session
+
+    def get_benchmark_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_benchmark_session
+    # All simulated sessions share one client address
+    settings.LOGIN_RATE_LIMIT_ENABLED = False
+    login_rate_limit_backend.reset()
+
+    result = asyncio.run(
+        run_load(app, args.sessions, args.concurrency, args.users, random.Random(args.seed))
+    )
+    result["config"] = {
+        key: getattr(args, key)
+        for key in ("users", "goals", "days", "sessions", "concurrency", "seed")
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            result["comparison"] = compare(result, json.load(baseline_file), args.tolerance)
+        exit_code = 1 if result["comparison"]["regressions"] else 0
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    print(output)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
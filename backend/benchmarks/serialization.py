@@ -0,0 +1,87 @@
+"""
+Per-row serialization cost of the check-in listing, before and after the fast path
+
+Compares what FastAPI does for `response_model=List[CheckInRead]` (validate
+ORM objects, dump to JSON-compatible data, stdlib json) against the opt-in
+fast path (row tuples to dicts, `app.core.responses.dumps`), and reports the
+compressed sizes.
+
+Usage:
+    python -m benchmarks.serialization [--rows 5000] [--repeat 5]
+"""
+import argparse
+import gzip
+import json
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from app.core.responses import dumps, orjson, rows_to_dicts
+from app.models.checkin import CheckIn, CheckInRead
+
+KEYS = ["status", "note", "id", "goal_id", "date"]
+
+
+def make_checkins(count: int) -> List[CheckIn]:
+    """Build check-ins of one goal, one per day"""
+    goal_id = uuid.uuid4()
+    today = date.today()
+    return [
+        CheckIn(
+            id=uuid.uuid4(),
+            goal_id=goal_id,
+            checkin_date=today - timedelta(days=day),
+            created_at=datetime.utcnow(),
+            status=float(day % 2),
+            note=f"Day {day}" if day % 3 else None,
+        )
+        for day in range(count)
+    ]
+
+
+def best_of(repeat: int, func: Callable[[], bytes]) -> float:
+    """Get the fastest of several timed runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    checkins = make_checkins(args.rows)
+    rows = [
+        (checkin.status, checkin.note, checkin.id, checkin.goal_id, checkin.checkin_date)
+        for checkin in checkins
+    ]
+    adapter = TypeAdapter(List[CheckInRead])
+
+    def default_path() -> bytes:
+        validated = adapter.validate_python(checkins, from_attributes=True)
+        content = adapter.dump_python(validated, mode="json")
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def fast_path() -> bytes:
+        return dumps(rows_to_dicts(rows, KEYS))
+
+    before = best_of(args.repeat, default_path)
+    after = best_of(args.repeat, fast_path)
+    body = fast_path()
+
+    print(f"rows: {args.rows}, encoder: {'orjson' if orjson is not None else 'json'}")
+    print(f"default path: {before / args.rows * 1e6:8.2f} us/row")
+    print(f"fast path:    {after / args.rows * 1e6:8.2f} us/row ({before / after:.1f}x)")
+    print(f"body: {len(body)} bytes, gzip: {len(gzip.compress(body, 6))} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,17 @@
 import os
 import pytest
+from contextlib import contextmanager
+from datetime import date, timedelta
 from fastapi.testclient import TestClient
 from sqlmodel import SQLModel, Session, create_engine
 from sqlmodel.pool import StaticPool
 
 from app.main import app
+from app.api.auth import login_rate_limit_backend
+from app.api.deps import principal_cache
 from app.database import get_session
 from app.models import User
+from app.core.querybudget import add_query_observer, remove_query_observer
 from app.core.security import get_password_hash
 
 
@@ -31,6 +36,8 @@ def client_fixture():
             yield session
     
     app.dependency_overrides[get_session] = get_test_session
+    principal_cache.clear()
+    login_rate_limit_backend.reset()
     
     # Create test client
     client = TestClient(app)
@@ -87,4 +94,76 @@ def test_auth_headers_fixture(client):
     token = response.json()["access_token"]
     
     # Return headers
-    return {"Authorization": f"Bearer {token}"}
\ No newline at end of file
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(name="create_goal")
+def create_goal_fixture(client, test_auth_headers):
+    """
+    Create goals of the test user
+
+    Use as `create_goal("Run", "quantitative")`. Returns the goal ID.
+    """
+    def create_goal(title="Test Goal", goal_type="binary"):
+        response = client.post(
+            "/api/v1/goals",
+            json={
+                "title": title,
+                "target_date": str(date.today() + timedelta(days=30)),
+                "type": goal_type,
+            },
+            headers=test_auth_headers,
+        )
+        return response.json()["id"]
+    
+    return create_goal
+
+
+@pytest.fixture(name="check_in")
+def check_in_fixture(client, test_auth_headers):
+    """
+    Create check-ins of the test user
+
+    Use as `check_in(goal_id, date.today(), 3.5)`; `upsert=True` overwrites
+    the day's check-in. Returns the response.
+    """
+    def check_in(goal_id, checkin_date, goal_status=True, upsert=False):
+        return client.post(
+            "/api/v1/checkins",
+            params={"upsert": upsert},
+            json={"goal_id": goal_id, "date": str(checkin_date), "status": goal_status},
+            headers=test_auth_headers,
+        )
+    
+    return check_in
+
+
+@pytest.fixture(name="query_budget")
+def query_budget_fixture(client):
+    """
+    Check the SQL statements of requests made through the test client
+    
+    Use as `with query_budget(3): client.get(...)`. Fails if any request in
+    the block runs more than `max_queries` statements, or runs one
+    statement shape `repeat_threshold` times or more (an N+1 pattern).
+    Yields the list of QueryReports for further checks.
+    """
+    @contextmanager
+    def query_budget(max_queries=None, repeat_threshold=3):
+        reports = []
+        observer = reports.append
+        add_query_observer(observer)
+        try:
+            yield reports
+        finally:
+            remove_query_observer(observer)
+        
+        messages = []
+        for report in reports:
+            violations = report.violations(max_queries, repeat_threshold)
+            if violations:
+                messages.extend(violations)
+                messages.extend(f"    {statement}" for statement in report.statements)
+        assert not messages, "\n".join(messages)
+    
+    return query_budget
@@ -0,0 +1,145 @@
+import json
+import pytest
+from typing import List
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.pool import StaticPool
+
+from app.api import checkins, export, goals
+from app.api.deps import get_current_user, to_async_session_endpoint
+from app.config import settings
+from app.services import goals as goal_services
+from app.core.security import create_access_token
+from app.database import get_async_session
+from app.models import CheckInRead, User
+
+
+@pytest.fixture(name="async_client")
+def async_client_fixture():
+    """
+    Create a test client for goal and check-in routes served through an async session
+    """
+    # Use in-memory SQLite database through aiosqlite
+    test_engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=StaticPool,
+    )
+    test_session_maker = async_sessionmaker(
+        test_engine, class_=AsyncSession, expire_on_commit=False,
+    )
+    
+    async def get_test_async_session():
+        async with test_session_maker() as session:
+            yield session
+    
+    async def create_tables_and_user():
+        async with test_engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+        async with test_session_maker() as session:
+            user = User(email="async@example.com", hashed_password="x", created_at=datetime.utcnow())
+            session.add(user)
+            await session.commit()
+            return user.id
+    
+    # Mount async versions of the routes
+    router = APIRouter()
+    router.post("/goals", status_code=status.HTTP_201_CREATED)(
+        to_async_session_endpoint(goals.create_goal)
+    )
+    router.get("/goals")(to_async_session_endpoint(goals.get_goals))
+    router.delete("/goals/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)(
+        to_async_session_endpoint(goals.delete_goal)
+    )
+    router.post("/checkins", status_code=status.HTTP_201_CREATED)(
+        to_async_session_endpoint(checkins.create_checkin)
+    )
+    router.get("/checkins/{goal_id}", response_model=List[CheckInRead])(
+        to_async_session_endpoint(checkins.get_checkins)
+    )
+    
+    router.get("/export")(to_async_session_endpoint(export.export_data))
+    
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_session] = get_test_async_session
+    app.dependency_overrides[get_current_user] = to_async_session_endpoint(get_current_user)
+    
+    with TestClient(app) as client:
+        user_id = client.portal.call(create_tables_and_user)
+        client.headers["Authorization"] = f"Bearer {create_access_token(user_id)}"
+        yield client
+
+
+def test_async_session_endpoints(async_client):
+    """Test creating and reading goals and check-ins through an async session"""
+    # Create goal
+    goal_response = async_client.post(
+        "/goals",
+        json={
+            "title": "Learn Python",
+            "target_date": str(date.today() + timedelta(days=30)),
+            "type": "binary",
+        },
+    )
+    
+    assert goal_response.status_code == status.HTTP_201_CREATED
+    goal_id = goal_response.json()["id"]
+    
+    # Create check-in
+    checkin_response = async_client.post(
+        "/checkins",
+        json={"goal_id": goal_id, "date": str(date.today()), "status": True},
+    )
+    
+    assert checkin_response.status_code == status.HTTP_201_CREATED
+    
+    # Get goals and check-ins
+    goals_response = async_client.get("/goals")
+    checkins_response = async_client.get(f"/checkins/{goal_id}")
+    
+    assert goals_response.status_code == status.HTTP_200_OK
+    assert goals_response.json()[0]["current_streak"] == 1
+    assert checkins_response.status_code == status.HTTP_200_OK
+    assert checkins_response.json()[0]["date"] == str(date.today())
+    
+    # Stream the export through the async engine
+    export_response = async_client.get("/export")
+    assert [json.loads(line)["type"] for line in export_response.text.splitlines()] == [
+        "goal", "checkin",
+    ]
+
+
+def test_async_session_purges_deleted_goal(async_client, monkeypatch):
+    """Test a soft-deleted goal is purged through the async engine"""
+    monkeypatch.setattr(settings, "GOAL_SOFT_DELETE_MIN_CHECKINS", 0)
+    purged = []
+    purge_goal = goal_services.purge_goal
+    
+    def record_purge(session, goal_id, chunk_size):
+        purged.append(purge_goal(session, goal_id, chunk_size))
+    
+    monkeypatch.setattr(goal_services, "purge_goal", record_purge)
+    goal_response = async_client.post(
+        "/goals",
+        json={
+            "title": "Learn Python",
+            "target_date": str(date.today() + timedelta(days=30)),
+            "type": "binary",
+        },
+    )
+    goal_id = goal_response.json()["id"]
+    async_client.post(
+        "/checkins",
+        json={"goal_id": goal_id, "date": str(date.today()), "status": True},
+    )
+    
+    response = async_client.delete(f"/goals/{goal_id}")
+    
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert purged == [1]
+    assert async_client.get("/goals").json() == []
+    assert async_client.get(f"/checkins/{goal_id}").status_code == status.HTTP_404_NOT_FOUND
@@ -1,6 +1,10 @@
 import pytest
 from fastapi import status
 
+from app.api import deps
+from app.api.deps import principal_cache
+from app.core.ratelimit import MemoryRateLimitBackend
+
 
 def test_register_user(client):
     """Test user registration"""
@@ -93,4 +97,68 @@ def test_login_nonexistent_user(client):
     
     # Check response
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
-    assert "Incorrect email or password" in response.json()["detail"]
\ No newline at end of file
+    assert "Incorrect email or password" in response.json()["detail"]
+
+def test_principal_cache(client, test_auth_headers):
+    """Test that repeated authenticated requests are served from the principal cache"""
+    principal_cache.clear()
+    
+    # Make two authenticated requests
+    for _ in range(2):
+        response = client.get("/api/v1/goals", headers=test_auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+    
+    # Check counters
+    stats = principal_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["size"] == 1
+
+
+
+def test_login_rate_limited_by_email(client, test_user, monkeypatch):
+    """Test that login attempts over the per-email limit are rejected before bcrypt"""
+    # Login data
+    login_data = {
+        "username": "test@example.com",
+        "password": "wrongpassword",
+    }
+    
+    # Use up the burst
+    for _ in range(5):
+        response = client.post("/api/v1/auth/login", data=login_data)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    
+    # Fail loudly if the next attempt reaches password verification
+    async def fail_verify(*args):
+        raise AssertionError("password verified despite rate limit")
+    
+    monkeypatch.setattr(deps, "verify_and_update_password_async", fail_verify)
+    
+    # Check that the next attempt is throttled, whatever the email's case
+    response = client.post(
+        "/api/v1/auth/login",
+        data={**login_data, "username": "TEST@example.com"},
+    )
+    
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_memory_rate_limit_backend_refills():
+    """Test that token buckets refill over time"""
+    now = [0.0]
+    backend = MemoryRateLimitBackend(timer=lambda: now[0])
+    
+    # Empty a bucket of two tokens refilling one per second
+    assert backend.take("key", 2, 1.0) == 0
+    assert backend.take("key", 2, 1.0) == 0
+    assert backend.take("key", 2, 1.0) == 1.0
+    
+    # Half a second later, half a token is still missing
+    now[0] = 0.5
+    assert backend.take("key", 2, 1.0) == 0.5
+    
+    # A second later a token is available again
+    now[0] = 1.5
+    assert backend.take("key", 2, 1.0) == 0
@@ -0,0 +1,50 @@
+import asyncio
+import random
+from sqlmodel import Session, func, select
+
+from app.config import settings
+from app.core.engine import create_db_engine
+from app.database import get_session
+from app.main import app
+from app.models import GoalStats
+from benchmarks.load import compare, percentile, run_load, seed_database
+
+
+def test_load_benchmark(tmp_path, monkeypatch):
+    """Test the load benchmark seeds a database and reports every route"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'benchmark.db'}", settings)
+    seed_database(engine, users=2, goals=2, days=30, seed=1)
+
+    with Session(engine) as session:
+        assert session.exec(select(func.count()).select_from(GoalStats)).one() == 4
+
+    def get_benchmark_session():
+        with Session(engine) as session:
+            yield session
+
+    monkeypatch.setitem(app.dependency_overrides, get_session, get_benchmark_session)
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_ENABLED", False)
+
+    result = asyncio.run(run_load(app, sessions=2, concurrency=2, users=2, rng=random.Random(1)))
+
+    assert set(result["routes"]) == {
+        "POST /auth/login",
+        "GET /goals",
+        "GET /goals (If-None-Match)",
+        "GET /checkins/{goal_id}",
+        "POST /checkins",
+        "POST /checkins/batch",
+    }
+    assert all(route["errors"] == 0 for route in result["routes"].values())
+
+    # A run compared with itself has no regressions
+    assert compare(result, result, tolerance=0.2)["regressions"] == []
+
+
+def test_percentile():
+    """Test nearest-rank percentiles"""
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
@@ -113,6 +113,62 @@ def test_create_duplicate_checkin(client, test_auth_headers):
     assert "Check-in for this date already exists" in response.json()["detail"]
 
 
+def test_upsert_checkin(client, test_auth_headers):
+    """Test overwriting a check-in with upsert"""
+    # Create a goal first
+    goal_data = {
+        "title": "Run",
+        "description": "Run every day",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "quantitative",
+    }
+    
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = goal_response.json()["id"]
+    
+    # Create first check-in
+    checkin_data = {
+        "goal_id": goal_id,
+        "date": str(date.today()),
+        "status": 3.0,
+    }
+    
+    first_response = client.post(
+        "/api/v1/checkins",
+        json=checkin_data,
+        headers=test_auth_headers,
+    )
+    
+    # Overwrite it
+    response = client.post(
+        "/api/v1/checkins",
+        params={"upsert": True},
+        json={**checkin_data, "status": 5.0, "note": "Ran further"},
+        headers=test_auth_headers,
+    )
+    
+    # Check response
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["id"] == first_response.json()["id"]
+    assert data["status"] == 5.0
+    assert data["note"] == "Ran further"
+    
+    # Check that aggregates reflect the new value
+    stats_response = client.get(
+        f"/api/v1/checkins/{goal_id}/stats",
+        headers=test_auth_headers,
+    )
+    
+    assert stats_response.json()["total_checkins"] == 1
+    assert stats_response.json()["total_value"] == 5.0
+
+
 def test_get_checkins(client, test_auth_headers):
     """Test getting all check-ins for a goal"""
     # Create a goal first
@@ -172,4 +228,275 @@ def test_get_checkins_nonexistent_goal(client, test_auth_headers):
     
     # Check response
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert "Goal not found" in response.json()["detail"]
\ No newline at end of file
+    assert "Goal not found" in response.json()["detail"]
+
+def test_get_checkin_stats(client, test_auth_headers):
+    """Test getting check-in statistics for a goal"""
+    # Create a goal first
+    goal_data = {
+        "title": "Run",
+        "description": "Run every day",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "quantitative",
+    }
+    
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = goal_response.json()["id"]
+    
+    # Create check-ins, one of them back-dated after the others
+    today = date.today()
+    for days_ago, value in [(4, 2.0), (3, 0.0), (1, 4.0), (0, 6.0), (2, 3.0)]:
+        client.post(
+            "/api/v1/checkins",
+            json={
+                "goal_id": goal_id,
+                "date": str(today - timedelta(days=days_ago)),
+                "status": value,
+            },
+            headers=test_auth_headers,
+        )
+    
+    # Get stats
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}/stats",
+        headers=test_auth_headers,
+    )
+    
+    # Check response
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["goal_id"] == goal_id
+    assert data["total_checkins"] == 5
+    assert data["completed_checkins"] == 4
+    assert data["completion_rate"] == 80.0
+    assert data["current_streak"] == 3
+    assert data["longest_streak"] == 3
+    assert data["total_value"] == 15.0
+    assert data["average_value"] == 3.0
+    assert data["last_checkin_date"] == str(today)
+
+
+def test_get_checkin_stats_no_checkins(client, test_auth_headers):
+    """Test getting statistics for a goal without check-ins"""
+    # Create a goal first
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = goal_response.json()["id"]
+    
+    # Get stats
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}/stats",
+        headers=test_auth_headers,
+    )
+    
+    # Check response
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total_checkins"] == 0
+    assert data["current_streak"] == 0
+    assert data["completion_rate"] == 0.0
+
+
+def test_get_checkin_stats_nonexistent_goal(client, test_auth_headers):
+    """Test getting statistics for a nonexistent goal"""
+    # Get stats
+    response = client.get(
+        "/api/v1/checkins/00000000-0000-0000-0000-000000000000/stats",
+        headers=test_auth_headers,
+    )
+    
+    # Check response
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert "Goal not found" in response.json()["detail"]
+
+
+def test_create_checkin_batch(client, test_auth_headers):
+    """Test creating check-ins in a batch"""
+    # Create a goal first
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = goal_response.json()["id"]
+    
+    # Create a check-in that the batch will duplicate
+    today = date.today()
+    client.post(
+        "/api/v1/checkins",
+        json={"goal_id": goal_id, "date": str(today), "status": True},
+        headers=test_auth_headers,
+    )
+    
+    # Create batch
+    batch_data = {
+        "checkins": [
+            {"goal_id": goal_id, "date": str(today - timedelta(days=2)), "status": True},
+            {"goal_id": goal_id, "date": str(today - timedelta(days=1)), "status": True},
+            {"goal_id": goal_id, "date": str(today), "status": True},
+            {"goal_id": goal_id, "date": str(today - timedelta(days=1)), "status": False},
+            {
+                "goal_id": "00000000-0000-0000-0000-000000000000",
+                "date": str(today),
+                "status": True,
+            },
+        ],
+    }
+    
+    response = client.post(
+        "/api/v1/checkins/batch",
+        json=batch_data,
+        headers=test_auth_headers,
+    )
+    
+    # Check response
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["created"] == 2
+    assert [item["result"] for item in data["results"]] == [
+        "created", "created", "duplicate", "duplicate", "not_found",
+    ]
+    assert data["results"][0]["checkin"]["date"] == batch_data["checkins"][0]["date"]
+    
+    # Check that aggregates include the batch
+    stats_response = client.get(
+        f"/api/v1/checkins/{goal_id}/stats",
+        headers=test_auth_headers,
+    )
+    
+    assert stats_response.json()["total_checkins"] == 3
+    assert stats_response.json()["current_streak"] == 3
+
+
+def test_get_checkins_paginated(client, test_auth_headers):
+    """Test paging through check-ins within a date range"""
+    # Create a goal first
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = goal_response.json()["id"]
+    
+    # Create a week of check-ins
+    today = date.today()
+    client.post(
+        "/api/v1/checkins/batch",
+        json={
+            "checkins": [
+                {"goal_id": goal_id, "date": str(today - timedelta(days=days_ago)), "status": True}
+                for days_ago in range(7)
+            ],
+        },
+        headers=test_auth_headers,
+    )
+    
+    # Page through the last five days, two at a time
+    params = {
+        "from": str(today - timedelta(days=5)),
+        "to": str(today - timedelta(days=1)),
+        "limit": 2,
+    }
+    dates = []
+    cursors = []
+    while True:
+        response = client.get(
+            f"/api/v1/checkins/{goal_id}",
+            params=params,
+            headers=test_auth_headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        dates += [checkin["date"] for checkin in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        cursors.append(cursor)
+        params["before"] = cursor
+    
+    # Check pages
+    assert dates == [str(today - timedelta(days=days_ago)) for days_ago in range(1, 6)]
+    assert len(cursors) == 2
+
+
+def test_get_checkins_etag(client, test_auth_headers):
+    """Test conditional check-in listing with ETag/If-None-Match"""
+    # Create a goal first
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = goal_response.json()["id"]
+    
+    # Get check-ins
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}",
+        headers=test_auth_headers,
+    )
+    
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+    
+    # Same request with the ETag is not modified
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}",
+        headers={**test_auth_headers, "If-None-Match": etag},
+    )
+    
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    # A new check-in changes the ETag
+    client.post(
+        "/api/v1/checkins",
+        json={"goal_id": goal_id, "date": str(date.today()), "status": True},
+        headers=test_auth_headers,
+    )
+    
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}",
+        headers={**test_auth_headers, "If-None-Match": etag},
+    )
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 1
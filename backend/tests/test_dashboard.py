@@ -0,0 +1,69 @@
+from datetime import date, timedelta
+from fastapi import status
+
+
+def test_get_dashboard(client, test_auth_headers, create_goal, check_in):
+    """Test the dashboard has each goal's today check-in, latest check-ins and stats"""
+    done_id = create_goal("Meditate")
+    pending_id = create_goal("Run", "quantitative")
+    empty_id = create_goal("Read")
+    for days_ago in range(5):
+        check_in(done_id, date.today() - timedelta(days=days_ago))
+    check_in(pending_id, date.today() - timedelta(days=1), 3.5)
+    # Future check-ins are left out of the latest ones
+    check_in(pending_id, date.today() + timedelta(days=1), 1.0)
+    
+    response = client.get("/api/v1/dashboard?recent=3", headers=test_auth_headers)
+    
+    assert response.status_code == status.HTTP_200_OK
+    dashboard = response.json()
+    assert dashboard["date"] == str(date.today())
+    goals = {goal["id"]: goal for goal in dashboard["goals"]}
+    assert [goal["id"] for goal in dashboard["goals"]] == [done_id, pending_id, empty_id]
+    
+    done = goals[done_id]
+    assert done["today"]["date"] == str(date.today())
+    assert [checkin["date"] for checkin in done["recent_checkins"]] == [
+        str(date.today() - timedelta(days=days_ago)) for days_ago in range(3)
+    ]
+    assert done["stats"]["current_streak"] == 5
+    assert done["stats"]["total_checkins"] == 5
+    
+    pending = goals[pending_id]
+    assert pending["today"] is None
+    assert [checkin["status"] for checkin in pending["recent_checkins"]] == [3.5]
+    
+    assert goals[empty_id]["recent_checkins"] == []
+    assert goals[empty_id]["stats"]["total_checkins"] == 0
+
+
+def test_dashboard_query_budget(client, test_auth_headers, query_budget, create_goal, check_in):
+    """Test the dashboard runs the same statements for any number of goals"""
+    for number in range(5):
+        goal_id = create_goal(f"Goal {number}")
+        check_in(goal_id, date.today())
+        check_in(goal_id, date.today() - timedelta(days=1))
+    
+    with query_budget(3):
+        response = client.get("/api/v1/dashboard", headers=test_auth_headers)
+    
+    assert len(response.json()["goals"]) == 5
+
+
+def test_dashboard_etag(client, test_auth_headers, create_goal, check_in):
+    """Test the dashboard is revalidated with its ETag until data changes"""
+    goal_id = create_goal("Meditate")
+    response = client.get("/api/v1/dashboard", headers=test_auth_headers)
+    etag = response.headers["ETag"]
+    
+    revalidated = client.get(
+        "/api/v1/dashboard", headers={**test_auth_headers, "If-None-Match": etag}
+    )
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    
+    check_in(goal_id, date.today())
+    changed = client.get(
+        "/api/v1/dashboard", headers={**test_auth_headers, "If-None-Match": etag}
+    )
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed.json()["goals"][0]["today"] is not None
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import text
+
+from app.config import Settings
+from app.core.engine import create_db_engine, get_pool_status
+
+
+def test_sqlite_engine_pragmas(tmp_path):
+    """Test that SQLite connections get the configured PRAGMAs"""
+    # Create engine for a file database
+    settings = Settings(SQLITE_BUSY_TIMEOUT_MS=1234)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", settings)
+    
+    # Check PRAGMAs
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+    
+    engine.dispose()
+
+
+def test_pool_status(tmp_path):
+    """Test that pool occupancy and checkout waits are reported"""
+    # Create engine with a small pool
+    settings = Settings(DB_POOL_SIZE=2, DB_MAX_OVERFLOW=2)
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}", settings)
+    
+    # Check out a connection
+    with engine.connect():
+        status = get_pool_status(engine)
+        assert status["capacity"] == 4
+        assert status["checked_out"] == 1
+        assert status["saturation"] == 0.25
+        assert status["checkouts"] >= 1
+    
+    assert get_pool_status(engine)["checked_out"] == 0
+    
+    engine.dispose()
@@ -0,0 +1,93 @@
+import math
+import random
+from datetime import date, timedelta
+
+import pytest
+from fastapi import status
+
+from app.services import downsample
+from app.services.downsample import lttb_indices
+
+
+def test_lttb_keeps_ends_and_peaks():
+    """Test LTTB keeps the first and last points and the extremes"""
+    x = list(range(100))
+    y = [0.0] * 100
+    y[37] = 10.0
+    y[71] = -10.0
+
+    indices = lttb_indices(x, y, 10)
+
+    assert len(indices) == 10
+    assert indices == sorted(indices)
+    assert indices[0] == 0 and indices[-1] == 99
+    assert 37 in indices and 71 in indices
+
+
+def test_lttb_short_series():
+    """Test series not longer than max_points are kept whole"""
+    assert lttb_indices([1, 2, 3], [1.0, 2.0, 3.0], 5) == [0, 1, 2]
+
+
+def test_lttb_numpy_matches_python():
+    """Test the NumPy path picks the same points as the pure Python one"""
+    pytest.importorskip("numpy")
+    random.seed(1)
+    x = list(range(5000))
+    y = [math.sin(index / 50) + random.random() for index in x]
+    bounds = downsample._bucket_bounds(len(x), 100)
+
+    assert downsample._lttb_numpy(x, y, bounds) == downsample._lttb_python(x, y, bounds)
+
+
+def test_get_checkins_max_points(client, test_auth_headers):
+    """Test max_points reduces a long history to a fixed number of check-ins"""
+    response = client.post(
+        "/api/v1/goals",
+        json={
+            "title": "Run",
+            "target_date": str(date.today() + timedelta(days=30)),
+            "type": "quantitative",
+        },
+        headers=test_auth_headers,
+    )
+    goal_id = response.json()["id"]
+    first = date.today() - timedelta(days=199)
+    batch = {
+        "checkins": [
+            {
+                "goal_id": goal_id,
+                "date": str(first + timedelta(days=days)),
+                "status": 42.0 if days == 123 else 5.0 + days % 3,
+            }
+            for days in range(200)
+        ]
+    }
+    client.post("/api/v1/checkins/batch", json=batch, headers=test_auth_headers)
+
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}",
+        params={"max_points": 20},
+        headers=test_auth_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    checkins = response.json()
+    assert len(checkins) == 20
+    # Newest first, spanning the whole range, with the spike kept
+    assert checkins[0]["date"] == str(date.today())
+    assert checkins[-1]["date"] == str(first)
+    assert [checkin["date"] for checkin in checkins] == sorted(
+        (checkin["date"] for checkin in checkins), reverse=True
+    )
+    assert 42.0 in [checkin["status"] for checkin in checkins]
+
+
+def test_get_checkins_max_points_with_limit(client, test_auth_headers):
+    """Test max_points can't be combined with pagination"""
+    response = client.get(
+        "/api/v1/checkins/00000000-0000-0000-0000-000000000000",
+        params={"max_points": 20, "limit": 10},
+        headers=test_auth_headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from fastapi import status
+
+from app.config import settings
+
+
+def create_export_data(client, headers, create_goal):
+    """Create a binary goal with 3 check-ins, a quantitative one with 2 and an empty one"""
+    binary_id = create_goal("Meditate")
+    quantitative_id = create_goal("Run", "quantitative")
+    empty_id = create_goal("Read")
+    checkins = [
+        {"goal_id": binary_id, "date": str(date.today() - timedelta(days=day)), "status": day != 1}
+        for day in range(3)
+    ] + [
+        {"goal_id": quantitative_id, "date": str(date.today() - timedelta(days=day)), "status": 2.5, "note": "5k, \"easy\""}
+        for day in range(2)
+    ]
+    client.post("/api/v1/checkins/batch", json={"checkins": checkins}, headers=headers)
+    return binary_id, quantitative_id, empty_id
+
+
+def test_export_ndjson(client, test_auth_headers, create_goal, monkeypatch):
+    """Test exporting goals followed by their check-ins as NDJSON"""
+    # Small chunks, so goals span several fetched batches
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 2)
+    binary_id, quantitative_id, empty_id = create_export_data(client, test_auth_headers, create_goal)
+    
+    response = client.get("/api/v1/export", headers=test_auth_headers)
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in response.headers["content-disposition"]
+    
+    records = [json.loads(line) for line in response.text.splitlines()]
+    goals = [record for record in records if record["type"] == "goal"]
+    assert sorted(goal["id"] for goal in goals) == sorted([binary_id, quantitative_id, empty_id])
+    
+    # Every check-in follows its goal's line, oldest first
+    checkins_by_goal = {}
+    current_goal = None
+    for record in records:
+        if record["type"] == "goal":
+            current_goal = record["id"]
+        else:
+            assert record["goal_id"] == current_goal
+            checkins_by_goal.setdefault(current_goal, []).append(record)
+    
+    assert [checkin["status"] for checkin in checkins_by_goal[binary_id]] == [True, False, True]
+    assert [checkin["status"] for checkin in checkins_by_goal[quantitative_id]] == [2.5, 2.5]
+    assert checkins_by_goal[binary_id][-1]["date"] == str(date.today())
+    assert empty_id not in checkins_by_goal
+
+
+def test_export_csv(client, test_auth_headers, create_goal):
+    """Test exporting one CSV row per check-in"""
+    binary_id, quantitative_id, empty_id = create_export_data(client, test_auth_headers, create_goal)
+    
+    response = client.get("/api/v1/export?format=csv", headers=test_auth_headers)
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 6
+    binary_rows = [row for row in rows if row["goal_id"] == binary_id]
+    assert [row["status"] for row in binary_rows] == ["true", "false", "true"]
+    quantitative_rows = [row for row in rows if row["goal_id"] == quantitative_id]
+    assert quantitative_rows[0]["goal_type"] == "quantitative"
+    assert quantitative_rows[0]["status"] == "2.5"
+    assert quantitative_rows[0]["note"] == "5k, \"easy\""
+    empty_row = next(row for row in rows if row["goal_id"] == empty_id)
+    assert empty_row["goal_title"] == "Read"
+    assert empty_row["date"] == ""
+
+
+def test_export_only_own_data(client, test_auth_headers, create_goal):
+    """Test the export leaves out other users' goals"""
+    create_goal("Meditate")
+    client.post("/api/v1/auth/register", json={"email": "other@example.com", "password": "password123"})
+    login_response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "other@example.com", "password": "password123"},
+    )
+    other_headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    
+    response = client.get("/api/v1/export", headers=other_headers)
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.text == ""
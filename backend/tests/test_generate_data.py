@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+from sqlmodel import Session, func, select
+
+from app.cli.generate_data import DataGenConfig, generate_data
+from app.config import settings
+from app.core.engine import create_db_engine
+from app.models import CheckIn, Goal, GoalStats, GoalType, User
+from app.services.stats import rebuild_goal_stats_batch
+
+
+def test_generate_data(tmp_path):
+    """Test generated data follows the configured volumes and distributions"""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'generated.db'}", settings)
+    config = DataGenConfig(
+        users=5,
+        goals_min=2,
+        goals_max=4,
+        days=60,
+        skip_probability=0.2,
+        value_min=1,
+        value_max=5,
+        end_date=date(2024, 6, 30),
+        batch_size=100,
+    )
+
+    counts = generate_data(engine, config)
+
+    with Session(engine) as session:
+        assert session.exec(select(func.count()).select_from(User)).one() == counts["users"] == 5
+        assert session.exec(select(func.count()).select_from(Goal)).one() == counts["goals"]
+        assert session.exec(select(func.count()).select_from(CheckIn)).one() == counts["checkins"]
+        assert 5 * 2 <= counts["goals"] <= 5 * 4
+        
+        # Histories end on the end date and skip some days
+        first_date, last_date = session.exec(
+            select(func.min(CheckIn.checkin_date), func.max(CheckIn.checkin_date))
+        ).one()
+        assert last_date == config.end_date
+        assert first_date >= config.end_date - timedelta(days=config.days - 1)
+        assert counts["checkins"] < counts["goals"] * config.days
+        
+        # Completed quantitative check-ins are in the value range
+        values = session.exec(
+            select(CheckIn.status)
+            .join(Goal, Goal.id == CheckIn.goal_id)
+            .where(Goal.type == GoalType.QUANTITATIVE, CheckIn.status > 0)
+        ).all()
+        assert all(1 <= value <= 5 for value in values)
+        
+        # Aggregates folded during generation match a rebuild from history
+        generated = {
+            stats.goal_id: stats.model_dump()
+            for stats in session.exec(select(GoalStats)).all()
+        }
+        session.expunge_all()
+        rebuilt = rebuild_goal_stats_batch(session, list(generated))
+        assert {stats.goal_id: stats.model_dump() for stats in rebuilt} == generated
+
+
+def test_generate_data_is_reproducible(tmp_path):
+    """Test the same seed generates the same data"""
+    config = DataGenConfig(users=2, goals_min=1, goals_max=2, days=20, end_date=date(2024, 6, 30))
+    
+    histories = []
+    for name in ("first.db", "second.db"):
+        engine = create_db_engine(f"sqlite:///{tmp_path / name}", settings)
+        generate_data(engine, config)
+        with Session(engine) as session:
+            histories.append(session.exec(
+                select(CheckIn.id, CheckIn.checkin_date, CheckIn.status).order_by(CheckIn.id)
+            ).all())
+    
+    assert histories[0] == histories[1]
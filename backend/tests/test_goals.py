@@ -1,6 +1,15 @@
 import pytest
 from fastapi import status
 from datetime import date, timedelta
+from uuid import UUID
+from sqlmodel import func, select
+
+from app.api import goals
+from app.config import settings
+from app.database import get_session
+from app.main import app
+from app.models import CheckIn, Goal, GoalStats
+from app.services.goals import purge_deleted_goals
 
 
 def test_create_goal(client, test_auth_headers):
@@ -138,4 +147,200 @@ def test_delete_goal(client, test_auth_headers):
         headers=test_auth_headers,
     )
     
-    assert get_response.status_code == status.HTTP_404_NOT_FOUND
\ No newline at end of file
+    assert get_response.status_code == status.HTTP_404_NOT_FOUND
+
+def test_get_goals_with_stats(client, test_auth_headers):
+    """Test that goal listings include check-in statistics"""
+    # Create two goals
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    
+    checked_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    client.post(
+        "/api/v1/goals",
+        json={**goal_data, "title": "Learn Rust"},
+        headers=test_auth_headers,
+    )
+    
+    checked_goal_id = checked_response.json()["id"]
+    
+    # Check in on the first goal for the last two days
+    for days_ago in [1, 0]:
+        client.post(
+            "/api/v1/checkins",
+            json={
+                "goal_id": checked_goal_id,
+                "date": str(date.today() - timedelta(days=days_ago)),
+                "status": True,
+            },
+            headers=test_auth_headers,
+        )
+    
+    # Get goals
+    response = client.get(
+        "/api/v1/goals",
+        headers=test_auth_headers,
+    )
+    
+    # Check response
+    assert response.status_code == status.HTTP_200_OK
+    goals = {goal["title"]: goal for goal in response.json()}
+    assert goals["Learn Python"]["completion_rate"] == 100.0
+    assert goals["Learn Python"]["current_streak"] == 2
+    assert goals["Learn Rust"]["completion_rate"] == 0.0
+    assert goals["Learn Rust"]["current_streak"] == 0
+
+
+def test_get_goals_etag(client, test_auth_headers):
+    """Test conditional goal listing with ETag/If-None-Match"""
+    # Create a goal first
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    
+    create_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = create_response.json()["id"]
+    
+    # Get goals and a single goal
+    for url in ["/api/v1/goals", f"/api/v1/goals/{goal_id}"]:
+        response = client.get(url, headers=test_auth_headers)
+        etag = response.headers["ETag"]
+        
+        # Same request with the ETag is not modified
+        response = client.get(url, headers={**test_auth_headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+    
+    # A write changes the ETag
+    client.post(
+        "/api/v1/checkins",
+        json={"goal_id": goal_id, "date": str(date.today()), "status": True},
+        headers=test_auth_headers,
+    )
+    
+    response = client.get(
+        "/api/v1/goals",
+        headers={**test_auth_headers, "If-None-Match": etag},
+    )
+    
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+
+def create_goal_with_checkins(client, headers, days):
+    """Create a goal with a check-in on each of the last `days` days"""
+    goal_response = client.post(
+        "/api/v1/goals",
+        json={
+            "title": "Run daily",
+            "target_date": str(date.today() + timedelta(days=30)),
+            "type": "binary",
+        },
+        headers=headers,
+    )
+    goal_id = goal_response.json()["id"]
+    client.post(
+        "/api/v1/checkins/batch",
+        json={
+            "checkins": [
+                {"goal_id": goal_id, "date": str(date.today() - timedelta(days=day)), "status": True}
+                for day in range(days)
+            ]
+        },
+        headers=headers,
+    )
+    return goal_id
+
+
+def count_goal_rows(goal_id):
+    """Count the goal, check-in and aggregate rows left for a goal"""
+    session = next(app.dependency_overrides[get_session]())
+    goal_uuid = UUID(goal_id)
+    return {
+        "goal": session.exec(select(func.count()).select_from(Goal).where(Goal.id == goal_uuid)).one(),
+        "checkins": session.exec(
+            select(func.count()).select_from(CheckIn).where(CheckIn.goal_id == goal_uuid)
+        ).one(),
+        "stats": session.exec(
+            select(func.count()).select_from(GoalStats).where(GoalStats.goal_id == goal_uuid)
+        ).one(),
+    }
+
+
+def test_delete_goal_with_checkins(client, test_auth_headers, query_budget):
+    """Test deleting a goal removes its check-ins without loading them"""
+    goal_id = create_goal_with_checkins(client, test_auth_headers, 30)
+    assert count_goal_rows(goal_id)["checkins"] == 30
+    
+    # Lookup, set-based deletes, tombstone and change sequence, whatever the history
+    with query_budget(8):
+        response = client.delete(f"/api/v1/goals/{goal_id}", headers=test_auth_headers)
+    
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert count_goal_rows(goal_id) == {"goal": 0, "checkins": 0, "stats": 0}
+    
+    sync_response = client.get("/api/v1/sync", headers=test_auth_headers)
+    assert sync_response.json()["deleted"][0]["entity_id"] == goal_id
+
+
+def test_delete_large_goal_is_purged_in_background(client, test_auth_headers, monkeypatch):
+    """Test goals with long histories are soft-deleted, then purged in chunks"""
+    monkeypatch.setattr(settings, "GOAL_SOFT_DELETE_MIN_CHECKINS", 10)
+    monkeypatch.setattr(settings, "GOAL_PURGE_CHUNK_SIZE", 4)
+    goal_id = create_goal_with_checkins(client, test_auth_headers, 15)
+    
+    response = client.delete(f"/api/v1/goals/{goal_id}", headers=test_auth_headers)
+    
+    # The test client runs background tasks before returning
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert count_goal_rows(goal_id) == {"goal": 0, "checkins": 0, "stats": 0}
+
+
+def test_soft_deleted_goal_is_hidden(client, test_auth_headers, monkeypatch):
+    """Test a soft-deleted goal is hidden until purged"""
+    monkeypatch.setattr(settings, "GOAL_SOFT_DELETE_MIN_CHECKINS", 10)
+    goal_id = create_goal_with_checkins(client, test_auth_headers, 15)
+    
+    # Interrupt the purge, as a restart would
+    async def interrupted_purge(*args):
+        pass
+    
+    monkeypatch.setattr(goals, "purge_goal_in_background", interrupted_purge)
+    client.delete(f"/api/v1/goals/{goal_id}", headers=test_auth_headers)
+    
+    assert count_goal_rows(goal_id)["checkins"] == 15
+    assert client.get("/api/v1/goals", headers=test_auth_headers).json() == []
+    assert client.get(
+        f"/api/v1/goals/{goal_id}", headers=test_auth_headers
+    ).status_code == status.HTTP_404_NOT_FOUND
+    assert client.get(
+        f"/api/v1/checkins/{goal_id}", headers=test_auth_headers
+    ).status_code == status.HTTP_404_NOT_FOUND
+    assert client.delete(
+        f"/api/v1/goals/{goal_id}", headers=test_auth_headers
+    ).status_code == status.HTTP_404_NOT_FOUND
+    
+    sync = client.get("/api/v1/sync", headers=test_auth_headers).json()
+    assert sync["goals"] == [] and sync["checkins"] == []
+    assert sync["deleted"][0]["entity_id"] == goal_id
+    
+    # Leftovers are purged by the purge_deleted_goals command
+    session = next(app.dependency_overrides[get_session]())
+    assert purge_deleted_goals(session, chunk_size=4) == [UUID(goal_id)]
+    assert count_goal_rows(goal_id) == {"goal": 0, "checkins": 0, "stats": 0}
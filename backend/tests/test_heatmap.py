@@ -0,0 +1,192 @@
+import base64
+import threading
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+from fastapi import status
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models import Goal, GoalHeatmap, User
+from app.models.goal import GoalType
+from app.services import heatmap as heatmap_service
+from app.services.checkins import insert_checkins
+from app.services.heatmap import HeatmapGrid, apply_heatmap_checkins, build_goal_heatmap
+from app.services.sync import next_change_seq
+
+
+def get_heatmap(client, headers, goal_id, **params):
+    """Get a goal's heatmap"""
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}/heatmap", params=params, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def completed_days(heatmap):
+    """Decode the bitset of a binary heatmap into its completed dates"""
+    bits = int.from_bytes(base64.b64decode(heatmap["bits"]), "little")
+    start_date = date.fromisoformat(heatmap["start_date"])
+    end_date = date.fromisoformat(heatmap["end_date"])
+    return {
+        start_date + timedelta(days=index)
+        for index in range((end_date - start_date).days + 1)
+        if bits >> index & 1
+    }
+
+
+def test_binary_heatmap(client, test_auth_headers, create_goal, check_in):
+    """Test a binary goal's heatmap is a bitset of its completed days"""
+    goal_id = create_goal()
+    today = date.today()
+    check_in(goal_id, today)
+    check_in(goal_id, today - timedelta(days=2))
+    check_in(goal_id, today - timedelta(days=1), False)
+
+    heatmap = get_heatmap(client, test_auth_headers, goal_id, year=today.year)
+
+    assert heatmap["type"] == "binary"
+    assert heatmap["start_date"] == str(date(today.year, 1, 1))
+    assert heatmap["end_date"] == str(date(today.year, 12, 31))
+    assert heatmap["values"] is None
+    # One bit per day of the year
+    assert len(base64.b64decode(heatmap["bits"])) == (
+        date(today.year, 12, 31) - date(today.year, 1, 1)
+    ).days // 8 + 1
+    expected = {today, today - timedelta(days=2)}
+    assert completed_days(heatmap) == {day for day in expected if day.year == today.year}
+
+
+def test_quantitative_heatmap_month(client, test_auth_headers, create_goal, check_in):
+    """Test a quantitative goal's heatmap has one value per day of the month"""
+    goal_id = create_goal(goal_type="quantitative")
+    today = date.today()
+    check_in(goal_id, today, 3.5)
+
+    heatmap = get_heatmap(
+        client, test_auth_headers, goal_id, year=today.year, month=today.month
+    )
+
+    assert heatmap["start_date"] == str(today.replace(day=1))
+    assert heatmap["bits"] is None
+    values = heatmap["values"]
+    assert values[today.day - 1] == 3.5
+    assert values.count(None) == len(values) - 1
+
+
+def test_heatmap_updated_by_checkins(client, test_auth_headers, query_budget, create_goal, check_in):
+    """Test check-ins update a cached heatmap, which is read without scanning them"""
+    goal_id = create_goal()
+    today = date.today()
+    check_in(goal_id, today)
+    get_heatmap(client, test_auth_headers, goal_id, year=today.year)
+
+    # Overwrite today and back-date before the goal was created
+    response = check_in(goal_id, today, False, upsert=True)
+    assert response.status_code == status.HTTP_200_OK
+    back_dated = date(today.year - 1, 6, 1)
+    response = client.post(
+        "/api/v1/checkins/batch",
+        json={"checkins": [{"goal_id": goal_id, "date": str(back_dated), "status": True}]},
+        headers=test_auth_headers,
+    )
+    assert response.json()["created"] == 1
+
+    # Goal lookup and heatmap row only
+    with query_budget(2):
+        heatmap = get_heatmap(client, test_auth_headers, goal_id, year=today.year)
+    assert completed_days(heatmap) == set()
+    heatmap = get_heatmap(client, test_auth_headers, goal_id, year=back_dated.year)
+    assert completed_days(heatmap) == {back_dated}
+
+
+def test_heatmap_last_month(client, test_auth_headers, create_goal):
+    """Test the heatmap of the last month there is"""
+    goal_id = create_goal()
+
+    heatmap = get_heatmap(client, test_auth_headers, goal_id, year=9999, month=12)
+
+    assert heatmap["start_date"] == "9999-12-01"
+    assert heatmap["end_date"] == "9999-12-31"
+    assert completed_days(heatmap) == set()
+
+
+def test_heatmap_not_found(client, test_auth_headers):
+    """Test the heatmap of an unknown goal"""
+    response = client.get(
+        "/api/v1/checkins/00000000-0000-0000-0000-000000000000/heatmap",
+        headers=test_auth_headers,
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_heatmap_first_build_races_checkin(tmp_path, monkeypatch):
+    """Test a check-in written during a first heatmap build waits for it and lands in the row"""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'heatmap.db'}",
+        connect_args={"check_same_thread": False, "timeout": 10},
+    )
+    SQLModel.metadata.create_all(engine)
+    today = date.today()
+    with Session(engine) as session:
+        user = User(email="race@example.com", hashed_password="x", created_at=datetime.utcnow())
+        session.add(user)
+        session.flush()
+        goal = Goal(
+            title="Read", target_date=today + timedelta(days=30), type=GoalType.BINARY,
+            user_id=user.id, created_at=datetime.utcnow(),
+        )
+        session.add(goal)
+        session.commit()
+        user_id, goal_id = user.id, goal.id
+
+    # Pause the build between its history read and its insert
+    history_read = threading.Event()
+    resume_build = threading.Event()
+
+    class PausingGrid(HeatmapGrid):
+        def __init__(self, *args, **kwargs):
+            if threading.current_thread().name == "build":
+                history_read.set()
+                resume_build.wait(10)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(heatmap_service, "HeatmapGrid", PausingGrid)
+
+    def build():
+        with Session(engine) as session:
+            build_goal_heatmap(session, session.get(Goal, goal_id))
+            session.commit()
+
+    def check_in_today():
+        with Session(engine) as session:
+            checkins = insert_checkins(session, [{
+                "id": uuid4(), "goal_id": goal_id, "checkin_date": today, "status": 1.0,
+                "created_at": datetime.utcnow(), "updated_at": datetime.utcnow(),
+                "change_seq": next_change_seq(session, user_id),
+            }])
+            apply_heatmap_checkins(session, checkins)
+            session.commit()
+
+    builder = threading.Thread(target=build, name="build")
+    builder.start()
+    assert history_read.wait(10)
+    writer = threading.Thread(target=check_in_today)
+    writer.start()
+    # The check-in waits for the user row lock the build holds
+    writer.join(0.5)
+    assert writer.is_alive()
+    resume_build.set()
+    builder.join(10)
+    writer.join(10)
+
+    def read_today(row):
+        return completed_days(
+            HeatmapGrid.from_row(row).read(goal_id, today, today).model_dump(mode="json")
+        )
+
+    with Session(engine) as session:
+        assert read_today(session.get(GoalHeatmap, goal_id)) == {today}
+        # A build losing the insert to a concurrent one gets the existing row
+        assert read_today(build_goal_heatmap(session, session.get(Goal, goal_id))) == {today}
+    engine.dispose()
@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+from fastapi import status
+
+from app.config import settings
+
+
+def import_csv(client, headers, content, **params):
+    """Upload CSV content to the import endpoint"""
+    return client.post(
+        "/api/v1/checkins/import",
+        params=params,
+        files={"file": ("history.csv", content.encode("utf-8"), "text/csv")},
+        headers=headers,
+    )
+
+
+def test_import_checkins(client, test_auth_headers, create_goal, monkeypatch):
+    """Test importing check-ins mapped by goal title, in chunks"""
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 3)
+    binary_id = create_goal("Meditate")
+    quantitative_id = create_goal("Run", "quantitative")
+    days = [str(date.today() - timedelta(days=day)) for day in range(10)]
+    content = "\n".join(
+        ["goal_title,date,status,note"]
+        + [f"Meditate,{day},yes," for day in reversed(days[:7])]
+        + [
+            f"Run,{days[0]},5.5,\"easy, flat\"",
+            f"Run,{days[1]},lots,",
+            f"Meditate,{days[8]},2,",
+            f"Meditate,not a date,true,",
+            f"Swim,{days[0]},true,",
+            f"Meditate,{days[0]},no,",
+        ]
+    )
+    
+    response = import_csv(client, test_auth_headers, content)
+    
+    assert response.status_code == status.HTTP_200_OK
+    result = response.json()
+    assert result["rows"] == 13
+    assert result["imported"] == 8
+    assert result["duplicates"] == 1
+    assert result["failed"] == 4
+    assert [error["line"] for error in result["errors"]] == [10, 11, 12, 13]
+    assert "must be a number" in result["errors"][0]["detail"]
+    assert "must be true or false" in result["errors"][1]["detail"]
+    assert "Goal not found" == result["errors"][3]["detail"]
+    
+    # Aggregates follow the imported history
+    stats = client.get(f"/api/v1/checkins/{binary_id}/stats", headers=test_auth_headers).json()
+    assert stats["total_checkins"] == 7
+    assert stats["current_streak"] == 7
+    checkins = client.get(f"/api/v1/checkins/{quantitative_id}", headers=test_auth_headers).json()
+    assert checkins[0]["status"] == 5.5
+    assert checkins[0]["note"] == "easy, flat"
+
+
+def test_import_checkins_merge(client, test_auth_headers, create_goal):
+    """Test duplicates are skipped, or overwritten when merging"""
+    goal_id = create_goal("Run", "quantitative")
+    client.post(
+        "/api/v1/checkins",
+        json={"goal_id": goal_id, "date": str(date.today()), "status": 1.0},
+        headers=test_auth_headers,
+    )
+    content = f"goal_id,date,status\n{goal_id},{date.today()},3\n"
+    
+    skipped = import_csv(client, test_auth_headers, content).json()
+    merged = import_csv(client, test_auth_headers, content, merge="true").json()
+    
+    assert (skipped["imported"], skipped["duplicates"]) == (0, 1)
+    assert (merged["imported"], merged["duplicates"]) == (1, 0)
+    stats = client.get(f"/api/v1/checkins/{goal_id}/stats", headers=test_auth_headers).json()
+    assert stats["total_value"] == 3.0
+
+
+def test_import_export_round_trip(client, test_auth_headers, create_goal):
+    """Test a CSV export imports back, here entirely as duplicates"""
+    goal_id = create_goal("Meditate")
+    create_goal("Read")
+    client.post(
+        "/api/v1/checkins",
+        json={"goal_id": goal_id, "date": str(date.today()), "status": False},
+        headers=test_auth_headers,
+    )
+    export = client.get("/api/v1/export?format=csv", headers=test_auth_headers).text
+    
+    result = import_csv(client, test_auth_headers, export).json()
+    
+    # The goal without check-ins has a row without a date, which is skipped
+    assert result == {"rows": 1, "imported": 0, "duplicates": 1, "failed": 0, "errors": []}
+
+
+def test_import_checkins_ambiguous_title(client, test_auth_headers, create_goal):
+    """Test rows can't be mapped by a title shared by several goals"""
+    create_goal("Run", "binary")
+    create_goal("Run", "binary")
+    
+    result = import_csv(client, test_auth_headers, f"goal_title,date,status\nRun,{date.today()},1\n").json()
+    
+    assert result["failed"] == 1
+    assert "use goal_id" in result["errors"][0]["detail"]
+
+
+def test_import_checkins_missing_columns(client, test_auth_headers):
+    """Test a file without the required columns is rejected"""
+    response = import_csv(client, test_auth_headers, "goal_title,day\nRun,2024-01-01\n")
+    
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
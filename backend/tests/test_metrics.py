@@ -0,0 +1,62 @@
+from datetime import date, timedelta
+from fastapi import status
+
+from app.core.metrics import Histogram, request_metrics
+
+
+def test_metrics(client, test_auth_headers):
+    """Test per-route request, query and pool metrics on /metrics"""
+    request_metrics.clear()
+
+    # Create a goal and list goals twice
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    client.post("/api/v1/goals", json=goal_data, headers=test_auth_headers)
+    client.get("/api/v1/goals", headers=test_auth_headers)
+    client.get("/api/v1/goals", headers=test_auth_headers)
+
+    # Hit a goal that doesn't exist and a path without a route
+    client.get("/api/v1/goals/00000000-0000-0000-0000-000000000000", headers=test_auth_headers)
+    client.get("/does-not-exist")
+
+    # Get metrics
+    response = client.get("/metrics")
+
+    # Check response
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+
+    # Routes are labelled by their template, not the raw path
+    assert 'http_requests_total{method="GET",route="/api/v1/goals",status="200"} 2' in lines
+    assert 'http_requests_total{method="POST",route="/api/v1/goals",status="201"} 1' in lines
+    assert 'http_requests_total{method="GET",route="/api/v1/goals/{goal_id}",status="404"} 1' in lines
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"} 1' in lines
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/goals"} 2' in lines
+
+    # The listing runs statements, all recorded against its route
+    query_sum = next(
+        line for line in lines
+        if line.startswith('http_request_db_queries_sum{method="GET",route="/api/v1/goals"}')
+    )
+    assert float(query_sum.split()[-1]) > 0
+    assert 'http_request_db_queries_bucket{method="GET",route="unmatched",le="0"} 1' in lines
+
+    # Pool status of the application engine is exported
+    assert any(line.startswith('db_pool_capacity{engine="sync"}') for line in lines)
+    assert "http_requests_in_flight 1" in lines
+
+
+def test_histogram():
+    """Test histogram buckets are cumulative and upper-bound inclusive"""
+    histogram = Histogram([1, 2.5])
+    for value in [0.5, 1, 2, 3]:
+        histogram.observe(value)
+
+    assert histogram.samples() == [("1", 2), ("2.5", 3), ("+Inf", 4)]
+    assert histogram.sum == 6.5
+    assert histogram.count == 4
@@ -0,0 +1,145 @@
+import logging
+from datetime import date, timedelta
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlmodel.pool import StaticPool
+
+from app.core.querybudget import (
+    QueryBudgetMiddleware, QueryReport, install_statement_hook, statement_shape,
+)
+
+
+def create_goals(client, headers, count):
+    """Create goals, each with a check-in today, and return their IDs"""
+    goal_ids = []
+    for number in range(count):
+        goal_response = client.post(
+            "/api/v1/goals",
+            json={
+                "title": f"Goal {number}",
+                "target_date": str(date.today() + timedelta(days=30)),
+                "type": "binary",
+            },
+            headers=headers,
+        )
+        goal_id = goal_response.json()["id"]
+        client.post(
+            "/api/v1/checkins",
+            json={"goal_id": goal_id, "date": str(date.today()), "status": True},
+            headers=headers,
+        )
+        goal_ids.append(goal_id)
+    return goal_ids
+
+
+def test_read_query_budgets(client, test_auth_headers, query_budget):
+    """Test goal and check-in reads run a fixed number of statements"""
+    goal_ids = create_goals(client, test_auth_headers, 5)
+
+    # Version lookup and one listing query, however many goals there are
+    with query_budget(2):
+        response = client.get("/api/v1/goals", headers=test_auth_headers)
+    assert len(response.json()) == 5
+
+    with query_budget(2):
+        client.get(f"/api/v1/goals/{goal_ids[0]}", headers=test_auth_headers)
+        client.get(f"/api/v1/checkins/{goal_ids[0]}/stats", headers=test_auth_headers)
+
+    with query_budget(3):
+        client.get(f"/api/v1/checkins/{goal_ids[0]}", headers=test_auth_headers)
+
+    with query_budget(4):
+        client.get("/api/v1/sync", headers=test_auth_headers)
+
+
+def test_write_query_budgets(client, test_auth_headers, query_budget):
+    """Test check-in writes don't run statements per goal or per row"""
+    goal_ids = create_goals(client, test_auth_headers, 5)
+
+    # A back-dated check-in rebuilds the goal's aggregate from one query,
+    # looks up cached heatmaps with another and notes the reminder day
+    with query_budget(8):
+        response = client.post(
+            "/api/v1/checkins",
+            json={
+                "goal_id": goal_ids[0],
+                "date": str(date.today() - timedelta(days=1)),
+                "status": True,
+            },
+            headers=test_auth_headers,
+        )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    # Back-dated check-ins for every goal rebuild all aggregates together
+    batch = {
+        "checkins": [
+            {"goal_id": goal_id, "date": str(date.today() - timedelta(days=days_ago)), "status": True}
+            for goal_id in goal_ids
+            for days_ago in (2, 3)
+        ]
+    }
+    with query_budget(10) as reports:
+        response = client.post(
+            "/api/v1/checkins/batch",
+            json=batch,
+            headers=test_auth_headers,
+        )
+    assert response.json()["created"] == 10
+    assert reports[0].route == "/api/v1/checkins/batch"
+
+
+def test_statement_shape():
+    """Test statements differing only in values share a shape"""
+    assert statement_shape("SELECT * FROM goal WHERE id = 1") == statement_shape(
+        "SELECT *\n  FROM goal WHERE id = 2"
+    )
+    assert statement_shape("SELECT * FROM goal WHERE id IN (?, ?, ?)") == (
+        "SELECT * FROM goal WHERE id IN (?)"
+    )
+    assert statement_shape("SELECT * FROM goal WHERE title = 'a'") == (
+        "SELECT * FROM goal WHERE title = ?"
+    )
+
+
+def test_query_report_violations():
+    """Test over-budget requests and repeated statements are reported"""
+    report = QueryReport(
+        "GET",
+        "/api/v1/goals",
+        "/api/v1/goals",
+        ["SELECT * FROM goal"] + ["SELECT * FROM goalstats WHERE goal_id = ?"] * 3,
+    )
+
+    violations = report.violations(max_queries=2, repeat_threshold=3)
+
+    assert len(violations) == 2
+    assert "ran 4 SQL statements, budget is 2" in violations[0]
+    assert "possible N+1" in violations[1]
+    assert report.violations(max_queries=4, repeat_threshold=4) == []
+
+
+def test_query_debug_mode(caplog):
+    """Test debug mode adds X-Query-Count and logs N+1 patterns"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    install_statement_hook()
+
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware, debug=True, max_queries=10, repeat_threshold=3)
+
+    @app.get("/items")
+    def get_items():
+        with engine.connect() as connection:
+            return [connection.execute(text(f"SELECT {item}")).scalar() for item in range(3)]
+
+    client = TestClient(app)
+    with caplog.at_level(logging.WARNING, logger="app.core.querybudget"):
+        response = client.get("/items")
+
+    assert response.json() == [0, 1, 2]
+    assert response.headers["X-Query-Count"] == "3"
+    assert "possible N+1" in caplog.text
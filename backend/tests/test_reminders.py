@@ -0,0 +1,185 @@
+from datetime import date, datetime, time, timedelta
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi import status
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.notifications import NotificationSink, StubNotificationSink
+from app.database import get_session
+from app.main import app
+from app.models import Reminder, ReminderUpdate, User
+from app.services.reminders import next_due_at, save_reminder, send_due_reminders
+
+
+def get_test_session():
+    """Get a session on the test database"""
+    return next(app.dependency_overrides[get_session]())
+
+
+def get_user_id(session):
+    """Get the ID of the test user"""
+    return session.exec(select(User.id).where(User.email == "test@example.com")).one()
+
+
+def test_next_due_at_follows_time_zone():
+    """Test reminders are scheduled at local time, across DST changes"""
+    paris = ZoneInfo("Europe/Paris")
+    # 08:00 in Paris is 07:00 UTC in winter
+    assert next_due_at(time(8, 0), paris, datetime(2026, 3, 28, 6, 0)) == datetime(2026, 3, 28, 7, 0)
+    # Later that day it moves to the next day, after clocks went forward
+    assert next_due_at(time(8, 0), paris, datetime(2026, 3, 28, 7, 0)) == datetime(2026, 3, 29, 6, 0)
+
+
+def test_notification_sink_must_send():
+    """Test a sink without send can't be created"""
+    class SilentSink(NotificationSink):
+        pass
+
+    with pytest.raises(TypeError):
+        SilentSink()
+
+
+def test_reminder_settings(client, test_auth_headers):
+    """Test setting, reading and turning off the reminder"""
+    response = client.get("/api/v1/reminders", headers=test_auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = client.put(
+        "/api/v1/reminders",
+        json={"local_time": "20:30:00", "timezone": "America/New_York"},
+        headers=test_auth_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["timezone"] == "America/New_York"
+    next_due = datetime.fromisoformat(response.json()["next_due_at"])
+    assert next_due > datetime.utcnow()
+    local = next_due.replace(tzinfo=ZoneInfo("UTC")).astimezone(ZoneInfo("America/New_York"))
+    assert local.time() == time(20, 30)
+
+    response = client.get("/api/v1/reminders", headers=test_auth_headers)
+    assert response.json()["local_time"] == "20:30:00"
+
+    response = client.delete("/api/v1/reminders", headers=test_auth_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    response = client.get("/api/v1/reminders", headers=test_auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_reminder_unknown_time_zone(client, test_auth_headers):
+    """Test reminders need a real time zone"""
+    response = client.put(
+        "/api/v1/reminders",
+        json={"local_time": "08:00:00", "timezone": "Mars/Olympus_Mons"},
+        headers=test_auth_headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_send_due_reminders(client, test_auth_headers):
+    """Test due reminders are sent once, then scheduled for the next day"""
+    session = get_test_session()
+    user_id = get_user_id(session)
+    today = date.today()
+    save_reminder(
+        session, user_id, ReminderUpdate(local_time=time(20, 0)),
+        now=datetime.combine(today, time(8, 0)),
+    )
+    session.commit()
+    sink = StubNotificationSink()
+
+    # Not due yet
+    run = send_due_reminders(session, sink, now=datetime.combine(today, time(19, 59)))
+    assert run.sent == 0
+
+    run = send_due_reminders(session, sink, now=datetime.combine(today, time(20, 1)))
+    assert run.sent == 1
+    assert [(notification.user_id, notification.local_date) for notification in sink.sent] == [
+        (user_id, today)
+    ]
+
+    # Rescheduled, so a second tick sends nothing
+    run = send_due_reminders(session, sink, now=datetime.combine(today, time(20, 2)))
+    assert run.sent == 0
+    reminder = session.exec(select(Reminder)).one()
+    assert reminder.next_due_at == datetime.combine(today + timedelta(days=1), time(20, 0))
+
+
+def test_checked_in_users_are_not_reminded(client, test_auth_headers):
+    """Test a check-in on the reminder's day skips the reminder"""
+    session = get_test_session()
+    user_id = get_user_id(session)
+    today = date.today()
+    save_reminder(
+        session, user_id, ReminderUpdate(local_time=time(20, 0)),
+        now=datetime.combine(today, time(8, 0)),
+    )
+    session.commit()
+
+    response = client.post(
+        "/api/v1/goals",
+        json={"title": "Read", "target_date": str(today + timedelta(days=30)), "type": "binary"},
+        headers=test_auth_headers,
+    )
+    client.post(
+        "/api/v1/checkins",
+        json={"goal_id": response.json()["id"], "date": str(today), "status": True},
+        headers=test_auth_headers,
+    )
+
+    sink = StubNotificationSink()
+    run = send_due_reminders(session, sink, now=datetime.combine(today, time(20, 0)))
+    assert (run.sent, run.checked_in) == (0, 1)
+    assert sink.sent == []
+
+
+def test_future_checkins_do_not_skip_reminders(client, test_auth_headers, create_goal, check_in):
+    """Test a check-in dated after any time zone's today doesn't count as checked in"""
+    today = date.today()
+    check_in(create_goal("Read"), today + timedelta(days=30))
+    session = get_test_session()
+    user_id = get_user_id(session)
+    save_reminder(
+        session, user_id, ReminderUpdate(local_time=time(20, 0)),
+        now=datetime.combine(today, time(8, 0)),
+    )
+    session.commit()
+
+    sink = StubNotificationSink()
+    run = send_due_reminders(session, sink, now=datetime.combine(today, time(20, 0)))
+    assert (run.sent, run.checked_in) == (1, 0)
+
+
+def test_send_due_reminders_in_batches():
+    """Test many due reminders are walked in batches and late ones skipped"""
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    now = datetime(2026, 6, 1, 12, 0)
+    with Session(engine) as session:
+        for minutes in range(25):
+            session.add(Reminder(
+                user_id=uuid4(),
+                local_time=time(12, 0),
+                next_due_at=now - timedelta(minutes=minutes),
+            ))
+        # Overdue by more than the allowed lateness, e.g. after downtime
+        session.add(Reminder(
+            user_id=uuid4(), local_time=time(6, 0), next_due_at=now - timedelta(hours=6)
+        ))
+        # Due tomorrow
+        session.add(Reminder(
+            user_id=uuid4(), local_time=time(8, 0), next_due_at=now + timedelta(hours=20)
+        ))
+        session.commit()
+
+        sink = StubNotificationSink()
+        run = send_due_reminders(session, sink, now=now, batch_size=10)
+
+        assert (run.sent, run.late) == (25, 1)
+        assert len(sink.sent) == 25
+        # Earliest first
+        assert sink.sent[0].due_at == now - timedelta(minutes=24)
+        assert all(
+            reminder.next_due_at > now for reminder in session.exec(select(Reminder)).all()
+        )
@@ -0,0 +1,145 @@
+import gzip
+import pytest
+from datetime import date, timedelta
+from fastapi import FastAPI, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.core.compression import CompressionMiddleware
+
+
+def test_fast_json_matches_default(client, test_auth_headers, monkeypatch):
+    """Test the fast response path returns the same JSON as the default one"""
+    # Create a goal with check-ins
+    goal_data = {
+        "title": "Run",
+        "description": "Run every day",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "quantitative",
+    }
+
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+
+    goal_id = goal_response.json()["id"]
+
+    for days_ago in range(3):
+        client.post(
+            "/api/v1/checkins",
+            json={
+                "goal_id": goal_id,
+                "date": str(date.today() - timedelta(days=days_ago)),
+                "status": 5.0 + days_ago,
+                "note": f"Run {days_ago}",
+            },
+            headers=test_auth_headers,
+        )
+
+    urls = [
+        "/api/v1/goals",
+        f"/api/v1/checkins/{goal_id}",
+        f"/api/v1/checkins/{goal_id}?limit=2",
+    ]
+
+    # Get responses through the default path
+    expected = [client.get(url, headers=test_auth_headers) for url in urls]
+
+    # Get responses through the fast path
+    monkeypatch.setattr(settings, "FAST_JSON_ENABLED", True)
+    actual = [client.get(url, headers=test_auth_headers) for url in urls]
+
+    for expected_response, actual_response in zip(expected, actual):
+        assert actual_response.status_code == status.HTTP_200_OK
+        assert actual_response.json() == expected_response.json()
+        assert actual_response.headers["ETag"] == expected_response.headers["ETag"]
+
+    assert actual[2].headers["X-Next-Cursor"] == expected[2].headers["X-Next-Cursor"]
+
+
+@pytest.fixture(name="compression_client")
+def compression_client_fixture():
+    """
+    Create a test client for an app behind the compression middleware
+    """
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("x" * 10)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse("x" * 1000)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a" * 10, b"b" * 10]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_compression(compression_client):
+    """Test responses are compressed only above the size threshold"""
+    headers = {"Accept-Encoding": "gzip"}
+
+    # Small responses are sent as is
+    response = compression_client.get("/small", headers=headers)
+    assert "content-encoding" not in response.headers
+    assert response.text == "x" * 10
+
+    # Large responses are gzipped
+    response = compression_client.get("/large", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < 1000
+    assert response.text == "x" * 1000
+
+    # Streaming responses are gzipped chunk by chunk
+    response = compression_client.get("/stream", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "a" * 10 + "b" * 10
+
+    # Clients refusing gzip get the response as is
+    response = compression_client.get("/large", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compressed_etag_is_weak(client, test_auth_headers, create_goal):
+    """Test compressed responses get a weak ETag that still revalidates"""
+    for number in range(10):
+        create_goal(f"Goal {number}")
+    headers = {**test_auth_headers, "Accept-Encoding": "gzip"}
+
+    response = client.get("/api/v1/goals", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    response = client.get("/api/v1/goals", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # Uncompressed responses keep the strong ETag
+    response = client.get("/api/v1/goals", headers={**test_auth_headers, "Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["ETag"] == etag[2:]
+
+
+def test_compression_gzip_stream_decodes():
+    """Test the flushed gzip chunks form one valid gzip stream"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"row\n"] * 50), media_type="text/plain")
+
+    client = TestClient(app)
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert gzip.decompress(raw) == b"row\n" * 50
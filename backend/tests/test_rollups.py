@@ -0,0 +1,144 @@
+from datetime import date, timedelta
+from uuid import UUID
+from fastapi import status
+from sqlmodel import delete
+
+from app.database import get_session
+from app.main import app
+from app.models import GoalRollup, RollupPeriod
+from app.services.rollups import period_end, rebuild_goal_rollups
+
+# A Monday, so its week holds the next six days
+MONDAY = date(2024, 1, 1)
+
+
+def get_rollups(client, headers, goal_id, **params):
+    """Get a goal's rollup series"""
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}/rollups", params=params, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def test_period_end():
+    """Test periods end on their last day, up to the last date there is"""
+    assert period_end(MONDAY, RollupPeriod.WEEK) == date(2024, 1, 7)
+    assert period_end(date(2024, 2, 1), RollupPeriod.MONTH) == date(2024, 2, 29)
+    assert period_end(date(9999, 12, 1), RollupPeriod.MONTH) == date(9999, 12, 31)
+    assert period_end(date(9999, 12, 27), RollupPeriod.WEEK) == date(9999, 12, 31)
+
+
+def test_weekly_rollups(client, test_auth_headers, create_goal, check_in):
+    """Test short ranges get weekly sums, averages, minimums and maximums"""
+    goal_id = create_goal("Run", "quantitative")
+    check_in(goal_id, MONDAY, 2.0)
+    check_in(goal_id, MONDAY + timedelta(days=6), 6.0)
+    check_in(goal_id, MONDAY + timedelta(days=7), 5.0)
+    # Back-dated check-ins fold into their periods as well
+    check_in(goal_id, MONDAY + timedelta(days=3), 1.0)
+
+    rollups = get_rollups(
+        client, test_auth_headers, goal_id,
+        **{"from": str(MONDAY), "to": str(MONDAY + timedelta(days=30))},
+    )
+
+    assert rollups["period"] == "week"
+    assert rollups["points"] == [
+        {
+            "period_start": str(MONDAY),
+            "count": 3,
+            "total": 9.0,
+            "average": 3.0,
+            "minimum": 1.0,
+            "maximum": 6.0,
+        },
+        {
+            "period_start": str(MONDAY + timedelta(days=7)),
+            "count": 1,
+            "total": 5.0,
+            "average": 5.0,
+            "minimum": 5.0,
+            "maximum": 5.0,
+        },
+    ]
+
+
+def test_monthly_rollups(client, test_auth_headers, query_budget, create_goal):
+    """Test multi-year ranges read one row per month"""
+    goal_id = create_goal("Run", "quantitative")
+    batch = {
+        "checkins": [
+            {"goal_id": goal_id, "date": str(MONDAY + timedelta(days=days)), "status": 1.0}
+            for days in range(0, 3 * 365, 5)
+        ]
+    }
+    client.post("/api/v1/checkins/batch", json=batch, headers=test_auth_headers)
+
+    with query_budget(2):
+        rollups = get_rollups(
+            client, test_auth_headers, goal_id,
+            **{"from": "2024-01-01", "to": "2026-12-31"},
+        )
+
+    assert rollups["period"] == "month"
+    assert len(rollups["points"]) == 36
+    assert sum(point["count"] for point in rollups["points"]) == len(batch["checkins"])
+    assert rollups["points"][0] == {
+        "period_start": "2024-01-01",
+        "count": 7,
+        "total": 7.0,
+        "average": 1.0,
+        "minimum": 1.0,
+        "maximum": 1.0,
+    }
+
+    # An explicit period overrides the choice
+    rollups = get_rollups(
+        client, test_auth_headers, goal_id,
+        **{"from": "2024-01-01", "to": "2026-12-31", "period": "week"},
+    )
+    assert rollups["period"] == "week"
+
+
+def test_overwritten_checkin_recomputes_rollups(client, test_auth_headers, create_goal, check_in):
+    """Test overwriting a check-in can lower its period's maximum"""
+    goal_id = create_goal("Run", "quantitative")
+    check_in(goal_id, MONDAY, 2.0)
+    check_in(goal_id, MONDAY + timedelta(days=1), 8.0)
+
+    response = check_in(goal_id, MONDAY + timedelta(days=1), 3.0, upsert=True)
+    assert response.status_code == status.HTTP_200_OK
+
+    rollups = get_rollups(
+        client, test_auth_headers, goal_id,
+        **{"from": str(MONDAY), "to": str(MONDAY), "period": "month"},
+    )
+    assert rollups["points"][0]["maximum"] == 3.0
+    assert rollups["points"][0]["total"] == 5.0
+
+
+def test_rebuild_rollups(client, test_auth_headers, create_goal, check_in):
+    """Test rebuilding rollups from the history gives the maintained ones"""
+    goal_id = create_goal("Run", "quantitative")
+    for days, value in ((0, 4.0), (2, 1.5), (40, 7.0)):
+        check_in(goal_id, MONDAY + timedelta(days=days), value)
+    params = {"from": str(MONDAY), "to": str(MONDAY + timedelta(days=60))}
+    maintained = get_rollups(client, test_auth_headers, goal_id, **params)
+
+    session = next(app.dependency_overrides[get_session]())
+    session.exec(delete(GoalRollup))
+    # Two weeks and two months
+    assert rebuild_goal_rollups(session, [UUID(goal_id)]) == 4
+    session.commit()
+
+    assert get_rollups(client, test_auth_headers, goal_id, **params) == maintained
+
+
+def test_binary_goal_has_no_rollups(client, test_auth_headers, create_goal):
+    """Test rollups of a binary goal are rejected"""
+    goal_id = create_goal("Run")
+    response = client.get(
+        f"/api/v1/checkins/{goal_id}/rollups", headers=test_auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from threading import Event, Thread
+from passlib.context import CryptContext
+
+from app.core.errors import ServiceUnavailableError
+from app.core.security import (
+    PasswordHasher, get_password_hash, pwd_context, verify_and_update_password,
+)
+
+
+def test_password_hasher_rejects_when_full():
+    """Test that hashing jobs beyond the pool and queue get a 503"""
+    hasher = PasswordHasher(workers=1, queue_size=0, retry_after=7)
+    started = Event()
+    release = Event()
+    
+    def blocking_job():
+        started.set()
+        release.wait(5)
+    
+    # Occupy the only slot from another thread
+    thread = Thread(target=hasher.run, args=(blocking_job,))
+    thread.start()
+    started.wait(5)
+    
+    # Check that the next job is rejected
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        hasher.run(lambda: None)
+    
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "7"
+    assert hasher.rejected == 1
+    
+    release.set()
+    thread.join(5)
+
+
+def test_verify_and_update_password_rehashes_old_cost():
+    """Test that hashes made with another bcrypt cost are replaced"""
+    # Hash with a cheaper cost than the current policy
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("password123")
+    
+    # Verify
+    is_valid, new_hash = verify_and_update_password("password123", old_hash)
+    
+    assert is_valid
+    assert new_hash is not None
+    assert not pwd_context.needs_update(new_hash)
+    assert pwd_context.verify("password123", new_hash)
+    
+    # Current hashes are left alone
+    assert verify_and_update_password("password123", get_password_hash("password123")) == (True, None)
+
+
+def test_password_hasher_run_async():
+    """Test awaiting a hashing job without blocking the event loop"""
+    hasher = PasswordHasher(workers=1, queue_size=1, retry_after=1)
+    
+    async def hash_and_tick():
+        ticks = 0
+        task = asyncio.ensure_future(hasher.run_async(pwd_context.hash, "password123"))
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.001)
+        return await task, ticks
+    
+    hashed, ticks = asyncio.run(hash_and_tick())
+    
+    assert pwd_context.verify("password123", hashed)
+    assert ticks > 0
@@ -0,0 +1,107 @@
+import pytest
+from fastapi import status
+from datetime import date, timedelta
+
+
+def test_sync_changes_since_cursor(client, test_auth_headers):
+    """Test that delta sync only returns rows changed since the cursor"""
+    # Create a goal
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = goal_response.json()["id"]
+    
+    # Full sync
+    response = client.get("/api/v1/sync", headers=test_auth_headers)
+    
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [goal["id"] for goal in data["goals"]] == [goal_id]
+    assert data["checkins"] == []
+    assert data["deleted"] == []
+    cursor = data["cursor"]
+    
+    # Create a check-in
+    client.post(
+        "/api/v1/checkins",
+        json={"goal_id": goal_id, "date": str(date.today()), "status": True},
+        headers=test_auth_headers,
+    )
+    
+    # Delta sync only returns the check-in
+    response = client.get(
+        "/api/v1/sync",
+        params={"since": cursor},
+        headers=test_auth_headers,
+    )
+    
+    data = response.json()
+    assert data["goals"] == []
+    assert len(data["checkins"]) == 1
+    assert data["checkins"][0]["goal_id"] == goal_id
+    assert data["cursor"] > cursor
+    cursor = data["cursor"]
+    
+    # Nothing changed since
+    response = client.get(
+        "/api/v1/sync",
+        params={"since": cursor},
+        headers=test_auth_headers,
+    )
+    
+    data = response.json()
+    assert data["goals"] == [] and data["checkins"] == [] and data["deleted"] == []
+    assert data["cursor"] == cursor
+
+
+def test_sync_reports_deleted_goals(client, test_auth_headers):
+    """Test that delta sync reports deleted goals as tombstones"""
+    # Create a goal
+    goal_data = {
+        "title": "Learn Python",
+        "description": "Master Python programming language",
+        "target_date": str(date.today() + timedelta(days=30)),
+        "type": "binary",
+    }
+    
+    goal_response = client.post(
+        "/api/v1/goals",
+        json=goal_data,
+        headers=test_auth_headers,
+    )
+    
+    goal_id = goal_response.json()["id"]
+    
+    # Create a check-in
+    client.post(
+        "/api/v1/checkins",
+        json={"goal_id": goal_id, "date": str(date.today()), "status": True},
+        headers=test_auth_headers,
+    )
+    cursor = client.get("/api/v1/sync", headers=test_auth_headers).json()["cursor"]
+    
+    # Delete goal
+    response = client.delete(f"/api/v1/goals/{goal_id}", headers=test_auth_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    
+    # Delta sync
+    response = client.get(
+        "/api/v1/sync",
+        params={"since": cursor},
+        headers=test_auth_headers,
+    )
+    
+    data = response.json()
+    assert data["goals"] == []
+    assert data["checkins"] == []
+    assert data["deleted"] == [{"entity": "goal", "entity_id": goal_id}]